@@ -0,0 +1,63 @@
+import tracemalloc
+
+from qns.entity.cchannel.cchannel import ClassicPacket, RecvClassicPacket
+from qns.entity.qchannel.qchannel import RecvQubitPacket
+from qns.models.epr import WernerStateEntanglement
+from qns.simulator.simulator import Simulator
+
+
+# subclasses without __slots__ get a __dict__ again, they show the memory cost before using __slots__
+class DictRecvClassicPacket(RecvClassicPacket):
+    pass
+
+
+class DictClassicPacket(ClassicPacket):
+    pass
+
+
+class DictRecvQubitPacket(RecvQubitPacket):
+    pass
+
+
+class DictWernerStateEntanglement(WernerStateEntanglement):
+    pass
+
+
+def measure(build, n: int = 100000) -> float:
+    """
+    Return the traced memory in bytes per object built by ``build``
+    """
+    tracemalloc.start()
+    objs = [build(i) for i in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / n
+
+
+def pending_events(packet_cls, event_cls, n: int = 100000) -> float:
+    """
+    Return the traced memory in bytes per pending packet event in the event pool
+    """
+    s = Simulator(0, 10, 1000000)
+    tracemalloc.start()
+    for i in range(n):
+        packet = packet_cls(msg="hello", src=None, dest=None)
+        s.add_event(event_cls(t=i, packet=packet, dest=None))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / n
+
+
+print(f"{'object':<36}{'__dict__':>12}{'__slots__':>12}")
+rows = [
+    ("RecvClassicPacket", lambda i: DictRecvClassicPacket(t=i), lambda i: RecvClassicPacket(t=i)),
+    ("ClassicPacket", lambda i: DictClassicPacket(msg="hello"), lambda i: ClassicPacket(msg="hello")),
+    ("RecvQubitPacket", lambda i: DictRecvQubitPacket(t=i), lambda i: RecvQubitPacket(t=i)),
+    ("WernerStateEntanglement", lambda i: DictWernerStateEntanglement(fidelity=0.9),
+     lambda i: WernerStateEntanglement(fidelity=0.9)),
+]
+for name, dict_build, slots_build in rows:
+    print(f"{name:<36}{measure(dict_build):>12.1f}{measure(slots_build):>12.1f}")
+print(f"{'pending packet event in the pool':<36}{pending_events(DictClassicPacket, DictRecvClassicPacket):>12.1f}"
+      f"{pending_events(ClassicPacket, RecvClassicPacket):>12.1f}")
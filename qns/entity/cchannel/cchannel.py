@@ -26,13 +26,13 @@ from qns.simulator.event import Event
 import qns.utils.log as log
 from qns.entity.entity import Entity
 from qns.entity.node.node import QNode
-from qns.utils.rnd import get_rand
 
 
 class ClassicPacket(object):
     """
     ClassicPacket is the message that transfer on a ClassicChannel
     """
+    __slots__ = ("is_json", "msg", "src", "dest")
 
     def __init__(self, msg: Union[str, bytes, Any], src: QNode = None, dest: QNode = None):
         """
@@ -112,7 +112,7 @@ class ClassicChannel(Entity):
         '''
         if not self._is_installed:
             self._simulator = simulator
-            self._next_send_time = self._simulator.ts
+            self._next_send_slot = self._simulator.ts.time_slot
             self._is_installed = True
 
     def send(self, packet: ClassicPacket, next_hop: QNode):
@@ -128,32 +128,32 @@ class ClassicChannel(Entity):
         """
         if next_hop not in self.node_list:
             raise NextHopNotConnectionException
+        tc_slot = self._simulator.tc_slot
         if self.bandwidth != 0:
-            if self._next_send_time <= self._simulator.current_time:
-                send_time = self._simulator.current_time
+            if self._next_send_slot <= tc_slot:
+                send_slot = tc_slot
             else:
-                send_time = self._next_send_time
+                send_slot = self._next_send_slot
 
-            if self.max_buffer_size != 0 and send_time > self._simulator.current_time\
-               + self._simulator.time(sec=self.max_buffer_size / self.bandwidth):
+            if self.max_buffer_size != 0 and send_slot > tc_slot\
+               + self._simulator.time_slot(self.max_buffer_size / self.bandwidth):
                 # buffer is overflow
-                log.debug(f"cchannel {self}: drop packet {packet} due to overflow")
+                log.debug("cchannel %s: drop packet %s due to overflow", self, packet)
                 return
 
-            self._next_send_time = send_time + \
-                self._simulator.time(sec=len(packet) / self.bandwidth)
+            self._next_send_slot = send_slot + self._simulator.time_slot(len(packet) / self.bandwidth)
         else:
-            send_time = self._simulator.current_time
+            send_slot = tc_slot
 
         # random drop
-        if get_rand() < self.drop_rate:
-            log.debug(f"cchannel {self}: drop packet {packet} due to drop rate")
+        if self.rng.random() < self.drop_rate:
+            log.debug("cchannel %s: drop packet %s due to drop rate", self, packet)
             return
         #  add delay
-        recv_time = send_time + self._simulator.time(sec=self.delay_model.calculate())
+        recv_slot = send_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
 
-        send_event = RecvClassicPacket(recv_time, name=None, by=self,
-                                       cchannel=self, packet=packet, dest=next_hop)
+        send_event = self._simulator.make_event(RecvClassicPacket, recv_slot, name=None, by=self,
+                                                cchannel=self, packet=packet, dest=next_hop)
         self._simulator.add_event(send_event)
 
     def __repr__(self) -> str:
@@ -170,7 +170,10 @@ class RecvClassicPacket(Event):
     """
     The event for a QNode to receive a classic packet
     """
-    def __init__(self, t: Optional[Time] = None, name: Optional[str] = None,
+    __slots__ = ("cchannel", "packet", "dest")
+    recyclable = True
+
+    def __init__(self, t: Optional[Union[Time, int]] = None, name: Optional[str] = None,
                  cchannel: ClassicChannel = None, packet: ClassicPacket = None, dest: QNode = None,
                  by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
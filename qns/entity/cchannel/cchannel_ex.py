@@ -17,11 +17,9 @@
 
 from typing import List, Union
 
-from qns.simulator.ts import Time
 from qns.entity.node.node import QNode
 from qns.models.delay.delay import DelayModel
 from qns.simulator.simulator import Simulator
-from qns.utils.rnd import get_rand
 import qns.utils.log as log
 from qns.entity.cchannel.cchannel import ClassicPacket, ClassicChannel, RecvClassicPacket, NextHopNotConnectionException
 
@@ -29,8 +27,8 @@ from qns.entity.cchannel.cchannel import ClassicPacket, ClassicChannel, RecvClas
 class ClassicChannelEx(ClassicChannel):
     class param:
         def __init__(self) -> None:
-            self._next_send_time: Time = Time(0)
-            self._last_recv_time: Time = Time(0)
+            self._next_send_slot: int = 0
+            self._last_recv_slot: int = 0
 
     def __init__(
         self,
@@ -63,49 +61,50 @@ class ClassicChannelEx(ClassicChannel):
 
         param = self.bidir_param[next_hop]
 
+        tc_slot = self._simulator.tc_slot
         if self.bandwidth != 0:
-            if param._next_send_time <= self._simulator.current_time:
-                send_time = self._simulator.current_time
+            if param._next_send_slot <= tc_slot:
+                send_slot = tc_slot
             else:
-                send_time = param._next_send_time
+                send_slot = param._next_send_slot
 
             if (
                 self.max_buffer_size != 0
-                and send_time
-                > self._simulator.current_time
-                + self._simulator.time(sec=self.max_buffer_size / self.bandwidth)
+                and send_slot
+                > tc_slot
+                + self._simulator.time_slot(self.max_buffer_size / self.bandwidth)
             ):
                 # buffer is overflow
-                log.debug(f"cchannel {self}: drop packet {packet} due to overflow")
+                log.debug("cchannel %s: drop packet %s due to overflow", self, packet)
                 return
 
-            param._next_send_time = send_time + self._simulator.time(
-                sec=len(packet) / self.bandwidth
+            param._next_send_slot = send_slot + self._simulator.time_slot(
+                len(packet) / self.bandwidth
             )
         else:
-            send_time = self._simulator.current_time
+            send_slot = tc_slot
 
         # random drop
         if self.reliable:
-            while get_rand() < self.drop_rate:
+            while self.rng.random() < self.drop_rate:
                 # 每丢包重发一次增加一个1-rtt
-                send_time += self._simulator.time(sec=self.delay_model.calculate())
-                send_time += self._simulator.time(sec=self.delay_model.calculate())
+                send_slot += self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
+                send_slot += self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
         else:
-            if get_rand() < self.drop_rate:
-                log.debug(f"cchannel {self}: drop packet {packet} due to drop rate")
+            if self.rng.random() < self.drop_rate:
+                log.debug("cchannel %s: drop packet %s due to drop rate", self, packet)
                 return
 
         #  add delay
-        recv_time = send_time + self._simulator.time(sec=self.delay_model.calculate())
+        recv_slot = send_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
 
         if self.reliable:
-            if recv_time < param._last_recv_time:
-                recv_time = param._last_recv_time
+            if recv_slot < param._last_recv_slot:
+                recv_slot = param._last_recv_slot
 
-            param._last_recv_time = recv_time
+            param._last_recv_slot = recv_slot
 
-        send_event = RecvClassicPacket(
-            recv_time, name=None, by=self, cchannel=self, packet=packet, dest=next_hop
+        send_event = self._simulator.make_event(
+            RecvClassicPacket, recv_slot, name=None, by=self, cchannel=self, packet=packet, dest=next_hop
         )
         self._simulator.add_event(send_event)
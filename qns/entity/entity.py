@@ -17,6 +17,7 @@
 
 from qns.simulator.simulator import Simulator
 from qns.simulator.event import Event
+from qns.utils.rnd import BufferedGenerator, derive_generator, generator_epoch, unique_key
 
 
 class Entity(object):
@@ -32,6 +33,23 @@ class Entity(object):
         self.name = name
         self._is_installed = False
         self._simulator = None
+        self._rng = None
+        self._rng_epoch = -1
+        # the unnamed entities are told apart by their construction order
+        self._rng_key = unique_key(self.__class__.__name__) if name is None else None
+
+    @property
+    def rng(self) -> BufferedGenerator:
+        """
+        The random generator of this entity. It is derived from the seed of ``set_seed`` and the name of
+        this entity, so that every entity draws the same random numbers in a reordered or partitioned run.
+        The entities should have unique names. An unnamed entity uses its class name and its construction order
+        since the last ``set_seed`` instead.
+        """
+        if self._rng_epoch != generator_epoch():
+            self._rng = derive_generator(self.name if self.name is not None else self._rng_key)
+            self._rng_epoch = generator_epoch()
+        return self._rng
 
     def install(self, simulator: Simulator) -> None:
         '''
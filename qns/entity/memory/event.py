@@ -27,8 +27,10 @@ class MemoryReadRequestEvent(Event):
     """
     ``MemoryReadRequestEvent`` is the event that request a memory read
     """
+    __slots__ = ("memory", "key")
+
     def __init__(self, memory, key: Union[QuantumModel, str],
-                 t: Optional[Time] = None, name: Optional[str] = None, by: Optional[Any] = None):
+                 t: Optional[Union[Time, int]] = None, name: Optional[str] = None, by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.memory = memory
         self.key = key
@@ -41,8 +43,10 @@ class MemoryReadResponseEvent(Event):
     """
     ``MemoryReadResponseEvent`` is the event that returns the memory read result
     """
+    __slots__ = ("node", "result", "request")
+
     def __init__(self, node: QNode, result: Optional[QuantumModel] = None,
-                 request: MemoryReadRequestEvent = None, t: Optional[Time] = None, name: Optional[str] = None,
+                 request: MemoryReadRequestEvent = None, t: Optional[Union[Time, int]] = None, name: Optional[str] = None,
                  by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.node = node
@@ -57,8 +61,10 @@ class MemoryWriteRequestEvent(Event):
     """
     ``MemoryWriteRequestEvent`` is the event that request a memory write
     """
+    __slots__ = ("memory", "qubit")
+
     def __init__(self, memory, qubit: QuantumModel,
-                 t: Optional[Time] = None, name: Optional[str] = None, by: Optional[Any] = None):
+                 t: Optional[Union[Time, int]] = None, name: Optional[str] = None, by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.memory = memory
         self.qubit = qubit
@@ -71,8 +77,10 @@ class MemoryWriteResponseEvent(Event):
     """
     ``MemoryWriteResponseEvent`` is the event that returns the memory write result
     """
+    __slots__ = ("node", "result", "request")
+
     def __init__(self, node: QNode, result: Optional[QuantumModel] = None,
-                 request: MemoryReadRequestEvent = None, t: Optional[Time] = None, name: Optional[str] = None,
+                 request: MemoryReadRequestEvent = None, t: Optional[Union[Time, int]] = None, name: Optional[str] = None,
                  by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.node = node
@@ -60,10 +60,10 @@ class QuantumMemory(Entity):
 
         if self.capacity > 0:
             self._storage: List[Optional[QuantumModel]] = [None] * self.capacity
-            self._store_time: List[Optional[Time]] = [None] * self.capacity
+            self._store_time: List[Optional[int]] = [None] * self.capacity
         else:
             self._storage: List[Optional[QuantumModel]] = []
-            self._store_time: List[Optional[Time]] = []
+            self._store_time: List[Optional[int]] = []
         self._usage = 0
 
         self.decoherence_rate = decoherence_rate
@@ -109,7 +109,7 @@ class QuantumMemory(Entity):
         except IndexError:
             return None
 
-    def get_store_time(self, key: Union[QuantumModel, str, int]) -> Optional[QuantumModel]:
+    def get_store_time(self, key: Union[QuantumModel, str, int]) -> Optional[Time]:
         """
         get the store time of a qubit from the memory
 
@@ -120,7 +120,7 @@ class QuantumMemory(Entity):
         try:
             idx = self._search(key)
             if idx != -1:
-                return self._store_time[idx]
+                return self._simulator.time(time_slot=self._store_time[idx])
             else:
                 return None
         except IndexError:
@@ -149,9 +149,10 @@ class QuantumMemory(Entity):
             self._storage.pop(idx)
             self._store_time.pop(idx)
 
-        t_now = self._simulator.current_time
-        sec_diff = t_now.sec - store_time.sec
-        qubit.store_error_model(t=sec_diff, decoherence_rate=self.decoherence_rate, **self.store_error_model_args)
+        accuracy = self._simulator.accuracy
+        sec_diff = self._simulator.tc_slot / accuracy - store_time / accuracy
+        qubit.store_error_model(t=sec_diff, decoherence_rate=self.decoherence_rate, rng=self.rng,
+                                **self.store_error_model_args)
         return qubit
 
     def write(self, qm: QuantumModel) -> bool:
@@ -169,7 +170,7 @@ class QuantumMemory(Entity):
 
         if self.capacity <= 0:
             self._storage.append(qm)
-            self._store_time.append(self._simulator.current_time)
+            self._store_time.append(self._simulator.tc_slot)
         else:
             idx = -1
             for i, v in enumerate(self._storage):
@@ -179,7 +180,7 @@ class QuantumMemory(Entity):
             if idx == -1:
                 return False
             self._storage[idx] = qm
-            self._store_time[idx] = self._simulator.current_time
+            self._store_time[idx] = self._simulator.tc_slot
         self._usage += 1
         return True
 
@@ -204,13 +205,13 @@ class QuantumMemory(Entity):
             # operate qubits and get measure results
             result = self.read(key)
 
-            t = self._simulator.tc + self._simulator.time(sec=self.delay_model.calculate())
+            t = self._simulator.tc_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
             response = MemoryReadResponseEvent(node=self.node, result=result, request=event, t=t, by=self)
             self._simulator.add_event(response)
         elif isinstance(event, MemoryWriteRequestEvent):
             qubit = event.qubit
             result = self.write(qubit)
-            t = self._simulator.tc + self._simulator.time(sec=self.delay_model.calculate())
+            t = self._simulator.tc_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
             response = MemoryWriteResponseEvent(node=self.node, result=result, request=event, t=t, by=self)
             self._simulator.add_event(response)
 
@@ -16,23 +16,29 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import pandas as pd
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 from qns.entity.entity import Entity
-from qns.simulator.event import Event
+from qns.simulator.event import Event, RecurringEvent
 from qns.simulator.simulator import Simulator
 from qns.simulator.ts import Time
 
 
-class MonitorEvent(Event):
+class MonitorEvent(RecurringEvent):
     """
     the event that notify the monitor to write down network status
     """
-    def __init__(self, t: Optional[Time], monitor,
-                 name: Optional[str] = None, by: Optional[Any] = None):
-        super().__init__(t, name, by)
+    def __init__(self, t: Optional[Union[Time, int]], monitor,
+                 name: Optional[str] = None, by: Optional[Any] = None, period: Optional[int] = None):
+        """
+        Args:
+            t (Union[Time, int]): the time of the (first) watch
+            monitor (Monitor): the monitor
+            period (int): the watching period in time slots. ``None`` means to watch only once
+        """
+        super().__init__(t=t, period=period, simulator=monitor._simulator, name=name, by=by)
         self.monitor = monitor
 
-    def invoke(self) -> None:
+    def trigger(self) -> None:
         self.monitor.handle(self)
 
 
@@ -69,18 +75,13 @@ class Monitor(Entity):
             event = MonitorEvent(t=self._simulator.te, monitor=self, name="finish watch event", by=self)
             self._simulator.add_event(event)
         for p in self.watch_period:
-            tp = Time(sec=p)
-            t = self._simulator.ts
-            while t <= self._simulator.te:
-                t = t + tp
-                event = MonitorEvent(t=t, monitor=self, name=f"period watch event({p})", by=self)
-                self._simulator.add_event(event)
+            step = self._simulator.time_slot(p)
+            event = MonitorEvent(t=self._simulator.ts.time_slot + step, monitor=self,
+                                 name=f"period watch event({p})", by=self, period=step)
+            self._simulator.add_event(event)
 
         for event_type in self.watch_event:
-            try:
-                self._simulator.watch_event[event_type].append(self)
-            except (IndexError, KeyError, ValueError):
-                self._simulator.watch_event[event_type] = [self]
+            self._simulator.watch(event_type, self)
 
     def handle(self, event: Event) -> None:
         self.calculate_date(event)
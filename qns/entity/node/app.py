@@ -15,10 +15,11 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from qns.simulator.simulator import Simulator
 from qns.simulator import Event
+from qns.utils.rnd import BufferedGenerator, derive_generator, generator_epoch, unique_key
 
 
 class Application(object):
@@ -29,6 +30,30 @@ class Application(object):
         self._simulator = None
         self._node = None
         self._dispatch_dict: List[Tuple[List, List, Callable]] = []
+        # concrete event class -> the matched ``(by set, handler)`` records in order
+        self._dispatch_cache: Dict[type, List[Tuple[Optional[set], Callable]]] = {}
+        self._rng = None
+        self._rng_epoch = -1
+        self._rng_key = unique_key(self.__class__.__name__)  # used before the application is installed
+
+    @property
+    def rng(self) -> BufferedGenerator:
+        """
+        The random generator of this application. It is derived from the seed of ``set_seed``,
+        the name of the node and the position of this application on the node.
+        The event handlers of this application draw from it directly, e.g., ``self.rng.random()``,
+        or pass it to the random functions and models, e.g., ``get_choice(a, rng=self.rng)``.
+        """
+        if self._rng_epoch != generator_epoch():
+            node = self._node
+            if node is None:
+                name = self._rng_key
+            else:
+                node_name = node.name if node.name is not None else node._rng_key
+                name = f"{node_name}/{node.apps.index(self)}/{self.__class__.__name__}"
+            self._rng = derive_generator(name)
+            self._rng_epoch = generator_epoch()
+        return self._rng
 
     def install(self, node, simulator: Simulator):
         """
@@ -40,6 +65,7 @@ class Application(object):
         """
         self._simulator = simulator
         self._node = node
+        self._rng_epoch = -1  # the generator depends on the node
 
     def handle(self, node, event: Event) -> Optional[bool]:
         """
@@ -55,29 +81,34 @@ class Application(object):
         return self._dispatch(node, event)
 
     def _dispatch(self, node, event: Event) -> Optional[bool]:
-        for elem in self._dispatch_dict:
-            eventTypeList = elem[0]
-            byList = elem[1]
-            handler = elem[2]
-
-            flag_et = False
-            flag_by = False
-            if len(eventTypeList) > 0:
-                for et in eventTypeList:
-                    if isinstance(event, et):
-                        flag_et = True
-            else:
-                flag_et = True
-
-            if len(byList) == 0 or event.by in byList:
-                flag_by = True
-
-            if flag_et and flag_by:
+        handlers = self._dispatch_cache.get(event.__class__)
+        if handlers is None:
+            handlers = self._build_dispatch(event.__class__)
+        for by_set, handler in handlers:
+            if by_set is None or event.by in by_set:
                 skip = handler(node, event)
                 if skip is True:
                     return skip
         return False
 
+    def _build_dispatch(self, event_type: type) -> List[Tuple[Optional[set], Callable]]:
+        """
+        Find the handlers for an event class, including the handlers for its base classes.
+        The result is cached until a new handler is added.
+
+        Args:
+            event_type: the concrete event class
+        Returns:
+            a list of ``(by set, handler)`` records, where ``None`` means to match all entities
+        """
+        handlers = []
+        for eventTypeList, byList, handler in self._dispatch_dict:
+            if len(eventTypeList) > 0 and not issubclass(event_type, tuple(eventTypeList)):
+                continue
+            handlers.append((set(byList) if len(byList) > 0 else None, handler))
+        self._dispatch_cache[event_type] = handlers
+        return handlers
+
     def add_handler(self, handler, EventTypeList: List = [], ByList: List = []):
         """
         Add a handler function to the dispather.
@@ -91,6 +122,7 @@ class Application(object):
         """
         elem = (EventTypeList, ByList, handler)
         self._dispatch_dict.append(elem)
+        self._dispatch_cache.clear()
 
     def get_node(self):
         """
@@ -27,7 +27,7 @@ class OperateRequestEvent(Event):
     ``OperateRequestEvent`` is the event that request a operator to handle
     """
     def __init__(self, operator, qubits: List[QuantumModel] = [],
-                 t: Optional[Time] = None, name: Optional[str] = None, by: Optional[Any] = None):
+                 t: Optional[Union[Time, int]] = None, name: Optional[str] = None, by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         from qns.entity.operator.operator import QuantumOperator
         self.operator: QuantumOperator = operator
@@ -42,7 +42,7 @@ class OperateResponseEvent(Event):
     ``OperateResponseEvent`` is the event that returns the operating result
     """
     def __init__(self, node: QNode, result: Union[int, List[int]] = None,
-                 request: OperateRequestEvent = None, t: Optional[Time] = None, name: Optional[str] = None,
+                 request: OperateRequestEvent = None, t: Optional[Union[Time, int]] = None, name: Optional[str] = None,
                  by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.node = node
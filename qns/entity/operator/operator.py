@@ -56,8 +56,7 @@ class QuantumOperator(Entity):
             qubits = event.qubits
             # operate qubits and get measure results
             result = self.operate(*qubits)
-
-            t = self._simulator.tc + self._simulator.time(sec=self.delay_model.calculate())
+            t = self._simulator.tc_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
             response = OperateResponseEvent(node=self.node, result=result, request=event, t=t, by=self)
             self._simulator.add_event(response)
 
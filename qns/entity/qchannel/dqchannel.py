@@ -19,7 +19,6 @@ from typing import List, Optional, Union
 import numpy as np
 from qns.entity.node.node import QNode
 from qns.models.delay.delay import DelayModel
-from qns.utils.rnd import get_rand
 from qns.entity.qchannel.qchannel import QuantumChannel
 
 
@@ -80,7 +79,7 @@ class Link_Decoherence_QuantumChannel(QuantumChannel):
             return None
 
         for i in range(self.bandwidth):
-            storage_time = get_rand(self.min_storage_time, self.max_storage_time)
+            storage_time = self.min_storage_time + self.rng.random() * (self.max_storage_time - self.min_storage_time)
             fidelity = calculate_fidelity(self.init_fidelity, storage_time)
             self.entanglement_pool.append((fidelity, storage_time))
 
@@ -26,7 +26,6 @@ from qns.simulator.ts import Time
 from qns.simulator.event import Event
 from qns.models.core.backend import QuantumModel
 import qns.utils.log as log
-from qns.utils.rnd import get_rand
 
 
 class QuantumChannel(Entity):
@@ -71,7 +70,7 @@ class QuantumChannel(Entity):
         '''
         if not self._is_installed:
             self._simulator = simulator
-            self._next_send_time = self._simulator.ts
+            self._next_send_slot = self._simulator.ts.time_slot
             self._is_installed = True
 
     def send(self, qubit: QuantumModel, next_hop: QNode):
@@ -88,35 +87,35 @@ class QuantumChannel(Entity):
         if next_hop not in self.node_list:
             raise NextHopNotConnectionException
 
+        tc_slot = self._simulator.tc_slot
         if self.bandwidth != 0:
-
-            if self._next_send_time <= self._simulator.current_time:
-                send_time = self._simulator.current_time
+            if self._next_send_slot <= tc_slot:
+                send_slot = tc_slot
             else:
-                send_time = self._next_send_time
+                send_slot = self._next_send_slot
 
-            if self.max_buffer_size != 0 and send_time > self._simulator.current_time\
-               + self._simulator.time(sec=self.max_buffer_size / self.bandwidth):
+            if self.max_buffer_size != 0 and send_slot > tc_slot\
+               + self._simulator.time_slot(self.max_buffer_size / self.bandwidth):
                 # buffer is overflow
-                log.debug(f"qchannel {self}: drop qubit {qubit} due to overflow")
+                log.debug("qchannel %s: drop qubit %s due to overflow", self, qubit)
                 return
 
-            self._next_send_time = send_time + self._simulator.time(sec=1 / self.bandwidth)
+            self._next_send_slot = send_slot + self._simulator.time_slot(1 / self.bandwidth)
         else:
-            send_time = self._simulator.current_time
+            send_slot = tc_slot
 
         # random drop
-        if get_rand() < self.drop_rate:
-            log.debug(f"qchannel {self}: drop qubit {qubit} due to drop rate")
+        if self.rng.random() < self.drop_rate:
+            log.debug("qchannel %s: drop qubit %s due to drop rate", self, qubit)
             return
 
         #  add delay
-        recv_time = send_time + self._simulator.time(sec=self.delay_model.calculate())
+        recv_slot = send_slot + self._simulator.time_slot(self.delay_model.calculate(rng=self.rng))
 
         # operation on the qubit
-        qubit.transfer_error_model(self.length, self.decoherence_rate, **self.transfer_error_model_args)
-        send_event = RecvQubitPacket(recv_time, name=None, by=self, qchannel=self,
-                                     qubit=qubit, dest=next_hop)
+        qubit.transfer_error_model(self.length, self.decoherence_rate, rng=self.rng, **self.transfer_error_model_args)
+        send_event = self._simulator.make_event(RecvQubitPacket, recv_slot, name=None, by=self, qchannel=self,
+                                                qubit=qubit, dest=next_hop)
         self._simulator.add_event(send_event)
 
     def __repr__(self) -> str:
@@ -131,9 +130,12 @@ class NextHopNotConnectionException(Exception):
 
 class RecvQubitPacket(Event):
     """
-    The event for a QNode to receive a classic packet
+    The event for a QNode to receive a qubit
     """
-    def __init__(self, t: Optional[Time] = None, qchannel: QuantumChannel = None,
+    __slots__ = ("qchannel", "qubit", "dest")
+    recyclable = True
+
+    def __init__(self, t: Optional[Union[Time, int]] = None, qchannel: QuantumChannel = None,
                  qubit: QuantumModel = None, dest: QNode = None, name: Optional[str] = None, by: Optional[Any] = None):
         super().__init__(t=t, name=name, by=by)
         self.qchannel = qchannel
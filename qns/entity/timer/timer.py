@@ -15,9 +15,9 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Any, Optional
+from typing import Any, Optional, Union
 from qns.simulator.simulator import Simulator
-from qns.simulator.event import Event
+from qns.simulator.event import RecurringEvent
 from qns.simulator.ts import Time
 from qns.entity.entity import Entity
 
@@ -48,19 +48,14 @@ class Timer(Entity):
         if not self._is_installed:
             self._simulator = simulator
 
-            time_list = []
-            if self.end_time == 0:
-                time_list.append(Time(sec=self.start_time))
-            else:
-                t = self.start_time
-                while t <= self.end_time:
-                    time_list.append(t)
-                    t += self.step_time
-
-            for t in time_list:
-                time = self._simulator.time(sec=t)
-                event = TimerEvent(timer=self, t=time, by=self)
-                self._simulator.add_event(event)
+            if self.end_time == 0 or self.start_time <= self.end_time:
+                self._next_time = self.start_time
+                slot = self._simulator.time_slot(self.start_time)
+                # skip the trigger times before the current time, e.g., if the simulator starts late or is resumed
+                while slot is not None and slot < self._simulator.tc_slot:
+                    slot = self._next_time_slot()
+                if slot is not None:
+                    self._simulator.add_event(TimerEvent(timer=self, t=slot, by=self))
             self._is_installed = True
 
     def trigger(self):
@@ -69,14 +64,27 @@ class Timer(Entity):
         else:
             raise NotImplementedError
 
+    def _next_time_slot(self) -> Optional[int]:
+        if self.end_time == 0:
+            return None
+        self._next_time += self.step_time
+        if self._next_time > self.end_time:
+            return None
+        return self._simulator.time_slot(self._next_time)
+
 
-class TimerEvent(Event):
+class TimerEvent(RecurringEvent):
     """
-    TimerEvent is the event that triggers the Timer's `trigger_func`
+    TimerEvent is the event that triggers the Timer's `trigger_func`.
+    It reschedules itself for the next trigger time of the timer.
     """
-    def __init__(self, timer: Timer, t: Optional[Time] = None, name: Optional[str] = None, by: Optional[Any] = None):
-        super().__init__(t=t, name=name, by=by)
+    def __init__(self, timer: Timer, t: Optional[Union[Time, int]] = None, name: Optional[str] = None,
+                 by: Optional[Any] = None):
+        super().__init__(t=t, simulator=timer._simulator, name=name, by=by)
         self.timer = timer
 
-    def invoke(self) -> None:
+    def trigger(self) -> None:
         self.timer.trigger()
+
+    def next_time_slot(self) -> Optional[int]:
+        return self.timer._next_time_slot()
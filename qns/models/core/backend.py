@@ -22,6 +22,8 @@ class QuantumModel(object):
     """
     The interface to present the backend models, including qubit, epr and other models.
     """
+    __slots__ = ()
+
     def store_error_model(self, t: Optional[float] = 0, decoherence_rate: Optional[float] = 0, **kwargs):
         """
         The error model for quantum memory.
@@ -31,7 +33,7 @@ class QuantumModel(object):
         Args:
             t (float): the time stored in a quantum memory. The unit it second.
             decoherence_rate (float): the decoherency rate
-            kwargs: other parameters
+            kwargs: other parameters, e.g., ``rng``, the random generator of the memory to draw from
         """
         pass
 
@@ -44,7 +46,7 @@ class QuantumModel(object):
         Args:
             length (float): the length of the channel
             decoherence_rate (float): the decoherency rate
-            kwargs: other parameters
+            kwargs: other parameters, e.g., ``rng``, the random generator of the channel to draw from
         """
         pass
 
@@ -17,6 +17,7 @@
 
 from typing import Optional
 from qns.models.delay.delay import DelayModel
+from qns.utils.rnd import BufferedGenerator
 
 
 class ConstantDelayModel(DelayModel):
@@ -31,9 +32,12 @@ class ConstantDelayModel(DelayModel):
         super().__init__(name)
         self._delay = delay
 
-    def calculate(self) -> float:
+    def calculate(self, rng: Optional[BufferedGenerator] = None) -> float:
         """
         Return:
             the time delay [s]
         """
         return self._delay
+
+    def min_delay(self) -> float:
+        return self._delay
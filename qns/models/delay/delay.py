@@ -18,6 +18,8 @@
 
 from typing import Optional
 
+from qns.utils.rnd import BufferedGenerator
+
 
 class DelayModel():
     """
@@ -30,9 +32,19 @@ class DelayModel():
         """
         self.name = name
 
-    def calculate(self) -> float:
+    def calculate(self, rng: Optional[BufferedGenerator] = None) -> float:
         """
+        Args:
+            rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the channel.
+                ``None`` means the current generator of ``qns.utils.rnd``
         Return:
             the time delay in second, default is 0
         """
         return 0
+
+    def min_delay(self) -> float:
+        """
+        Return:
+            a lower bound of the delays from ``calculate`` in second. It is the lookahead of the parallel simulation.
+        """
+        return 0
@@ -17,22 +17,29 @@
 
 from typing import Optional
 from qns.models.delay.delay import DelayModel
-from qns.utils.rnd import get_normal
+from qns.utils.rnd import BufferedGenerator, get_normal
 
 
 class NormalDelayModel(DelayModel):
-    def __init__(self, mean_delay: float = 0, std: float = 0, name: Optional[str] = None) -> None:
+    def __init__(self, mean_delay: float = 0, std: float = 0, name: Optional[str] = None,
+                 truncate: float = 3) -> None:
         """
-        A random delay from normal distribution X~N(mean_delay, std^2)
+        A random delay from normal distribution X~N(mean_delay, std^2). The delays are clamped to
+        ``max(0, mean_delay - truncate * std)``, so that they have a positive lower bound.
 
         Args:
             name (str): the name of this delay model
             mean_delay (float): the mean of the time delay [s]
             std (float): the standand deviation [s]
+            truncate (float): the lower bound of the delays in standard deviations below the mean
         """
         super().__init__(name)
         self._mean_delay = mean_delay
         self._std = std
+        self._truncate = truncate
 
-    def calculate(self) -> float:
-        return get_normal(self._mean_delay, self._std)
+    def calculate(self, rng: Optional[BufferedGenerator] = None) -> float:
+        return max(self.min_delay(), get_normal(self._mean_delay, self._std, rng=rng))
+
+    def min_delay(self) -> float:
+        return max(0, self._mean_delay - self._truncate * self._std)
@@ -17,7 +17,7 @@
 
 from typing import Optional
 from qns.models.delay.delay import DelayModel
-from qns.utils.rnd import get_rand
+from qns.utils.rnd import BufferedGenerator, get_rand
 
 
 class UniformDelayModel(DelayModel):
@@ -35,5 +35,8 @@ class UniformDelayModel(DelayModel):
         self._min_delay = min_delay
         self._max_delay = max_delay
 
-    def calculate(self) -> float:
-        return get_rand(self._min_delay, self._max_delay)
+    def calculate(self, rng: Optional[BufferedGenerator] = None) -> float:
+        return get_rand(self._min_delay, self._max_delay, rng=rng)
+
+    def min_delay(self) -> float:
+        return self._min_delay
@@ -26,7 +26,12 @@ from qns.models.qubit.const import OPERATOR_PAULI_I, QUBIT_STATE_0, QUBIT_STATE_
 class BaseEntanglement(object):
     """
     This is the base entanglement model
+
+    Entanglements use ``__slots__`` to save memory. To attach protocol-specific fields, e.g. the endpoints
+    of a distribution, declare them in ``__slots__`` of a subclass instead of setting new attributes.
     """
+    __slots__ = ("fidelity", "name", "is_decoherenced")
+
     def __init__(self, fidelity: float = 1, name: Optional[str] = None):
         """
         generate an entanglement with certain fidelity
@@ -30,6 +30,8 @@ class MixedStateEntanglement(BaseEntanglement, QuantumModel):
     `MixedStateEntanglement` is a pair of entangled qubits in mixed State with a hidden-variable.
     rho = A * Phi^+ + B * Psi^+ + C * Psi^- + D * Phi^-
     """
+    __slots__ = ("b", "c", "d")
+
     def __init__(self, fidelity: float = 1, b: Optional[float] = None,
                  c: Optional[float] = None, d: Optional[float] = None,
                  name: Optional[str] = None):
@@ -29,6 +29,8 @@ class WernerStateEntanglement(BaseEntanglement, QuantumModel):
     """
     `WernerStateEntanglement` is a pair of entangled qubits in Werner State with a hidden-variable.
     """
+    __slots__ = ("w",)
+
     def __init__(self, fidelity: float = 1, name: Optional[str] = None):
         """
         generate an entanglement with certain fidelity
@@ -16,12 +16,12 @@
 #    along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from qns.models.qubit.const import QUBIT_STATE_0
-from qns.models.qubit.gate import I, X, Y, Z
 import numpy as np
-from qns.models.qubit.qubit import QState
-from qns.utils.rnd import get_rand
+from qns.models.qubit.qubit import QState, Qubit
+from qns.models.qubit.utils import pauli_channel
+from qns.utils.rnd import BufferedGenerator, get_rand
 
 
 def PrefectError(self, p: Optional[float] = 0, **kwargs):
@@ -34,20 +34,21 @@ def PrefectError(self, p: Optional[float] = 0, **kwargs):
     pass
 
 
-def DephaseError(self, p: Optional[float] = 0, **kwargs):
+def DephaseError(self, p: Optional[float] = 0, rng: Optional[BufferedGenerator] = None, **kwargs):
     """
     The dephase error model.
     A random Z gate will be operate on the qubit with possibility p.
 
     Args:
         p (float): the error possibility
+        rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the channel or memory
     """
     if p < 0 or p > 1:
         raise Exception("Error decoherence rate, should be in [0, 1]")
-    self.stochastic_operate([I, Z], [1-p, p])
+    self.state.apply_pauli_channel(pauli_channel("dephase", p), [self], rng=rng)
 
 
-def DepolarError(self, p: Optional[float] = 0, **kwargs):
+def DepolarError(self, p: Optional[float] = 0, rng: Optional[BufferedGenerator] = None, **kwargs):
     """
     The depolarizing error model.
 
@@ -55,43 +56,64 @@ def DepolarError(self, p: Optional[float] = 0, **kwargs):
 
     Args:
         p (float): the error possibility
+        rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the channel or memory
         kwargs: other parameters
     """
     if p < 0 or p > 1:
         raise Exception("Error decoherence rate, should be in [0, 1]")
-    if 1-3*p > 0:
-        self.stochastic_operate([I, X, Y, Z], [1-3*p, p, p, p])
-    else:
-        self.stochastic_operate([X, Y, Z], [1/3, 1/3, 1/3])
+    self.state.apply_pauli_channel(pauli_channel("depolar", p), [self], rng=rng)
 
 
-def BitFlipError(self, p: Optional[float] = 0, **kwargs):
+def BitFlipError(self, p: Optional[float] = 0, rng: Optional[BufferedGenerator] = None, **kwargs):
     """
     The bit flip error model.
 
     Args:
         p (float): the error possibility, [0, 1]
+        rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the channel or memory
         kwargs: other parameters
     """
     if p < 0 or p > 1:
         raise Exception("Error decoherence rate, should be in [0, 1]")
-    self.stochastic_operate([I, X], [1-p, p])
+    self.state.apply_pauli_channel(pauli_channel("bitflip", p), [self], rng=rng)
 
 
-def DissipationError(self, p: Optional[float] = 0, **kwargs):
+def PauliError(qubits: List[Qubit], channel: str, p: float, rng: Optional[BufferedGenerator] = None) -> None:
+    """
+    Apply the same Pauli error channel on many qubits.
+    The qubits in the same state are handled in one contraction.
+
+    Args:
+        qubits (List[Qubit]): the qubits
+        channel (str): "dephase", "bitflip" or "depolar"
+        p (float): the error possibility
+        rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+    """
+    if p < 0 or p > 1:
+        raise Exception("Error decoherence rate, should be in [0, 1]")
+    ch = pauli_channel(channel, p)
+    states: Dict[int, Tuple[QState, List[Qubit]]] = {}
+    for q in qubits:
+        states.setdefault(id(q.state), (q.state, []))[1].append(q)
+    for state, qs in states.values():
+        state.apply_pauli_channel(ch, qs, rng=rng)
+
+
+def DissipationError(self, p: Optional[float] = 0, rng: Optional[BufferedGenerator] = None, **kwargs):
     """
     The dissipation error model.
 
     Args:
         p (float): the error possibility, [0, 1]
+        rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the channel or memory
         kwargs: other parameters
     """
     if p < 0 or p > 1:
         raise Exception("Error decoherence rate, should be in [0, 1]")
-    real_p = get_rand()
+    real_p = get_rand(rng=rng)
     if real_p < p:
-        self.measure()
-        self.state = QState([self], state=QUBIT_STATE_0)
+        self.measure(rng=rng)
+        self.state = type(self.state)([self], state=QUBIT_STATE_0)
 
 
 def ErrorWithTime(ErrorModel):
@@ -51,3 +51,17 @@ class QStateBaseError(Exception):
 
 class OperatorError(Exception):
     pass
+
+
+class QStateNotStabilizerError(QStateBaseError):
+    """
+    This error happens when a state can not be presented by a stabilizer tableau
+    """
+    pass
+
+
+class OperatorNotCliffordError(OperatorError):
+    """
+    This error happens when a non-Clifford operator is applied on a stabilizer state
+    """
+    pass
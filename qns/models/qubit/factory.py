@@ -22,7 +22,7 @@ import numpy as np
 from qns.models.qubit.const import QUBIT_STATE_0
 from qns.models.qubit.decoherence import PrefectMeasureErrorModel, PrefectOperateErrorModel, PrefectStorageErrorModel, \
         PrefectTransferErrorModel
-from qns.models.qubit.qubit import Qubit
+from qns.models.qubit.qubit import QState, Qubit
 
 
 class QubitFactory():
@@ -31,7 +31,8 @@ class QubitFactory():
     """
     def __init__(self, operate_decoherence_rate: float = 0, measure_decoherence_rate: float = 0,
                  store_error_model=PrefectStorageErrorModel, transfer_error_model=PrefectTransferErrorModel,
-                 operate_error_model=PrefectOperateErrorModel, measure_error_model=PrefectMeasureErrorModel) -> None:
+                 operate_error_model=PrefectOperateErrorModel, measure_error_model=PrefectMeasureErrorModel,
+                 state_cls: type = QState) -> None:
         """
         Args:
             operate_decoherence_rate (float): the operate decoherence rate
@@ -40,6 +41,7 @@ class QubitFactory():
             transfer_error_model: a callable function for handing errors in quantum channel
             operate_error_model: a callable function for handing errors in operating quantum gates
             measure_error_model: a callable function for handing errors in measuing the status
+            state_cls (type): the backend of the quantum state, ``QState`` or ``StabilizerState``
         """
         self.operate_decoherence_rate = operate_decoherence_rate
         self.measure_decoherence_rate = measure_decoherence_rate
@@ -47,6 +49,7 @@ class QubitFactory():
         self.transfer_error_model = transfer_error_model
         self.operate_error_model = operate_error_model
         self.measure_error_model = measure_error_model
+        self.state_cls = state_cls
 
     def __call__(self, state=QUBIT_STATE_0, rho: np.ndarray = None,
                  operate_decoherence_rate: Optional[float] = None, measure_decoherence_rate: Optional[float] = None,
@@ -63,7 +66,7 @@ class QubitFactory():
         if measure_decoherence_rate is None:
             measure_decoherence_rate = self.measure_decoherence_rate
         qubit = Qubit(state=state, rho=rho, operate_decoherence_rate=operate_decoherence_rate,
-                      measure_decoherence_rate=measure_decoherence_rate, name=name)
+                      measure_decoherence_rate=measure_decoherence_rate, name=name, state_cls=self.state_cls)
         qubit.store_error_model = MethodType(self.store_error_model, qubit)
         qubit.transfer_error_model = MethodType(self.transfer_error_model, qubit)
         qubit.operate_error_model = MethodType(self.operate_error_model, qubit)
@@ -23,7 +23,7 @@ from qns.models.qubit.const import OPERATOR_HADAMARD, OPERATOR_PAULI_I, \
                                    OPERATOR_RX, OPERATOR_RY, OPERATOR_RZ, \
                                    OPERATOR_S, OPERATOR_T
 from qns.models.qubit.qubit import Qubit
-from qns.models.qubit.utils import kron, joint
+from qns.models.qubit.utils import controlled_operator, joint
 from qns.models.qubit.errors import QGateOperatorNotMatchError, QGateQubitNotInStateError
 
 
@@ -159,27 +159,11 @@ class DoubleQubitsControlledGate(Gate):
         joint(qubit1, qubit2)
         state = qubit1.state
 
-        try:
-            idx1 = state.qubits.index(qubit1)
-            idx2 = state.qubits.index(qubit2)
-        except ValueError:
+        if qubit1 not in state.qubits or qubit2 not in state.qubits:
             raise QGateQubitNotInStateError
 
-        full_operator_part_0 = np.array([1])  # |0> <0|
-        full_operator_part_1 = np.array([1])  # |1> <1|
-
-        for i in range(state.num):
-            if i == idx1:
-                full_operator_part_0 = kron(full_operator_part_0, np.array([[1, 0], [0, 0]]))
-                full_operator_part_1 = kron(full_operator_part_1, np.array([[0, 0], [0, 1]]))
-            elif i == idx2:
-                full_operator_part_0 = kron(full_operator_part_0, OPERATOR_PAULI_I)
-                full_operator_part_1 = kron(full_operator_part_1, operator)
-            else:
-                full_operator_part_0 = kron(full_operator_part_0, OPERATOR_PAULI_I)
-                full_operator_part_1 = kron(full_operator_part_1, OPERATOR_PAULI_I)
-        full_operator = full_operator_part_0 + full_operator_part_1
-        qubit1.state.operate(full_operator)
+        # apply the 4 x 4 controlled operator on the two qubits only
+        state.operate(controlled_operator(operator), [qubit1, qubit2])
 
 
 ControlledGate = DoubleQubitsControlledGate(name="Controlled Gate",
@@ -230,6 +214,8 @@ class SwapGate(Gate):
             raise QGateQubitNotInStateError
 
         state.qubits[idx1], state.qubits[idx2] = state.qubits[idx2], state.qubits[idx1]
+        if state.auto_factorize:
+            state._factorize_qubits([qubit1, qubit2])
 
 
 Swap = SwapGate(name="Swap Gate", _docs="swap the states of qubit1 and qubit2")
@@ -266,42 +252,11 @@ class ThreeQubitsGate(Gate):
 
         state = qubit1.state
 
-        # single qubit operate
-        try:
-            idx1 = state.qubits.index(qubit1)
-            idx2 = state.qubits.index(qubit2)
-            idx3 = state.qubits.index(qubit3)
-        except ValueError:
+        if qubit1 not in state.qubits or qubit2 not in state.qubits or qubit3 not in state.qubits:
             raise QGateQubitNotInStateError
 
-        full_operator_part_00 = np.array([1])  # |0> <0|
-        full_operator_part_01 = np.array([1])  # |1> <1|
-        full_operator_part_10 = np.array([1])  # |0> <0|
-        full_operator_part_11 = np.array([1])  # |1> <1|
-
-        for i in range(state.num):
-            if i == idx1:
-                full_operator_part_00 = kron(full_operator_part_00, np.array([[1, 0], [0, 0]]))
-                full_operator_part_01 = kron(full_operator_part_01, np.array([[1, 0], [0, 0]]))
-                full_operator_part_10 = kron(full_operator_part_10, np.array([[0, 0], [0, 1]]))
-                full_operator_part_11 = kron(full_operator_part_11, np.array([[0, 0], [0, 1]]))
-            elif i == idx2:
-                full_operator_part_00 = kron(full_operator_part_00, np.array([[1, 0], [0, 0]]))
-                full_operator_part_10 = kron(full_operator_part_10, np.array([[1, 0], [0, 0]]))
-                full_operator_part_01 = kron(full_operator_part_01, np.array([[0, 0], [0, 1]]))
-                full_operator_part_11 = kron(full_operator_part_11, np.array([[0, 0], [0, 1]]))
-            elif i == idx3:
-                full_operator_part_00 = kron(full_operator_part_00, OPERATOR_PAULI_I)
-                full_operator_part_01 = kron(full_operator_part_01, OPERATOR_PAULI_I)
-                full_operator_part_10 = kron(full_operator_part_10, OPERATOR_PAULI_I)
-                full_operator_part_11 = kron(full_operator_part_11, operator)
-            else:
-                full_operator_part_00 = kron(full_operator_part_00, OPERATOR_PAULI_I)
-                full_operator_part_01 = kron(full_operator_part_01, OPERATOR_PAULI_I)
-                full_operator_part_10 = kron(full_operator_part_10, OPERATOR_PAULI_I)
-                full_operator_part_11 = kron(full_operator_part_11, OPERATOR_PAULI_I)
-        full_operator = full_operator_part_00 + full_operator_part_01 + full_operator_part_10 + full_operator_part_11
-        qubit1.state.operate(full_operator)
+        # apply the 8 x 8 controlled-controlled operator on the three qubits only
+        state.operate(controlled_operator(operator, controls=2), [qubit1, qubit2, qubit3])
 
 
 Toffoli = ThreeQubitsGate(name="Toffoli Gate",
@@ -15,22 +15,34 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 import numpy as np
 
 from qns.models.qubit.const import QUBIT_STATE_0, QUBIT_STATE_1, \
         QUBIT_STATE_P, QUBIT_STATE_N, QUBIT_STATE_L, QUBIT_STATE_R
-from qns.models.qubit.utils import single_gate_expand, partial_trace, kron
+from qns.models.qubit.utils import PauliChannel, apply_operator, apply_operator_vector, apply_superoperator, kron, \
+        partial_trace
 from qns.models.core.backend import QuantumModel
 from qns.models.qubit.errors import QStateBaseError, QStateQubitNotInStateError, \
-                                    QStateSizeNotMatchError, OperatorNotMatchError
-from qns.utils.rnd import get_rand
+                                    QStateSizeNotMatchError, OperatorNotMatchError, OperatorError
+from qns.utils.rnd import BufferedGenerator, get_rand
 
 
 class QState(object):
     """
     QState is the state of one (or multiple) qubits
+
+    A state built from a state vector is kept as a state vector (the statevector mode), which saves
+    the memory and the cost of a density matrix. It is promoted to a density matrix (the density matrix mode)
+    by the first stochastic operation, e.g., the error models, or by setting ``rho``.
+
+    If ``auto_factorize`` is ``True``, the remaining qubits that are no longer entangled with the others
+    are split into their own states after every measurement and ``Swap``. It costs O(2^n) for every checked
+    qubit, plus the partial trace of a split qubit in the density matrix mode. ``factorize`` performs
+    the full (and more expensive) factorization.
     """
+    auto_factorize: bool = True
+
     def __init__(self, qubits: List["Qubit"] = [], state: Optional[np.ndarray] = QUBIT_STATE_0,
                  rho: Optional[np.ndarray] = None, name: Optional[str] = None):
         """
@@ -43,12 +55,13 @@ class QState(object):
         self.num = len(qubits)
         self.name = name
         self.qubits = qubits
-        self.rho = None
+        self._rho: Optional[np.ndarray] = None
+        self._vector: Optional[np.ndarray] = None
 
         if rho is None:
             if len(state) != 2**self.num:
                 raise QStateSizeNotMatchError
-            self.rho = np.dot(state, state.T.conjugate())
+            self._vector = np.reshape(state, (2**self.num, 1))
         else:
             if self.num != np.log2(rho.shape[0]) or self.num != np.log2(rho.shape[1]):
                 raise QStateSizeNotMatchError
@@ -57,12 +70,43 @@ class QState(object):
                 raise QStateSizeNotMatchError
             self.rho = rho
 
-    def measure(self, qubit: "Qubit" = None, base: str = "Z") -> int:
+    @property
+    def rho(self) -> np.ndarray:
+        """
+        The density matrix of this state. In the statevector mode, it is built from the state vector.
+        Setting it switches the state to the density matrix mode.
+        """
+        if self._vector is not None:
+            return np.dot(self._vector, self._vector.T.conjugate())
+        return self._rho
+
+    @rho.setter
+    def rho(self, rho: np.ndarray) -> None:
+        self._rho = rho
+        self._vector = None
+
+    @property
+    def vector(self) -> Optional[np.ndarray]:
+        """
+        The state vector in the statevector mode, or ``None`` in the density matrix mode
+        """
+        return self._vector
+
+    def to_density(self) -> None:
+        """
+        Promote the state to the density matrix mode
+        """
+        if self._vector is not None:
+            self.rho = self.rho
+
+    def measure(self, qubit: "Qubit" = None, base: str = "Z", rng: Optional[BufferedGenerator] = None) -> int:
         """
         Measure this qubit using Z basis
         Args:
             qubit (Qubit): the measuring qubit
             base: the measure base, "Z", "X" or "Y"
+            rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of an entity.
+                ``None`` means the current generator
 
         Returns:
             0: QUBIT_STATE_0 state
@@ -97,27 +141,21 @@ class QState(object):
         except AssertionError:
             raise QStateQubitNotInStateError
 
-        Full_M_0 = np.array([[1]])
-        Full_M_1 = np.array([[1]])
-        for i in range(self.num):
-            if i == idx:
-                Full_M_0 = kron(Full_M_0, M_0)
-                Full_M_1 = kron(Full_M_1, M_1)
-            else:
-                Full_M_0 = kron(Full_M_0, np.array([[1, 0], [0, 1]]))
-                Full_M_1 = kron(Full_M_1, np.array([[1, 0], [0, 1]]))
+        if self._vector is not None:
+            return self._measure_vector(qubit, idx, S_0, S_1, rng)
 
-        poss_0 = np.trace(np.dot(Full_M_0.T.conjugate(), np.dot(Full_M_0, self.rho)))
-        rn = get_rand()
+        rho_0 = apply_operator(self.rho, M_0, [idx], self.num)
+        poss_0 = np.trace(rho_0)
+        rn = get_rand(rng=rng)
 
         if rn < poss_0:
             ret = 0
             ret_s = S_0
-            self.rho = np.dot(Full_M_0, np.dot(self.rho, Full_M_0.T.conjugate())) / poss_0
+            self.rho = rho_0 / poss_0
         else:
             ret = 1
             ret_s = S_1
-            self.rho = np.dot(Full_M_1, np.dot(self.rho, Full_M_1.T.conjugate())) / (1-poss_0)
+            self.rho = apply_operator(self.rho, M_1, [idx], self.num) / (1-poss_0)
 
         self.rho = partial_trace(self.rho, idx)
         self.num -= 1
@@ -125,35 +163,198 @@ class QState(object):
 
         ns = QState([qubit], state=ret_s)
         qubit.state = ns
+        if self.auto_factorize:
+            self._factorize_qubits(list(self.qubits))
+        return ret
+
+    def _measure_vector(self, qubit: "Qubit", idx: int, S_0: np.ndarray, S_1: np.ndarray,
+                        rng: Optional[BufferedGenerator] = None) -> int:
+        # project the qubit's axis of the state vector onto the basis states
+        tensor = self._vector.reshape([2] * self.num)
+        amp_0 = np.tensordot(S_0.conjugate().ravel(), tensor, axes=(0, idx))
+        poss_0 = np.vdot(amp_0, amp_0).real
+        rn = get_rand(rng=rng)
+
+        if rn < poss_0:
+            ret = 0
+            ret_s = S_0
+            amp = amp_0 / np.sqrt(poss_0)
+        else:
+            ret = 1
+            ret_s = S_1
+            amp = np.tensordot(S_1.conjugate().ravel(), tensor, axes=(0, idx)) / np.sqrt(1 - poss_0)
+
+        self._vector = amp.reshape((2**(self.num - 1), 1))
+        self.num -= 1
+        self.qubits.remove(qubit)
+
+        ns = QState([qubit], state=ret_s)
+        qubit.state = ns
+        if self.auto_factorize:
+            self._factorize_qubits(list(self.qubits))
         return ret
 
-    def operate(self, operator: np.ndarray):
+    def _marginal(self, idxs: List[int]) -> np.ndarray:
+        # the reduced density matrix of the qubits ``idxs`` (in ascending order)
+        n = self.num
+        k = len(idxs)
+        others = [i for i in range(n) if i not in idxs]
+        if self._vector is not None:
+            tensor = self._vector.reshape([2] * n)
+            return np.tensordot(tensor, tensor.conjugate(), axes=(others, others)).reshape(2**k, 2**k)
+        cols = [n + i if i in idxs else i for i in range(n)]
+        return np.einsum(self._rho.reshape([2] * (2 * n)), list(range(n)) + cols,
+                         list(idxs) + [n + i for i in idxs]).reshape(2**k, 2**k)
+
+    def factorize(self, eps: float = 1e-9) -> List["QState"]:
+        """
+        Split this state into independent states if it is a product state, and let every qubit refer to
+        its own factor. The candidate factors are the qubits that are connected by correlated two-qubit
+        marginals, and every split is verified before it is applied. This state keeps the last factor.
+
+        Args:
+            eps (float): the accuracy
+        Returns:
+            the list of the factors
+        """
+        if self.num <= 1:
+            return [self]
+        n = self.num
+        singles = [self._marginal([i]) for i in range(n)]
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(n):
+            for j in range(i + 1, n):
+                if find(i) == find(j):
+                    continue
+                if not np.allclose(self._marginal([i, j]), kron(singles[i], singles[j]), atol=eps):
+                    parent[find(j)] = find(i)
+
+        groups: Dict[int, List["Qubit"]] = {}
+        for i, q in enumerate(self.qubits):
+            groups.setdefault(find(i), []).append(q)
+        if len(groups) == 1:
+            return [self]
+
+        factors = []
+        pending: List["Qubit"] = []  # the qubits that can not be split, merged into the next group
+        for group in list(groups.values())[:-1]:
+            ns = self._split(pending + group, eps)
+            if ns is None:
+                pending = pending + group
+            else:
+                factors.append(ns)
+                pending = []
+        factors.append(self)
+        return factors
+
+    def _factorize_qubits(self, qubits: List["Qubit"], eps: float = 1e-9) -> None:
+        # split every single qubit of ``qubits`` that is not entangled with the others, the automatic
+        # factorization after measurements and ``Swap``. A state vector is split by the rank of the qubit's axis.
+        # A density matrix is split if the reduced state of the qubit is pure, which implies a product state.
+        for q in qubits:
+            if self.num <= 1:
+                return
+            if q not in self.qubits:
+                continue
+            if self._vector is not None:
+                self._split([q], eps)
+                continue
+            idx = self.qubits.index(q)
+            rho_q = self._marginal([idx])
+            if abs(1 - np.trace(np.dot(rho_q, rho_q)).real) > eps:
+                continue
+            _, vectors = np.linalg.eigh(rho_q)
+            ns = QState([q], state=vectors[:, 1:])
+            self.rho = self._marginal([i for i in range(self.num) if i != idx])
+            self.qubits = self.qubits[:idx] + self.qubits[idx + 1:]
+            self.num -= 1
+            q.state = ns
+
+    def _split(self, qubits: List["Qubit"], eps: float) -> Optional["QState"]:
+        # move ``qubits`` to a new state if they are not correlated with the others
+        n = self.num
+        idxs = sorted(self._indexes(qubits))
+        rest = [i for i in range(n) if i not in idxs]
+        k = len(idxs)
+        qubits = [self.qubits[i] for i in idxs]
+        if self._vector is not None:
+            matrix = np.moveaxis(self._vector.reshape([2] * n), idxs, list(range(k))).reshape(2**k, -1)
+            u, s, vh = np.linalg.svd(matrix, full_matrices=False)
+            if np.sum(s[1:]) > eps:
+                return None
+            ns = QState(qubits, state=u[:, :1])
+            self._vector = (s[0] * vh[0]).reshape((2**(n - k), 1))
+        else:
+            rho_a = self._marginal(idxs)
+            rho_b = self._marginal(rest)
+            order = idxs + rest
+            rho = self._rho.reshape([2] * (2 * n)).transpose(order + [n + i for i in order]).reshape(2**n, 2**n)
+            if not np.allclose(rho, kron(rho_a, rho_b), atol=eps):
+                return None
+            ns = QState(qubits, rho=rho_a)
+            self.rho = rho_b
+        for q in qubits:
+            q.state = ns
+        self.qubits = [self.qubits[i] for i in rest]
+        self.num = n - k
+        return ns
+
+    def _indexes(self, qubits: List["Qubit"]) -> List[int]:
+        try:
+            return [self.qubits.index(q) for q in qubits]
+        except ValueError:
+            raise QStateQubitNotInStateError
+
+    def operate(self, operator: np.ndarray, qubits: Optional[List["Qubit"]] = None):
         """
         transform using `operator`
 
         Args:
-            operator (np.ndarray): the operator
+            operator (np.ndarray): the operator on all qubits, or on ``qubits`` if it is given
+            qubits (List[Qubit]): the target qubits of ``operator``. The operator is applied by contracting
+                only the axes of these qubits, without expanding it to all qubits.
         Raises:
             OperatorNotMatchError
         """
+        if qubits is not None:
+            if operator.shape != (2**len(qubits), 2**len(qubits)):
+                raise OperatorNotMatchError
+            if self._vector is not None:
+                self._vector = apply_operator_vector(self._vector, operator, self._indexes(qubits), self.num)
+            else:
+                self.rho = apply_operator(self.rho, operator, self._indexes(qubits), self.num)
+            return
         operator_size = operator.shape
         if operator_size == (2**self.num, 2**self.num):
             # joint qubit operate
             full_operator = operator
         else:
             raise OperatorNotMatchError
+        if self._vector is not None:
+            self._vector = np.dot(full_operator, self._vector)
+            return
         self.rho = np.dot(full_operator, np.dot(self.rho, full_operator.T.conjugate()))
 
-    def stochastic_operate(self, list_operators: List[np.ndarray] = [], list_p: List[float] = []):
+    def stochastic_operate(self, list_operators: List[np.ndarray] = [], list_p: List[float] = [],
+                           qubits: Optional[List["Qubit"]] = None):
         """
         A stochastic operate progess. It usually turns a pure state into a mixed state.
 
         Args:
             list_operators (List[np.ndarray]): a list of operators
             list_p (List[float]): a list of possibility
+            qubits (List[Qubit]): the target qubits of the operators, see ``operate``
         Raises:
             OperatorNotMatchError
         """
+        self.to_density()
         new_state = np.zeros((2**self.num, 2**self.num), dtype=complex)
 
         if len(list_operators) != len(list_p):
@@ -168,6 +369,15 @@ class QState(object):
         if abs(1-sum) >= 1e-6:
             raise OperatorNotMatchError("Probabilities are not normalized")
 
+        if qubits is not None:
+            idxs = self._indexes(qubits)
+            for idx, operator in enumerate(list_operators):
+                if operator.shape != (2**len(qubits), 2**len(qubits)):
+                    raise OperatorNotMatchError
+                new_state += list_p[idx] * apply_operator(self.rho, operator, idxs, self.num)
+            self.rho = new_state
+            return
+
         for idx, operator in enumerate(list_operators):
             operator_size = operator.shape
             if operator_size == (2**self.num, 2**self.num):
@@ -177,6 +387,22 @@ class QState(object):
             new_state += list_p[idx] * np.dot(full_operator, np.dot(self.rho, full_operator.T.conjugate()))
         self.rho = new_state
 
+    def apply_pauli_channel(self, channel: PauliChannel, qubits: List["Qubit"],
+                            rng: Optional[BufferedGenerator] = None) -> None:
+        """
+        Apply a Pauli error channel independently on every qubit in ``qubits``. The superoperator of
+        the channel is contracted with the axes of these qubits only, and all qubits are handled in one contraction.
+        It turns the state into the density matrix mode.
+
+        Args:
+            channel (PauliChannel): the channel from ``pauli_channel``
+            qubits (List[Qubit]): the target qubits
+            rng (BufferedGenerator): not used, as the channel is applied on the density matrix
+        """
+        idxs = self._indexes(qubits)
+        self.to_density()
+        self.rho = apply_superoperator(self.rho, channel.superoperator, idxs, self.num)
+
     def equal(self, other_state: "QState") -> bool:
         """
         compare two state vectors, return True if they are the same
@@ -194,6 +420,8 @@ class QState(object):
         Returns:
             bool, if the state is a pure state
         """
+        if self._vector is not None:
+            return True
         return abs(np.trace(np.dot(self.rho, self.rho)) - 1) <= eps
 
     def state(self) -> np.ndarray:
@@ -203,6 +431,8 @@ class QState(object):
         Returns:
             The pure state vector
         """
+        if self._vector is not None:
+            return self._vector
         if not self.is_pure_state():
             print(self.rho.T.conjugate() * self.rho)
             return None
@@ -226,64 +456,78 @@ class Qubit(QuantumModel):
 
     def __init__(self, state=QUBIT_STATE_0, rho: np.ndarray = None,
                  operate_decoherence_rate: float = 0, measure_decoherence_rate: float = 0,
-                 name: Optional[str] = None):
+                 name: Optional[str] = None, state_cls: type = QState):
         """
         Args:
             state (list): the initial state of a qubit, default is |0> = [1, 0]^T
             operate_decoherence_rate (float): the operate decoherence rate
             measure_decoherence_rate (float): the measure decoherence rate
             name (str): the qubit's name
+            state_cls (type): the backend of the quantum state, ``QState`` or ``StabilizerState``
         """
 
         self.name = name
-        self.state = QState([self], state=state, rho=rho)
+        self.state = state_cls([self], state=state, rho=rho)
         self.operate_decoherence_rate = operate_decoherence_rate
         self.measure_decoherence_rate = measure_decoherence_rate
 
-    def measure(self):
+    def measure(self, rng: Optional[BufferedGenerator] = None):
         """
         Measure this qubit using Z basis
 
+        Args:
+            rng (BufferedGenerator): the generator to draw from, e.g., the ``rng`` of the measuring entity.
+                ``None`` means the current generator
+
         Returns:
             0: QUBIT_STATE_0 state
             1: QUBIT_STATE_1 state
         """
-        self.measure_error_model(decoherence_rate=self.measure_decoherence_rate)
-        return self.state.measure(self)
+        self.measure_error_model(decoherence_rate=self.measure_decoherence_rate, rng=rng)
+        return self.state.measure(self, rng=rng)
 
-    def measureX(self):
+    def measureX(self, rng: Optional[BufferedGenerator] = None):
         """
         Measure this qubit using X basis.
 
+        Args:
+            rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+
         Returns:
             0: QUBIT_STATE_P state
             1: QUBIT_STATE_N state
         """
-        self.measure_error_model(self.measure_decoherence_rate)
-        return self.state.measure(self, "X")
+        self.measure_error_model(self.measure_decoherence_rate, rng=rng)
+        return self.state.measure(self, "X", rng=rng)
 
-    def measureY(self):
+    def measureY(self, rng: Optional[BufferedGenerator] = None):
         """
         Measure this qubit using Y basis.
         Only for not entangled qubits.
 
+        Args:
+            rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+
         Returns:
             0: QUBIT_STATE_R state
             1: QUBIT_STATE_L state
         """
-        self.measure_error_model(self.measure_decoherence_rate)
-        return self.state.measure(self, "Y")
+        self.measure_error_model(self.measure_decoherence_rate, rng=rng)
+        return self.state.measure(self, "Y", rng=rng)
 
-    def measureZ(self):
+    def measureZ(self, rng: Optional[BufferedGenerator] = None):
         """
         Measure this qubit using Z basis
 
+        Args:
+            rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+
         Returns:
             0: QUBIT_STATE_0 state
             1: QUBIT_STATE_1 state
         """
-        self.measure_error_model(self.measure_decoherence_rate)
-        return self.measure()
+        self.measure_error_model(self.measure_decoherence_rate, rng=rng)
+        return self.measure(rng=rng)
 
     def operate(self, operator: Any) -> None:
         """
@@ -297,8 +541,9 @@ class Qubit(QuantumModel):
         if isinstance(operator, SingleQubitGate):
             operator(self)
             return
-        full_operator = single_gate_expand(self, operator)
-        self.state.operate(full_operator)
+        if operator.shape != (2, 2):
+            raise OperatorError
+        self.state.operate(operator, [self])
 
     def _operate_without_error(self, operator: Any) -> None:
         """
@@ -311,8 +556,9 @@ class Qubit(QuantumModel):
         if isinstance(operator, SingleQubitGate):
             operator(self)
             return
-        full_operator = single_gate_expand(self, operator)
-        self.state.operate(full_operator)
+        if operator.shape != (2, 2):
+            raise OperatorError
+        self.state.operate(operator, [self])
 
     def stochastic_operate(self, list_operators: List[np.ndarray] = [], list_p: List[float] = []):
         """
@@ -325,13 +571,13 @@ class Qubit(QuantumModel):
             OperatorNotMatchError
         """
         from qns.models.qubit.gate import SingleQubitGate
-        full_operators_list = []
+        operators_list = []
         for operator in list_operators:
             if isinstance(operator, SingleQubitGate):
-                full_operators_list.append(single_gate_expand(self, operator._operator))
+                operators_list.append(operator._operator)
             else:
-                full_operators_list.append(single_gate_expand(self, operator))
-        self.state.stochastic_operate(full_operators_list, list_p)
+                operators_list.append(operator)
+        self.state.stochastic_operate(operators_list, list_p, [self])
 
     def __repr__(self) -> str:
         if self.name is not None:
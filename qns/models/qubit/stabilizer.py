@@ -0,0 +1,649 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from qns.models.qubit.const import OPERATOR_HADAMARD, OPERATOR_PAULI_I, OPERATOR_PAULI_X, \
+        OPERATOR_PAULI_Y, OPERATOR_PAULI_Z, OPERATOR_S, OPERATOR_SWAP, QUBIT_STATE_0
+from qns.models.qubit.errors import OperatorNotCliffordError, OperatorNotMatchError, QStateBaseError, \
+        QStateNotStabilizerError, QStateQubitNotInStateError
+from qns.models.qubit.qubit import QState, Qubit
+from qns.models.qubit.utils import PauliChannel, controlled_operator, kron
+from qns.utils.rnd import BufferedGenerator, get_rand
+
+MAX_CONVERT_QUBITS = 8
+"""
+The largest state vector that is converted into a stabilizer tableau, the conversion costs O(8^n)
+"""
+
+
+def _key(operator: np.ndarray) -> bytes:
+    # the operator up to a global phase
+    flat = operator.ravel()
+    pivot = flat[np.flatnonzero(np.abs(flat) > 1e-9)[0]]
+    normalized = np.round(operator * (abs(pivot) / pivot), 8) + 0  # + 0 removes -0
+    return normalized.astype(np.complex128).tobytes()
+
+
+def _single_qubit_cliffords() -> Dict[bytes, List[str]]:
+    # the 24 single qubit Clifford operators as the shortest H and S sequences
+    table = {_key(OPERATOR_PAULI_I): []}
+    frontier = [([], OPERATOR_PAULI_I)]
+    while len(frontier) > 0:
+        new_frontier = []
+        for word, operator in frontier:
+            for name, gate in (("h", OPERATOR_HADAMARD), ("s", OPERATOR_S)):
+                new_operator = np.dot(gate, operator)
+                key = _key(new_operator)
+                if key not in table:
+                    table[key] = word + [name]
+                    new_frontier.append((word + [name], new_operator))
+        frontier = new_frontier
+    # apply the Pauli operators directly on the signs
+    table[_key(OPERATOR_PAULI_X)] = ["x"]
+    table[_key(OPERATOR_PAULI_Y)] = ["y"]
+    table[_key(OPERATOR_PAULI_Z)] = ["z"]
+    return table
+
+
+_CLIFFORD_1 = _single_qubit_cliffords()
+_CLIFFORD_2 = {
+    _key(np.eye(4)): [],
+    _key(controlled_operator(OPERATOR_PAULI_X)): ["cx"],
+    _key(controlled_operator(OPERATOR_PAULI_Y)): ["cy"],
+    _key(controlled_operator(OPERATOR_PAULI_Z)): ["cz"],
+    _key(OPERATOR_SWAP): ["swap"],
+}
+
+
+def _phase(x1: np.ndarray, z1: np.ndarray, x2: np.ndarray, z2: np.ndarray) -> np.ndarray:
+    # the exponent of i when multiplying the Pauli operators (x1, z1) and (x2, z2), summed over qubits
+    x1, z1, x2, z2 = (np.asarray(a, dtype=np.int16) for a in (x1, z1, x2, z2))
+    g = x1 * z1 * (z2 - x2) + x1 * (1 - z1) * z2 * (2 * x2 - 1) + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+    return g.sum(axis=-1)
+
+
+def _gf2_solve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # solve ``a @ x = b`` over GF(2), where ``a`` has full row rank
+    rows, cols = a.shape
+    m = np.concatenate([a, b], axis=1).astype(np.uint8)
+    pivots = []
+    row = 0
+    for col in range(cols):
+        hits = np.flatnonzero(m[row:, col]) + row
+        if len(hits) == 0:
+            continue
+        m[[row, hits[0]]] = m[[hits[0], row]]
+        others = np.flatnonzero(m[:, col])
+        others = others[others != row]
+        m[others] ^= m[row]
+        pivots.append(col)
+        row += 1
+        if row == rows:
+            break
+    x = np.zeros((cols, b.shape[1]), dtype=np.uint8)
+    for i, col in enumerate(pivots):
+        x[col] = m[i, cols:]
+    return x
+
+
+class StabilizerState(QState):
+    """
+    StabilizerState is a stabilizer tableau (CHP) backend of ``QState``.
+
+    A state of n qubits is stored as n destabilizers and n stabilizers, i.e., the Pauli operators
+    ``(x, z, r)`` on every qubit, so it simulates hundreds of entangled qubits. The Clifford operators
+    (``H``, ``S``, the Pauli gates, ``CNOT``, ``CY``, ``CZ`` and ``Swap``, up to a global phase) cost O(n),
+    and a measurement costs O(n^2). A stochastic operation samples one of the operators (a Pauli frame),
+    so that ``DephaseError``, ``DepolarError`` and ``BitFlipError`` keep the state in the tableau.
+
+    A non-Clifford operator, e.g., ``T``, ``RX`` or ``U``, raises ``OperatorNotCliffordError``.
+    If ``fallback`` is ``True`` (e.g., in a subclass), the state is converted to a dense ``QState`` instead.
+    """
+    fallback: bool = False
+
+    def __init__(self, qubits: List[Qubit] = [], state: Optional[np.ndarray] = QUBIT_STATE_0,
+                 rho: Optional[np.ndarray] = None, name: Optional[str] = None):
+        """
+        Args:
+            qubits (List[Qubit]): a list of qubits in this quantum state
+            state: the state vector of this state, it should be a stabilizer state
+            rho: not supported, a stabilizer state is always pure
+            name (str): the name of this state
+        Raises:
+            QStateNotStabilizerError
+        """
+        self.num = len(qubits)
+        self.name = name
+        self.qubits = qubits
+        if rho is not None:
+            raise QStateNotStabilizerError("a stabilizer state can not be built from a density matrix")
+        state = np.asarray(state).reshape(-1)
+        if len(state) != 2**self.num:
+            raise QStateNotStabilizerError("the size of the state vector does not match")
+        if abs(abs(state[0]) - 1) < 1e-9:
+            # |0...0>: the destabilizers are X and the stabilizers are Z
+            n = self.num
+            self.x = np.zeros((2 * n, n), dtype=np.uint8)
+            self.z = np.zeros((2 * n, n), dtype=np.uint8)
+            self.r = np.zeros(2 * n, dtype=np.uint8)
+            self.x[np.arange(n), np.arange(n)] = 1
+            self.z[np.arange(n, 2 * n), np.arange(n)] = 1
+        else:
+            self.x, self.z, self.r = _tableau_from_vector(state, self.num)
+
+    @classmethod
+    def from_qstate(cls, state: QState) -> "StabilizerState":
+        """
+        Convert a dense ``QState`` in the statevector mode into a stabilizer state.
+        The qubits still refer to the original state.
+
+        Args:
+            state (QState): the dense state
+        Raises:
+            QStateNotStabilizerError
+        """
+        if state.vector is None or state.num > MAX_CONVERT_QUBITS:
+            raise QStateNotStabilizerError
+        return cls(list(state.qubits), state=state.vector, name=state.name)
+
+    def _tableau(self, qubits: List[Qubit], x: np.ndarray, z: np.ndarray, r: np.ndarray) -> "StabilizerState":
+        ns = type(self).__new__(type(self))
+        ns.num = len(qubits)
+        ns.name = None
+        ns.qubits = qubits
+        ns.x, ns.z, ns.r = x, z, r
+        return ns
+
+    def tensor(self, other: "StabilizerState") -> "StabilizerState":
+        """
+        The joint state of ``self`` and ``other``, i.e., the direct sum of the tableaus
+
+        Args:
+            other (StabilizerState): the other state
+        Returns:
+            the joint state on ``self.qubits + other.qubits``
+        """
+        n1, n2 = self.num, other.num
+        n = n1 + n2
+        x = np.zeros((2 * n, n), dtype=np.uint8)
+        z = np.zeros((2 * n, n), dtype=np.uint8)
+        r = np.zeros(2 * n, dtype=np.uint8)
+        for s, rows, cols in ((self, (0, n), (0, n1)), (other, (n1, n + n1), (n1, n))):
+            for half, row in enumerate(rows):
+                src = slice(half * s.num, (half + 1) * s.num)
+                dst = slice(row, row + s.num)
+                x[dst, cols[0]:cols[1]] = s.x[src]
+                z[dst, cols[0]:cols[1]] = s.z[src]
+                r[dst] = s.r[src]
+        return self._tableau(self.qubits + other.qubits, x, z, r)
+
+    def to_qstate(self) -> QState:
+        """
+        Convert the state into a dense ``QState`` in the statevector mode. It costs O(8^n).
+        The qubits still refer to the stabilizer state.
+
+        Returns:
+            the dense state
+        """
+        n = self.num
+        rho = np.eye(2**n, dtype=np.complex128)
+        for row in range(n, 2 * n):
+            pauli = np.array([1], dtype=np.complex128)
+            for j in range(n):
+                pauli = kron(pauli, (OPERATOR_PAULI_I, OPERATOR_PAULI_Z,
+                                     OPERATOR_PAULI_X, OPERATOR_PAULI_Y)[2 * self.x[row, j] + self.z[row, j]])
+            rho = np.dot(rho, (np.eye(2**n) + (1 - 2 * int(self.r[row])) * pauli) / 2)
+        col = np.argmax(np.linalg.norm(rho, axis=0))
+        vector = rho[:, col] / np.linalg.norm(rho[:, col])
+        return QState(list(self.qubits), state=vector.reshape((2**n, 1)), name=self.name)
+
+    def _fall_back(self) -> QState:
+        if not self.fallback:
+            raise OperatorNotCliffordError
+        ns = self.to_qstate()
+        for q in ns.qubits:
+            q.state = ns
+        return ns
+
+    @property
+    def rho(self) -> np.ndarray:
+        """
+        The density matrix of this state, it costs O(8^n)
+        """
+        vector = self.vector
+        return np.dot(vector, vector.T.conjugate())
+
+    @property
+    def vector(self) -> np.ndarray:
+        """
+        The state vector of this state, it costs O(8^n)
+        """
+        return self.to_qstate().vector
+
+    def is_pure_state(self, eps: float = 0.000_001) -> bool:
+        """
+        A stabilizer state is always a pure state
+        """
+        return True
+
+    def state(self) -> np.ndarray:
+        """
+        Returns:
+            The pure state vector
+        """
+        return self.vector
+
+    # the Clifford operators on the tableau, ``a`` and ``b`` are the indexes of the qubits
+
+    def _h(self, a: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def _s(self, a: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def _sdg(self, a: int) -> None:
+        self._z(a)
+        self._s(a)
+
+    def _x(self, a: int) -> None:
+        self.r ^= self.z[:, a]
+
+    def _y(self, a: int) -> None:
+        self.r ^= self.x[:, a] ^ self.z[:, a]
+
+    def _z(self, a: int) -> None:
+        self.r ^= self.x[:, a]
+
+    def _cx(self, a: int, b: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, b] & (self.x[:, b] ^ self.z[:, a] ^ 1)
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def _cz(self, a: int, b: int) -> None:
+        self._h(b)
+        self._cx(a, b)
+        self._h(b)
+
+    def _cy(self, a: int, b: int) -> None:
+        self._sdg(b)
+        self._cx(a, b)
+        self._s(b)
+
+    def _swap(self, a: int, b: int) -> None:
+        self.x[:, [a, b]] = self.x[:, [b, a]]
+        self.z[:, [a, b]] = self.z[:, [b, a]]
+
+    def _clifford(self, operator: np.ndarray, qubits: Optional[List[Qubit]]) -> Tuple[Optional[List[str]], List[int]]:
+        # look up the operator in the Clifford tables, the word is ``None`` for a non-Clifford operator
+        if qubits is None:
+            qubits = self.qubits
+        if operator.shape != (2**len(qubits), 2**len(qubits)):
+            raise OperatorNotMatchError
+        idxs = self._indexes(qubits)
+        table = _CLIFFORD_1 if len(idxs) == 1 else _CLIFFORD_2 if len(idxs) == 2 else {}
+        if not np.any(np.abs(operator) > 1e-9):
+            return None, idxs
+        return table.get(_key(operator)), idxs
+
+    def _apply(self, word: List[str], idxs: List[int]) -> None:
+        for name in word:
+            getattr(self, "_" + name)(*idxs)
+
+    def operate(self, operator: np.ndarray, qubits: Optional[List[Qubit]] = None):
+        """
+        transform using a Clifford `operator`
+
+        Args:
+            operator (np.ndarray): the operator on all qubits, or on ``qubits`` if it is given
+            qubits (List[Qubit]): the target qubits of ``operator``
+        Raises:
+            OperatorNotMatchError
+            OperatorNotCliffordError
+        """
+        word, idxs = self._clifford(operator, qubits)
+        if word is None:
+            self._fall_back().operate(operator, qubits)
+            return
+        self._apply(word, idxs)
+
+    def stochastic_operate(self, list_operators: List[np.ndarray] = [], list_p: List[float] = [],
+                           qubits: Optional[List[Qubit]] = None):
+        """
+        Sample one of the Clifford operators with its possibility and apply it,
+        i.e., a sampled Pauli frame for the Pauli error models
+
+        Args:
+            list_operators (List[np.ndarray]): a list of operators
+            list_p (List[float]): a list of possibility
+            qubits (List[Qubit]): the target qubits of the operators, see ``operate``
+        Raises:
+            OperatorNotMatchError
+            OperatorNotCliffordError
+        """
+        if len(list_operators) != len(list_p):
+            raise OperatorNotMatchError("Not match number between operators and possibilities")
+        for p in list_p:
+            if p < 0 or p > 1:
+                raise OperatorNotMatchError("possibility not in range")
+        if abs(1 - sum(list_p)) >= 1e-6:
+            raise OperatorNotMatchError("Probabilities are not normalized")
+
+        words = [self._clifford(operator, qubits) for operator in list_operators]
+        if any(word is None for word, _ in words):
+            self._fall_back().stochastic_operate(list_operators, list_p, qubits)
+            return
+        rn = get_rand()
+        for (word, idxs), p in zip(words, list_p):
+            if rn < p:
+                self._apply(word, idxs)
+                return
+            rn -= p
+
+    def apply_pauli_channel(self, channel: PauliChannel, qubits: List[Qubit],
+                            rng: Optional[BufferedGenerator] = None) -> None:
+        """
+        Sample a Pauli operator of the channel independently for every qubit in ``qubits`` and apply it
+
+        Args:
+            channel (PauliChannel): the channel from ``pauli_channel``
+            qubits (List[Qubit]): the target qubits
+            rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+        """
+        for a in self._indexes(qubits):
+            rn = get_rand(rng=rng)
+            for name, w in zip("ixyz", channel.weights):
+                if rn < w:
+                    if name != "i":
+                        getattr(self, "_" + name)(a)
+                    break
+                rn -= w
+
+    def measure(self, qubit: Qubit = None, base: str = "Z", rng: Optional[BufferedGenerator] = None) -> int:
+        """
+        Measure this qubit, and move it into a new single qubit state
+
+        Args:
+            qubit (Qubit): the measuring qubit
+            base: the measure base, "Z", "X" or "Y"
+            rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+
+        Returns:
+            0: the +1 eigenstate of the base
+            1: the -1 eigenstate of the base
+        """
+        ret = self._measure_qubit(qubit, base, rng)
+        if self.auto_factorize:
+            self._factorize_qubits(list(self.qubits))
+        return ret
+
+    def _measure_qubit(self, qubit: Qubit, base: str, rng: Optional[BufferedGenerator] = None) -> int:
+        if base not in ("Z", "X", "Y"):
+            raise QStateBaseError
+        try:
+            a = self.qubits.index(qubit)
+        except ValueError:
+            raise QStateQubitNotInStateError
+
+        # rotate the base to Z
+        if base == "X":
+            self._h(a)
+        elif base == "Y":
+            self._sdg(a)
+            self._h(a)
+        ret = self._measure_z(a, rng)
+        self._remove(a)
+
+        ns = type(self)([qubit])
+        if ret == 1:
+            ns._x(0)
+        if base == "X":
+            ns._h(0)
+        elif base == "Y":
+            ns._h(0)
+            ns._s(0)
+        qubit.state = ns
+        return ret
+
+    def _factorize_qubits(self, qubits: List[Qubit], eps: float = 1e-9) -> None:
+        # a qubit is not entangled with the others iff all the stabilizers have the same Pauli operator
+        # (or the identity) on it. It is an eigenstate of this operator, so that measuring the operator
+        # splits it without changing the state. It costs O(n^2) for every qubit.
+        for q in qubits:
+            if self.num <= 1:
+                return
+            if q not in self.qubits:
+                continue
+            a = self.qubits.index(q)
+            paulis = 2 * self.x[self.num:, a] + self.z[self.num:, a]
+            paulis = np.unique(paulis[paulis != 0])
+            if len(paulis) == 1:
+                self._measure_qubit(q, "IZXY"[paulis[0]])
+
+    def factorize(self, eps: float = 1e-9) -> List[QState]:
+        """
+        Split this state into independent states, and let every qubit refer to its own factor.
+        The stabilizers are brought to the reduced row echelon form, whose supports are exactly
+        the smallest factors. It costs O(n^3). This state keeps the last factor.
+
+        Args:
+            eps (float): not used, for the compatibility with ``QState.factorize``
+        Returns:
+            the list of the factors
+        """
+        n = self.num
+        if n <= 1:
+            return [self]
+        # the reduced row echelon form, the columns are ordered as x_0, z_0, x_1, z_1, ...
+        row = n
+        for col in range(2 * n):
+            bits = (self.x if col % 2 == 0 else self.z)[:, col // 2]
+            hits = n + np.flatnonzero(bits[n:])
+            candidates = hits[hits >= row]
+            if len(candidates) == 0:
+                continue
+            p = candidates[0]
+            if p != row:
+                for rows in ((p, row), (p - n, row - n)):
+                    self.x[list(rows)] = self.x[list(rows[::-1])]
+                    self.z[list(rows)] = self.z[list(rows[::-1])]
+                    self.r[list(rows)] = self.r[list(rows[::-1])]
+                hits = n + np.flatnonzero(bits[n:])
+            others = hits[hits != row]
+            if len(others) > 0:
+                self._rowsum(others, row)
+                self.x[row - n] ^= np.bitwise_xor.reduce(self.x[others - n], axis=0)
+                self.z[row - n] ^= np.bitwise_xor.reduce(self.z[others - n], axis=0)
+            row += 1
+            if row == 2 * n:
+                break
+
+        # every stabilizer is supported by one factor
+        support = (self.x[n:] | self.z[n:]).astype(bool)
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for qs in support:
+            qs = np.flatnonzero(qs)
+            for q in qs[1:]:
+                parent[find(q)] = find(qs[0])
+        groups: Dict[int, List[int]] = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        if len(groups) == 1:
+            return [self]
+
+        owner = np.array([find(np.flatnonzero(qs)[0]) for qs in support])
+        factors = []
+        for root, idxs in groups.items():
+            rows = np.flatnonzero(owner == root)
+            rows = np.concatenate([rows, n + rows])
+            x = self.x[np.ix_(rows, idxs)]
+            z = self.z[np.ix_(rows, idxs)]
+            ns = self._tableau([self.qubits[i] for i in idxs], x, z, self.r[rows])
+            factors.append(ns)
+        last = factors[-1]
+        self.qubits, self.num, self.x, self.z, self.r = last.qubits, last.num, last.x, last.z, last.r
+        factors[-1] = self
+        for ns in factors:
+            for q in ns.qubits:
+                q.state = ns
+        return factors
+
+    def _rowsum(self, rows: np.ndarray, p: int) -> None:
+        # multiply the row ``p`` into ``rows``
+        total = 2 * self.r[rows].astype(np.int16) + 2 * int(self.r[p]) \
+            + _phase(self.x[p], self.z[p], self.x[rows], self.z[rows])
+        self.r[rows] = (total % 4) // 2
+        self.x[rows] ^= self.x[p]
+        self.z[rows] ^= self.z[p]
+
+    def _measure_z(self, a: int, rng: Optional[BufferedGenerator] = None) -> int:
+        n = self.num
+        hits = np.flatnonzero(self.x[n:, a])
+        if len(hits) > 0:
+            # the outcome is random
+            p = n + hits[0]
+            rows = np.flatnonzero(self.x[:, a])
+            rows = rows[rows != p]
+            if len(rows) > 0:
+                self._rowsum(rows, p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, a] = 1
+            ret = 1 if get_rand(rng=rng) < 0.5 else 0
+            self.r[p] = ret
+            return ret
+
+        # the outcome is determined, multiply the stabilizers that build Z_a
+        sx = np.zeros(n, dtype=np.uint8)
+        sz = np.zeros(n, dtype=np.uint8)
+        sr = 0
+        for i in np.flatnonzero(self.x[:n, a]):
+            row = n + i
+            sr = ((2 * sr + 2 * int(self.r[row]) + int(_phase(self.x[row], self.z[row], sx, sz))) % 4) // 2
+            sx ^= self.x[row]
+            sz ^= self.z[row]
+        return sr
+
+    def _remove(self, a: int) -> None:
+        # remove the qubit ``a``, which is not entangled with the others (e.g., a measured qubit)
+        n = self.num
+        rows = n + np.flatnonzero(self.x[n:, a] | self.z[n:, a])
+        p, others = rows[0], rows[1:]
+        if len(others) > 0:
+            # the other stabilizers have the same Pauli operator on ``a``, cancel it
+            self._rowsum(others, p)
+            self.x[p - n] ^= np.bitwise_xor.reduce(self.x[others - n], axis=0)
+            self.z[p - n] ^= np.bitwise_xor.reduce(self.z[others - n], axis=0)
+        keep = np.ones(2 * n, dtype=bool)
+        keep[[p - n, p]] = False
+        self.x = np.delete(self.x[keep], a, axis=1)
+        self.z = np.delete(self.z[keep], a, axis=1)
+        self.r = self.r[keep]
+        self.num -= 1
+        self.qubits.remove(self.qubits[a])
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return "<stabilizer state "+self.name+">"
+        rows = []
+        for row in range(self.num, 2 * self.num):
+            rows.append(("-" if self.r[row] else "+") + "".join(
+                "IZXY"[2 * self.x[row, j] + self.z[row, j]] for j in range(self.num)))
+        return "<stabilizer state " + ", ".join(rows) + ">"
+
+
+def _tableau_from_vector(state: np.ndarray, num: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # find the Pauli operators that stabilize ``state``, it costs O(8^n)
+    if num > MAX_CONVERT_QUBITS:
+        raise QStateNotStabilizerError
+    dim = 2**num
+    psi = np.asarray(state, dtype=np.complex128).reshape(-1)
+    psi = psi / np.linalg.norm(psi)
+    k = np.arange(dim)
+    popcount = np.array([bin(i).count("1") for i in range(dim)])
+    signs = 1 - 2 * (popcount[k[:, None] & k[None, :]] % 2)  # signs[z, k] = (-1)^{|k & z|}
+    bits = (k[:, None] >> np.arange(num - 1, -1, -1)) & 1  # qubit 0 is the most significant bit
+
+    basis: List[np.ndarray] = []
+    pivots: List[int] = []
+    stabilizers = []
+    for xb in range(dim):
+        # <psi| i^{|x & z|} X^x Z^z |psi> for all z
+        values = np.dot(signs[:, k ^ xb], psi.conjugate() * psi[k ^ xb]) * 1j ** popcount[xb & k]
+        for zb in np.flatnonzero(np.abs(np.abs(values) - 1) < 1e-6):
+            if xb == 0 and zb == 0:
+                continue
+            v = np.concatenate([bits[xb], bits[zb]]).astype(np.uint8)
+            for b, col in zip(basis, pivots):
+                if v[col]:
+                    v ^= b
+            if not v.any():
+                continue
+            basis.append(v)
+            pivots.append(int(np.flatnonzero(v)[0]))
+            stabilizers.append((bits[xb], bits[zb], 0 if values[zb].real > 0 else 1))
+        if len(stabilizers) == num:
+            break
+    if len(stabilizers) < num:
+        raise QStateNotStabilizerError
+
+    n = num
+    x = np.zeros((2 * n, n), dtype=np.uint8)
+    z = np.zeros((2 * n, n), dtype=np.uint8)
+    r = np.zeros(2 * n, dtype=np.uint8)
+    for i, (sx, sz, sr) in enumerate(stabilizers):
+        x[n + i], z[n + i], r[n + i] = sx, sz, sr
+    # the destabilizer i anti-commutes with the stabilizer i only
+    d = _gf2_solve(np.concatenate([z[n:], x[n:]], axis=1), np.eye(n, dtype=np.uint8))
+    x[:n] = d[:n].T
+    z[:n] = d[n:].T
+    return x, z, r
+
+
+def unify_states(state1: QState, state2: QState) -> Tuple[QState, QState]:
+    """
+    Convert the states before joining them, so that they are both stabilizer states or both dense states.
+    A dense state is converted into a stabilizer state if possible.
+    Otherwise, the stabilizer state falls back to a dense state, or ``QStateNotStabilizerError`` is raised.
+
+    Args:
+        state1 (QState): the first state
+        state2 (QState): the second state
+    Returns:
+        the converted states
+    """
+    if isinstance(state1, StabilizerState) == isinstance(state2, StabilizerState):
+        return state1, state2
+    stab, dense = (state1, state2) if isinstance(state1, StabilizerState) else (state2, state1)
+    try:
+        converted = type(stab).from_qstate(dense)
+    except QStateNotStabilizerError:
+        if not stab.fallback:
+            raise
+        return (stab.to_qstate(), dense) if stab is state1 else (dense, stab.to_qstate())
+    return (stab, converted) if stab is state1 else (converted, stab)
@@ -15,8 +15,9 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from typing import List, NamedTuple, Tuple
 import numpy as np
-from qns.models.qubit.const import OPERATOR_PAULI_I
+from qns.models.qubit.const import OPERATOR_PAULI_I, OPERATOR_PAULI_X, OPERATOR_PAULI_Y, OPERATOR_PAULI_Z
 from qns.models.qubit.errors import QGateStateJointError, OperatorError
 
 
@@ -28,6 +29,138 @@ def kron(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     return (a[:, None, :, None]*b[None, :, None, :]).reshape(a.shape[0]*b.shape[0], a.shape[1]*b.shape[1])
 
 
+def apply_operator(rho: np.ndarray, operator: np.ndarray, idxs: List[int], num: int) -> np.ndarray:
+    """
+    Calculate ``U rho U^dagger``, where ``U`` only acts on the qubits ``idxs``.
+    Instead of expanding ``U`` to a 2^n x 2^n matrix, ``rho`` is reshaped to a rank-2n tensor
+    and only the axes of the target qubits are contracted, which costs O(4^n * 2^k) for a k-qubit operator.
+
+    Args:
+        rho (np.ndarray): the 2^n x 2^n density matrix
+        operator (np.ndarray): the 2^k x 2^k operator, its qubit order follows ``idxs``
+        idxs (List[int]): the indexes of the target qubits in ``rho``
+        num (int): the number of qubits in ``rho``
+    Returns:
+        the new density matrix
+    """
+    k = len(idxs)
+    op = operator.reshape([2] * (2 * k))
+    in_axes = list(range(k, 2 * k))
+    tensor = rho.reshape([2] * (2 * num))
+    # U rho: the output axes of ``op`` come first, move them back to the row axes
+    tensor = np.moveaxis(np.tensordot(op, tensor, axes=(in_axes, idxs)), list(range(k)), idxs)
+    # (U rho) U^dagger: the output axes of ``op`` come last, move them back to the column axes
+    cols = [num + i for i in idxs]
+    tensor = np.moveaxis(np.tensordot(tensor, op.conj(), axes=(cols, in_axes)), list(range(2 * num - k, 2 * num)), cols)
+    return tensor.reshape(2 ** num, 2 ** num)
+
+
+def apply_operator_vector(vector: np.ndarray, operator: np.ndarray, idxs: List[int], num: int) -> np.ndarray:
+    """
+    Calculate ``U |psi>``, where ``U`` only acts on the qubits ``idxs``, see ``apply_operator``
+
+    Args:
+        vector (np.ndarray): the 2^n x 1 state vector
+        operator (np.ndarray): the 2^k x 2^k operator, its qubit order follows ``idxs``
+        idxs (List[int]): the indexes of the target qubits in ``vector``
+        num (int): the number of qubits in ``vector``
+    Returns:
+        the new state vector
+    """
+    k = len(idxs)
+    op = operator.reshape([2] * (2 * k))
+    tensor = np.tensordot(op, vector.reshape([2] * num), axes=(list(range(k, 2 * k)), idxs))
+    return np.moveaxis(tensor, list(range(k)), idxs).reshape(2 ** num, 1)
+
+
+class PauliChannel(NamedTuple):
+    """
+    A Pauli error channel ``rho -> sum_k weights[k] P_k rho P_k^dagger`` on a single qubit, where ``P_k`` is I, X, Y or Z
+    """
+    weights: Tuple[float, float, float, float]
+    """the possibilities of I, X, Y and Z"""
+    superoperator: np.ndarray
+    """the 2 x 2 x 2 x 2 tensor ``S``, where ``rho'[a, b] = sum_{c, d} S[a, b, c, d] rho[c, d]``"""
+
+
+_PAULI_SUPEROPERATORS = np.array([np.einsum("ac,bd->abcd", pauli, pauli.conjugate())
+                                  for pauli in (OPERATOR_PAULI_I, OPERATOR_PAULI_X, OPERATOR_PAULI_Y, OPERATOR_PAULI_Z)])
+# the superoperators of I, X, Y and Z, built once and combined linearly by ``pauli_channel``
+
+
+def pauli_channel(channel: str, p: float) -> PauliChannel:
+    """
+    Build the Pauli error channel ``channel`` with the error possibility ``p``. The superoperators of
+    the four Pauli operators are built once, and the channel is their linear combination with the weights,
+    so the error models do not rebuild the operators for every qubit or every ``p``.
+
+    Args:
+        channel (str): "dephase" (Z), "bitflip" (X) or "depolar" (X, Y and Z)
+        p (float): the error possibility
+    Returns:
+        the channel
+    """
+    if channel == "dephase":
+        weights = (1.0 - p, 0.0, 0.0, p)
+    elif channel == "bitflip":
+        weights = (1.0 - p, p, 0.0, 0.0)
+    elif channel == "depolar":
+        if 1.0 - 3.0 * p > 0.0:
+            weights = (1.0 - 3.0 * p, p, p, p)
+        else:
+            weights = (0.0, 1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0)
+    else:
+        raise ValueError(f"unknown Pauli channel {channel}")
+    return PauliChannel(weights, np.tensordot(weights, _PAULI_SUPEROPERATORS, axes=1))
+
+
+def apply_superoperator(rho: np.ndarray, superoperator: np.ndarray, idxs: List[int], num: int) -> np.ndarray:
+    """
+    Apply the same single-qubit superoperator on the qubits ``idxs``. Only the row and column axes of
+    the target qubits are contracted, and all targets are contracted in one ``einsum``.
+
+    Args:
+        rho (np.ndarray): the 2^n x 2^n density matrix
+        superoperator (np.ndarray): the 2 x 2 x 2 x 2 tensor, see ``PauliChannel``
+        idxs (List[int]): the indexes of the target qubits in ``rho``
+        num (int): the number of qubits in ``rho``
+    Returns:
+        the new density matrix
+    """
+    tensor = rho.reshape([2] * (2 * num))
+    if len(idxs) == 1:
+        idx = idxs[0]
+        tensor = np.moveaxis(np.tensordot(superoperator, tensor, axes=([2, 3], [idx, num + idx])), [0, 1],
+                             [idx, num + idx])
+        return tensor.reshape(2 ** num, 2 ** num)
+    rows, cols = list(range(num)), list(range(num, 2 * num))
+    out_rows, out_cols = rows[:], cols[:]
+    operands = []
+    label = 2 * num
+    for idx in idxs:
+        operands += [superoperator, [label, label + 1, idx, num + idx]]
+        out_rows[idx], out_cols[idx] = label, label + 1
+        label += 2
+    tensor = np.einsum(tensor, rows + cols, *operands, out_rows + out_cols, optimize="greedy")
+    return tensor.reshape(2 ** num, 2 ** num)
+
+
+def controlled_operator(operator: np.ndarray, controls: int = 1) -> np.ndarray:
+    """
+    Build the operator of a controlled gate on the qubits ``(control_1, ..., control_m, target)``
+
+    Args:
+        operator (np.ndarray): the 2 x 2 operator on the target qubit
+        controls (int): the number of control qubits
+    Returns:
+        the 2^(m+1) x 2^(m+1) operator
+    """
+    size = 2 ** (controls + 1)
+    full_operator = np.eye(size, dtype=complex)
+    full_operator[size - 2:, size - 2:] = operator
+    return full_operator
+
+
 def single_gate_expand(qubit, operator: np.ndarray) -> np.ndarray:
     state = qubit.state
     if operator.shape != (2, 2):
@@ -54,8 +187,17 @@ def joint(qubit1, qubit2) -> None:
         raise QGateStateJointError
 
     from qns.models.qubit.qubit import QState
-    nq = QState(qubit1.state.qubits+qubit2.state.qubits,
-                rho=kron(qubit1.state.rho, qubit2.state.rho))
+    from qns.models.qubit.stabilizer import StabilizerState, unify_states
+    state1, state2 = qubit1.state, qubit2.state
+    if isinstance(state1, StabilizerState) or isinstance(state2, StabilizerState):
+        state1, state2 = unify_states(state1, state2)
+    if isinstance(state1, StabilizerState):
+        nq = state1.tensor(state2)
+    elif state1.vector is not None and state2.vector is not None:
+        # both states are pure, keep the joint state in the statevector mode
+        nq = QState(state1.qubits+state2.qubits, state=kron(state1.vector, state2.vector))
+    else:
+        nq = QState(state1.qubits+state2.qubits, rho=kron(state1.rho, state2.rho))
     for q in nq.qubits:
         q.state = nq
 
@@ -22,8 +22,10 @@ from qns.network.topology import Topology, LineTopology, RandomTopology, GridTop
 from qns.network.route.route import RouteImpl, NetworkRouteError
 from qns.network.route.dijkstra import DijkstraRouteAlgorithm
 from qns.network.graphalg.alg import create_neighbors_tables, is_connected, dijkstra, networkdraw
+from qns.network.parallel import ParallelSimulation, bfs_partition
 
 __all__ = ["QuantumNetwork", "Request", "Topology", "LineTopology", "NetworkRouteError",
            "RandomTopology", "GridTopology", "TreeTopology", "BasicTopology", "WaxmanTopology",
            "RouteImpl", "DijkstraRouteAlgorithm", "QNSNetworkError", "create_neighbors_tables",
-           "is_connected", "dijkstra", "networkdraw", "AboveNetTopology", "AGISTopology", "GMLTopology"]
+           "is_connected", "dijkstra", "networkdraw", "AboveNetTopology", "AGISTopology", "GMLTopology",
+           "ParallelSimulation", "bfs_partition"]
@@ -0,0 +1,381 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import multiprocessing
+import pickle
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from qns.entity.node.app import Application
+from qns.entity.node.node import QNode
+from qns.network.network import QuantumNetwork, QNSNetworkError
+from qns.simulator.event import Event
+from qns.simulator.simulator import Simulator, default_start_second, default_end_second
+from qns.simulator.ts import default_accuracy
+from qns.utils.rnd import set_seed
+import qns.utils.log as log
+
+
+def bfs_partition(net: QuantumNetwork, workers: int) -> List[int]:
+    """
+    The default partition. Nodes are ordered by a breadth-first search on the quantum and classic channels,
+    and then split into ``workers`` contiguous parts with almost the same number of nodes,
+    so that neighboring nodes tend to stay in the same part.
+
+    Args:
+        net (QuantumNetwork): the network
+        workers (int): the number of parts
+    Returns:
+        the part index of every node in ``net.nodes``
+    """
+    index = {id(n): i for i, n in enumerate(net.nodes)}
+    neighbors: List[List[int]] = [[] for _ in net.nodes]
+    for channel in net.qchannels + net.cchannels:
+        ends = [index[id(n)] for n in channel.node_list if id(n) in index]
+        for a in ends:
+            neighbors[a].extend(b for b in ends if b != a)
+
+    order = []
+    visited = [False] * len(net.nodes)
+    for root in range(len(net.nodes)):
+        if visited[root]:
+            continue
+        visited[root] = True
+        queue = deque([root])
+        while len(queue) > 0:
+            i = queue.popleft()
+            order.append(i)
+            for j in neighbors[i]:
+                if not visited[j]:
+                    visited[j] = True
+                    queue.append(j)
+
+    parts = [0] * len(net.nodes)
+    for rank, i in enumerate(order):
+        parts[i] = rank * workers // len(order)
+    return parts
+
+
+def _owner(event: Event) -> Optional[QNode]:
+    """
+    Find the node that handles an event: the destination of a received packet,
+    or the node of the entity or application that causes this event.
+    """
+    dest = getattr(event, "dest", None)
+    if isinstance(dest, QNode):
+        return dest
+    by = event.by
+    if isinstance(by, QNode):
+        return by
+    if isinstance(by, Application):
+        return by.get_node()
+    node = getattr(by, "node", None)
+    if isinstance(node, QNode):
+        return node
+    return None
+
+
+class _EntityPickler(pickle.Pickler):
+    """
+    Pickle the entities and applications by their positions in the network, so that
+    the receiving worker binds the event to its own copies.
+    """
+    def __init__(self, file, keys: Dict[int, Tuple]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.keys = keys
+
+    def persistent_id(self, obj):
+        return self.keys.get(id(obj))
+
+
+class _EntityUnpickler(pickle.Unpickler):
+    def __init__(self, file, objects: Dict[Tuple, Any]):
+        super().__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
+
+class PartitionSimulator(Simulator):
+    """
+    The simulator in a worker of ``ParallelSimulation``. It only keeps the events of the nodes in its own partition,
+    and the events for the nodes in other partitions are serialized into ``outbox``.
+    Events that are not bound to any node stay in the worker that creates them,
+    except that the initial ones are only kept by the worker 0.
+    """
+
+    def __init__(self, rank: int, start_second: float = default_start_second,
+                 end_second: float = default_end_second, accuracy: int = default_accuracy) -> None:
+        """
+        Args:
+            rank (int): the index of this worker
+            start_second (float): the start second of the simulation
+            end_second (float): the end second of the simulation
+            accuracy (int): the number of time slots per second
+        """
+        super().__init__(start_second, end_second, accuracy)
+        self.rank = rank
+        self.parts: Dict[int, int] = {}
+        self.outbox: List[Tuple[int, int, bytes]] = []
+        self.window_end = self.ts.time_slot
+        self.started = False
+        self._keys: Dict[int, Tuple] = {}
+        self._objects: Dict[Tuple, Any] = {}
+
+    def bind(self, net: QuantumNetwork, parts: List[int]) -> None:
+        """
+        Bind the network and its partition to this simulator
+
+        Args:
+            net (QuantumNetwork): the network
+            parts (List[int]): the part index of every node in ``net.nodes``
+        """
+        self.parts = {id(n): parts[i] for i, n in enumerate(net.nodes)}
+        objects: Dict[Tuple, Any] = {("network",): net, ("simulator",): self}
+        for i, n in enumerate(net.nodes):
+            objects[("node", i)] = n
+            for j, app in enumerate(n.apps):
+                objects[("app", i, j)] = app
+            for j, memory in enumerate(n.memories):
+                objects[("memory", i, j)] = memory
+            for j, operator in enumerate(n.operators):
+                objects[("operator", i, j)] = operator
+        for k, qchannel in enumerate(net.qchannels):
+            objects[("qchannel", k)] = qchannel
+        for k, cchannel in enumerate(net.cchannels):
+            objects[("cchannel", k)] = cchannel
+        self._objects = objects
+        self._keys = {id(obj): key for key, obj in objects.items()}
+
+    def add_event(self, event: Event) -> Optional[Event]:
+        node = _owner(event)
+        part = self.rank if node is None else self.parts.get(id(node), self.rank)
+        if part == self.rank:
+            if node is None and not self.started and self.rank != 0:
+                return None
+            return super().add_event(event)
+        if not self.started:
+            # the owner builds its initial events by itself
+            return None
+        if event.time_slot < self.window_end:
+            raise QNSNetworkError(f"event {event} for {node} breaks the lookahead of the parallel simulation")
+        buffer = io.BytesIO()
+        _EntityPickler(buffer, self._keys).dump(event)
+        self.outbox.append((part, event.time_slot, buffer.getvalue()))
+        return event
+
+    def add_events(self, events: Iterable[Event]) -> int:
+        count = 0
+        for event in events:
+            if self.add_event(event) is not None:
+                count += 1
+        return count
+
+    def deliver(self, messages: List[Tuple[int, int, bytes]]) -> None:
+        """
+        Insert the events received from other workers
+
+        Args:
+            messages: a list of ``(part, time_slot, data)`` records
+        """
+        for _, _, data in messages:
+            event = _EntityUnpickler(io.BytesIO(data), self._objects).load()
+            super().add_event(event)
+
+
+def _worker(conn, rank: int, parallel: "ParallelSimulation") -> None:
+    try:
+        _work(conn, rank, parallel)
+    except Exception as e:
+        # let the main process raise it instead of waiting for this worker
+        conn.send(e)
+        raise
+    finally:
+        conn.close()
+
+
+def _work(conn, rank: int, parallel: "ParallelSimulation") -> None:
+    set_seed(parallel.seed)
+    s = PartitionSimulator(rank, parallel.start_second, parallel.end_second, parallel.accuracy)
+    net = parallel.build(s)
+    if callable(parallel.partition):
+        parts = parallel.partition(net, parallel.workers)
+    elif parallel.partition is not None:
+        parts = list(parallel.partition)
+    else:
+        parts = bfs_partition(net, parallel.workers)
+    if len(parts) != len(net.nodes):
+        raise QNSNetworkError("the partition should contain the part index of every node")
+    s.bind(net, parts)
+    net.install(s)
+    s.started = True
+    conn.send((ParallelSimulation.lookahead_slot(s, net, parts), s.event_pool.peek_time_slot()))
+
+    while True:
+        cmd = conn.recv()
+        if cmd[0] == "run":
+            _, until_slot, messages = cmd
+            s.deliver(messages)
+            s.window_end = until_slot + 1
+            s.run_until(s.time(time_slot=until_slot))
+            outbox, s.outbox = s.outbox, []
+            conn.send((outbox, s.event_pool.peek_time_slot()))
+        else:
+            nodes = [n for i, n in enumerate(net.nodes) if parts[i] == rank]
+            conn.send(parallel.collect(s, net, nodes) if parallel.collect is not None else None)
+            break
+
+
+class ParallelSimulation(object):
+    """
+    A conservative parallel discrete-event simulation of a quantum network.
+
+    Every worker process builds the same network with the same seed, but only runs the events of the nodes in
+    its own partition. The simulation proceeds in time windows. A window starts at the earliest pending event
+    among all workers and lasts for the lookahead, i.e., the minimum delay of the channels across partitions.
+    Events for remote nodes, e.g., ``RecvClassicPacket`` and ``RecvQubitPacket``, are serialized and exchanged
+    at the end of every window. As they are scheduled at least one lookahead later, no worker can receive an
+    event in its past.
+
+    The nodes should only interact through the channels across partitions. The results match a sequential run
+    if the randomness does not depend on the global order of events, e.g., constant delays and no random drops.
+    """
+
+    def __init__(self, build: Callable[[Simulator], QuantumNetwork], workers: int = 2,
+                 start_second: float = default_start_second, end_second: float = default_end_second,
+                 accuracy: int = default_accuracy,
+                 partition: Optional[Union[List[int], Callable[[QuantumNetwork, int], List[int]]]] = None,
+                 collect: Optional[Callable[[Simulator, QuantumNetwork, List[QNode]], Any]] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        Args:
+            build: a function that builds the network (including its routes and requests) for a simulator.
+                It should not install the network, and it should build the same network in every worker.
+            workers (int): the number of worker processes
+            start_second (float): the start second of the simulation
+            end_second (float): the end second of the simulation
+            accuracy (int): the number of time slots per second
+            partition: the part index of every node in ``net.nodes``, or a function that produces it from the
+                network and the number of workers. The default is ``bfs_partition``.
+            collect: a function that produces the result of a worker from its simulator, its network and
+                the nodes in its partition. The result should be pickleable.
+            seed (int): the random seed set in every worker before building the network
+        """
+        if workers < 1:
+            raise QNSNetworkError("the number of workers should be at least 1")
+        self.build = build
+        self.workers = workers
+        self.start_second = start_second
+        self.end_second = end_second
+        self.accuracy = accuracy
+        self.partition = partition
+        self.collect = collect
+        self.seed = seed
+
+        self.lookahead: Optional[int] = None
+        self.windows = 0
+        self.messages = 0
+
+    @staticmethod
+    def lookahead_slot(s: Simulator, net: QuantumNetwork, parts: List[int]) -> Optional[int]:
+        """
+        Get the lookahead, i.e., the minimum delay of the channels across partitions
+
+        Args:
+            s (Simulator): the simulator
+            net (QuantumNetwork): the network
+            parts (List[int]): the part index of every node in ``net.nodes``
+        Returns:
+            the lookahead in time slots, or ``None`` if no channel crosses the partitions
+        """
+        index = {id(n): parts[i] for i, n in enumerate(net.nodes)}
+        lookahead = None
+        for channel in net.qchannels + net.cchannels:
+            if len(set(index.get(id(n)) for n in channel.node_list)) <= 1:
+                continue
+            slot = s.time_slot(channel.delay_model.min_delay())
+            lookahead = slot if lookahead is None else min(lookahead, slot)
+        return lookahead
+
+    def run(self) -> List[Any]:
+        """
+        Run the parallel simulation
+
+        Returns:
+            the results of ``collect`` from every worker
+        """
+        conns = []
+        procs = []
+        for rank in range(self.workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            p = multiprocessing.Process(target=_worker, args=(child_conn, rank, self), daemon=True)
+            p.start()
+            child_conn.close()
+            conns.append(parent_conn)
+            procs.append(p)
+
+        try:
+            ready = [self._recv(conn) for conn in conns]
+            self.lookahead = ready[0][0]
+            if self.lookahead is not None and self.lookahead <= 0:
+                raise QNSNetworkError("the channels across partitions should have a positive delay")
+            self._synchronize(conns, [r[1] for r in ready])
+
+            for conn in conns:
+                conn.send(("finish",))
+            results = [self._recv(conn) for conn in conns]
+        finally:
+            for p in procs:
+                p.join(timeout=1)
+                if p.is_alive():
+                    p.terminate()
+        return results
+
+    @staticmethod
+    def _recv(conn) -> Any:
+        msg = conn.recv()
+        if isinstance(msg, Exception):
+            raise msg
+        return msg
+
+    def _synchronize(self, conns: List, next_slots: List[Optional[int]]) -> None:
+        te_slot = int(self.end_second * self.accuracy)
+        inboxes: List[List[Tuple[int, int, bytes]]] = [[] for _ in conns]
+        while True:
+            pending = [slot for slot in next_slots if slot is not None]
+            pending.extend(m[1] for inbox in inboxes for m in inbox)
+            if len(pending) == 0 or min(pending) > te_slot:
+                break
+            window_start = min(pending)
+            until_slot = te_slot if self.lookahead is None else min(window_start + self.lookahead - 1, te_slot)
+
+            running = []
+            for rank, conn in enumerate(conns):
+                if len(inboxes[rank]) == 0 and (next_slots[rank] is None or next_slots[rank] > until_slot):
+                    continue
+                conn.send(("run", until_slot, inboxes[rank]))
+                inboxes[rank] = []
+                running.append(rank)
+            for rank in running:
+                outbox, next_slots[rank] = self._recv(conns[rank])
+                for message in outbox:
+                    inboxes[message[0]].append(message)
+                self.messages += len(outbox)
+            self.windows += 1
+        log.debug("parallel simulation finished, %s windows, %s messages", self.windows, self.messages)
@@ -4,10 +4,10 @@ from qns.entity.qchannel.qchannel import QuantumChannel, RecvQubitPacket
 from qns.entity.node.node import QNode
 from qns.models.qubit.const import BASIS_X, BASIS_Z, \
     QUBIT_STATE_0, QUBIT_STATE_1, QUBIT_STATE_P, QUBIT_STATE_N
-from qns.simulator.event import Event, func_to_event
+from qns.simulator.event import Event
 from qns.simulator.simulator import Simulator
 from qns.models.qubit import Qubit
-from qns.utils.rnd import get_rand, get_choice
+from qns.utils.rnd import get_rand, get_choice, get_generator
 
 import hashlib
 import numpy as np
@@ -61,7 +61,7 @@ def cascade_key_shuffle(index: list):
         Returns:
             list: Shuffled key block indices.
     """
-    np.random.shuffle(index)
+    get_generator().shuffle(index)
     return index
 
 
@@ -112,10 +112,11 @@ class QubitWithError(Qubit):
         Args:
             length: Length of the quantum channel in meters.
             decoherence_rate: Decoherence rate.
+            kwargs: other parameters, e.g., ``rng``, the generator of the channel
         """
         lkm = length / 1000
         standand_lkm = 50.0
-        theta = get_rand() * lkm / standand_lkm * np.pi / 4
+        theta = get_rand(rng=kwargs.get("rng")) * lkm / standand_lkm * np.pi / 4
         operation = np.array([[np.cos(theta), np.sin(theta)], [- np.sin(theta), np.cos(theta)]], dtype=np.complex128)
         self.state.operate(operator=operation)
 
@@ -194,9 +195,7 @@ class BB84SendApp(Application):
         """
         super().install(node, simulator)
         # Add the first Qubit sending event to the simulator
-        t = simulator.ts
-        event = func_to_event(t, self.send_qubit, by=self)
-        self._simulator.add_event(event)
+        self._simulator.call_at(simulator.ts, self.send_qubit, by=self)
 
     def handleClassicPacket(self, node: QNode, event: Event) -> bool:
         """
@@ -257,7 +256,7 @@ class BB84SendApp(Application):
         """
         # Randomly prepare Qubit
         state = get_choice([QUBIT_STATE_0, QUBIT_STATE_1,
-                            QUBIT_STATE_P, QUBIT_STATE_N])
+                            QUBIT_STATE_P, QUBIT_STATE_N], rng=self.rng)
         qubit = QubitWithError(state=state)
         # Record measurement basis and measurement result
         basis = BASIS_Z if (state == QUBIT_STATE_0).all() or (
@@ -272,10 +271,7 @@ class BB84SendApp(Application):
         # Send Qubit
         self.qchannel.send(qubit=qubit, next_hop=self.dest)
         # Add the next Qubit sending event
-        t = self._simulator.current_time + \
-            self._simulator.time(sec=1 / self.send_rate)
-        event = func_to_event(t, self.send_qubit, by=self)
-        self._simulator.add_event(event)
+        self._simulator.call_later(1 / self.send_rate, self.send_qubit, by=self)
 
     def recv_error_estimate_packet(self, event: RecvClassicPacket) -> bool:
         """
@@ -585,9 +581,9 @@ class BB84RecvApp(Application):
         """
         # Random measurement
         qubit: Qubit = event.qubit
-        basis = get_choice([BASIS_Z, BASIS_X])
+        basis = get_choice([BASIS_Z, BASIS_X], rng=self.rng)
         basis_msg = "Z" if (basis == BASIS_Z).all() else "X"
-        ret = qubit.measureZ() if (basis == BASIS_Z).all() else qubit.measureX()
+        ret = qubit.measureZ(rng=self.rng) if (basis == BASIS_Z).all() else qubit.measureX(rng=self.rng)
         # Record measurement result
         self.qubit_list[qubit.id] = qubit
         self.basis_list[qubit.id] = basis
@@ -624,7 +620,7 @@ class BB84RecvApp(Application):
         # Randomly select keys for error rate estimation
         for i in keys:
             item_temp = self.raw_key_pool.pop(i)
-            if get_rand(0, 1) < self.ratio_for_estimating_error:
+            if get_rand(0, 1, rng=self.rng) < self.ratio_for_estimating_error:
                 bit_for_estimate[i] = item_temp
             else:
                 self.correcting_key.append(item_temp)
@@ -798,8 +794,8 @@ class BB84RecvApp(Application):
             # Error verification successful, perform privacy amplification
             matrix_row = len(self.correcting_key)
             matrix_col = (1-self.security)*len(self.correcting_key)-self.bit_leak
-            first_row = [get_choice([0, 1]) for _ in range(matrix_row)]
-            first_col = [get_choice([0, 1]) for _ in range(int(matrix_col)-1)]
+            first_row = [get_choice([0, 1], rng=self.rng) for _ in range(matrix_row)]
+            first_col = [get_choice([0, 1], rng=self.rng) for _ in range(int(matrix_col)-1)]
             toeplitz_matrix = pa_generate_toeplitz_matrix(matrix_row, matrix_col, first_row, first_col)
             self.shifted_key += list(pa_randomize_key(self.correcting_key, toeplitz_matrix))
             packet = ClassicPacket(msg={"packet_class": PACKET_PRIVACY_AMPLIFICATION,
@@ -25,15 +25,16 @@ from qns.entity.node.node import QNode
 from qns.entity.qchannel.qchannel import QuantumChannel, RecvQubitPacket
 from qns.models.core.backend import QuantumModel
 from qns.network.requests import Request
-from qns.simulator.event import Event, func_to_event
+from qns.simulator.event import Event
 from qns.simulator.simulator import Simulator
 from qns.network import QuantumNetwork
 from qns.models.epr import WernerStateEntanglement
-from qns.simulator.ts import Time
 import qns.utils.log as log
 
 
 class Transmit():
+    __slots__ = ("id", "src", "dst", "first_epr_name", "second_epr_name")
+
     def __init__(self, id: str, src: QNode, dst: QNode,
                  first_epr_name: Optional[str] = None, second_epr_name: Optional[str] = None):
         self.id = id
@@ -47,6 +48,28 @@ class Transmit():
              epr: {self.first_epr_name}, {self.second_epr_name}>"
 
 
+class DistributedEntanglement(WernerStateEntanglement):
+    """
+    A Werner state entanglement that carries the endpoints and the transmit id of its distribution
+    """
+    __slots__ = ("src", "dst", "transmit_id")
+
+    def __init__(self, fidelity: float = 1, name: Optional[str] = None, src: Optional[QNode] = None,
+                 dst: Optional[QNode] = None, transmit_id: Optional[str] = None):
+        """
+        Args:
+            fidelity (float): the fidelity
+            name (str): the entanglement name
+            src (QNode): the source node of the distribution
+            dst (QNode): the destination node of the distribution
+            transmit_id (str): the id of the distribution
+        """
+        super().__init__(fidelity=fidelity, name=name)
+        self.src = src
+        self.dst = dst
+        self.transmit_id = transmit_id
+
+
 class EntanglementDistributionApp(Application):
     def __init__(self, send_rate: Optional[int] = None, init_fidelity: int = 0.99):
         super().__init__()
@@ -84,9 +107,7 @@ class EntanglementDistributionApp(Application):
 
         if self.dst is not None:
             # I am a sender
-            t = simulator.ts
-            event = func_to_event(t, self.new_distribution, by=self)
-            self._simulator.add_event(event)
+            self._simulator.call_at(simulator.ts, self.new_distribution, by=self)
 
     def RecvQubitHandler(self, node: QNode, event: Event):
         self.response_distribution(event)
@@ -96,14 +117,12 @@ class EntanglementDistributionApp(Application):
 
     def new_distribution(self):
         # insert the next send event
-        t = self._simulator.tc + Time(sec=1 / self.send_rate)
-        event = func_to_event(t, self.new_distribution, by=self)
-        self._simulator.add_event(event)
-        log.debug(f"{self.own}: start new request")
+        self._simulator.call_later(1 / self.send_rate, self.new_distribution, by=self)
+        log.debug("%s: start new request", self.own)
 
         # generate new entanglement
         epr = self.generate_qubit(self.own, self.dst, None)
-        log.debug(f"{self.own}: generate epr {epr.name}")
+        log.debug("%s: generate epr %s", self.own, epr.name)
 
         self.state[epr.transmit_id] = Transmit(
             id=epr.transmit_id,
@@ -111,7 +130,7 @@ class EntanglementDistributionApp(Application):
             dst=self.dst,
             second_epr_name=epr.name)
 
-        log.debug(f"{self.own}: generate transmit {self.state[epr.transmit_id]}")
+        log.debug("%s: generate transmit %s", self.own, self.state[epr.transmit_id])
         if not self.memory.write(epr):
             self.memory.read(epr)
             self.state[epr.transmit_id] = None
@@ -140,7 +159,7 @@ class EntanglementDistributionApp(Application):
             raise Exception("No such quantum channel")
 
         # send the entanglement
-        log.debug(f"{self.own}: send epr {epr.name} to {next_hop}")
+        log.debug("%s: send epr %s to %s", self.own, epr.name, next_hop)
         qchannel.send(epr, next_hop)
 
     def response_distribution(self, packet: RecvQubitPacket):
@@ -154,40 +173,38 @@ class EntanglementDistributionApp(Application):
 
         # receive the first epr
         epr: WernerStateEntanglement = packet.qubit
-        log.debug(f"{self.own}: recv epr {epr.name} from {from_node}")
+        log.debug("%s: recv epr %s from %s", self.own, epr.name, from_node)
 
         # generate the second epr
         next_epr = self.generate_qubit(
             src=epr.src, dst=epr.dst, transmit_id=epr.transmit_id)
-        log.debug(f"{self.own}: generate epr {next_epr.name}")
+        log.debug("%s: generate epr %s", self.own, next_epr.name)
         self.state[epr.transmit_id] = Transmit(
             id=epr.transmit_id,
             src=epr.src,
             dst=epr.dst,
             first_epr_name=epr.name,
             second_epr_name=next_epr.name)
-        log.debug(
-            f"{self.own}: generate transmit {self.state[epr.transmit_id]}")
+        log.debug("%s: generate transmit %s", self.own, self.state[epr.transmit_id])
 
-        log.debug(f"{self.own}: store {epr.name} and {next_epr.name}")
+        log.debug("%s: store %s and %s", self.own, epr.name, next_epr.name)
         ret1 = self.memory.write(epr)
         ret2 = self.memory.write(next_epr)
         if not ret1 or not ret2:
-            log.debug(f"{self.own}: store fail, destory {epr} and {next_epr}")
+            log.debug("%s: store fail, destory %s and %s", self.own, epr, next_epr)
             # if failed (memory is full), destory all entanglements
             self.memory.read(epr)
             self.memory.read(next_epr)
             classic_packet = ClassicPacket(
                 msg={"cmd": "revoke", "transmit_id": epr.transmit_id}, src=self.own, dest=from_node)
             cchannel.send(classic_packet, next_hop=from_node)
-            log.debug(f"{self.own}: send {classic_packet.msg} to {from_node}")
+            log.debug("%s: send %s to %s", self.own, classic_packet.msg, from_node)
             return
 
         classic_packet = ClassicPacket(
             msg={"cmd": "swap", "transmit_id": epr.transmit_id}, src=self.own, dest=from_node)
         cchannel.send(classic_packet, next_hop=from_node)
-        log.debug(
-            f"{self.own}: send {classic_packet.msg} from {self.own} to {from_node}")
+        log.debug("%s: send %s from %s to %s", self.own, classic_packet.msg, self.own, from_node)
 
     def handle_response(self, packet: RecvClassicPacket):
         msg = packet.packet.get()
@@ -196,7 +213,7 @@ class EntanglementDistributionApp(Application):
         from_node: QNode = cchannel.node_list[0] \
             if cchannel.node_list[1] == self.own else cchannel.node_list[1]
 
-        log.debug(f"{self.own}: recv {msg} from {from_node}")
+        log.debug("%s: recv %s from %s", self.own, msg, from_node)
 
         cmd = msg["cmd"]
         transmit_id = msg["transmit_id"]
@@ -210,9 +227,8 @@ class EntanglementDistributionApp(Application):
                 second_epr: WernerStateEntanglement = self.memory.read(
                     transmit.second_epr_name)
                 new_epr = first_epr.swapping(second_epr, name=uuid.uuid4().hex)
-                log.debug(
-                    f"{self.own}:perform swap use {first_epr} and {second_epr}")
-                log.debug(f"{self.own}:perform swap generate {new_epr}")
+                log.debug("%s:perform swap use %s and %s", self.own, first_epr, second_epr)
+                log.debug("%s:perform swap generate %s", self.own, new_epr)
 
                 src: QNode = transmit.src
                 app: EntanglementDistributionApp = src.get_apps(
@@ -226,7 +242,7 @@ class EntanglementDistributionApp(Application):
             classic_packet = ClassicPacket(
                 msg={"cmd": "next", "transmit_id": transmit_id}, src=self.own, dest=from_node)
             cchannel.send(classic_packet, next_hop=from_node)
-            log.debug(f"{self.own}: send {classic_packet.msg} to {from_node}")
+            log.debug("%s: send %s to %s", self.own, classic_packet.msg, from_node)
         elif cmd == "next":
             # finish or request to the next hop
             if self.own == transmit.dst:
@@ -235,30 +251,27 @@ class EntanglementDistributionApp(Application):
                 self.success.append(result_epr)
                 self.state[transmit_id] = None
                 self.success_count += 1
-                log.debug(f"{self.own}: successful distribute {result_epr}")
+                log.debug("%s: successful distribute %s", self.own, result_epr)
 
                 classic_packet = ClassicPacket(
                     msg={"cmd": "succ", "transmit_id": transmit_id},
                     src=self.own, dest=transmit.src)
                 cchannel = self.own.get_cchannel(transmit.src)
                 if cchannel is not None:
-                    log.debug(
-                        f"{self.own}: send {classic_packet} to {from_node}")
+                    log.debug("%s: send %s to %s", self.own, classic_packet, from_node)
                     cchannel.send(classic_packet, next_hop=transmit.src)
             else:
-                log.debug(f"{self.own}: begin new request {transmit_id}")
+                log.debug("%s: begin new request %s", self.own, transmit_id)
                 self.request_distrbution(transmit_id)
         elif cmd == "succ":
             # the source notice that entanglement distribution is succeed.
             result_epr = self.memory.read(transmit.second_epr_name)
-            log.debug(f"{self.own}: recv success distribution {result_epr}")
+            log.debug("%s: recv success distribution %s", self.own, result_epr)
             self.state[transmit_id] = None
             self.success_count += 1
         elif cmd == "revoke":
             # clean memory
-            log.debug(
-                f"{self.own}: clean memory {transmit.first_epr_name}\
-                    and {transmit.second_epr_name}")
+            log.debug("%s: clean memory %s and %s", self.own, transmit.first_epr_name, transmit.second_epr_name)
             self.memory.read(transmit.first_epr_name)
             self.memory.read(transmit.second_epr_name)
             self.state[transmit_id] = None
@@ -268,18 +281,14 @@ class EntanglementDistributionApp(Application):
                     src=self.own, dest=transmit.src)
                 cchannel = self.own.get_cchannel(transmit.src)
                 if cchannel is not None:
-                    log.debug(
-                        f"{self.own}: send {classic_packet} to {from_node}")
+                    log.debug("%s: send %s to %s", self.own, classic_packet, from_node)
                     cchannel.send(classic_packet, next_hop=transmit.src)
 
     def generate_qubit(self, src: QNode, dst: QNode,
                        transmit_id: Optional[str] = None) -> QuantumModel:
-        epr = WernerStateEntanglement(
-            fidelity=self.init_fidelity, name=uuid.uuid4().hex)
-        epr.src = src
-        epr.dst = dst
-        epr.transmit_id = transmit_id if transmit_id is not None else uuid.uuid4().hex
-        return epr
+        return DistributedEntanglement(
+            fidelity=self.init_fidelity, name=uuid.uuid4().hex, src=src, dst=dst,
+            transmit_id=transmit_id if transmit_id is not None else uuid.uuid4().hex)
 
     def set_first_epr(self, epr: QuantumModel, transmit_id: str):
         transmit = self.state.get(transmit_id, None)
@@ -20,7 +20,6 @@ from qns.entity.node.app import Application
 from qns.entity.node.node import QNode
 from qns.simulator.simulator import Simulator
 from qns.simulator.event import Event
-from qns.simulator.ts import Time
 
 
 class NodeProcessDelayApp(Application):
@@ -61,7 +60,7 @@ class NodeProcessDelayApp(Application):
         # add to list
         self.wait_rehandle_event_list.append(event)
         # get the delay time
-        t = self._simulator.current_time+Time(sec=self.delay)
+        t = self._simulator.tc_slot + self._simulator.time_slot(self.delay)
         # reset event's occur time
         event.t = t
         event.by = self
@@ -21,7 +21,7 @@ import math
 from qns.entity.node.node import QNode
 from qns.entity.qchannel.qchannel import QuantumChannel
 from qns.entity.cchannel.cchannel import ClassicChannel
-from qns.network.route.route import RouteImpl, NetworkRouteError
+from qns.network.route.route import RouteImpl, NetworkRouteError, hop_metric
 
 
 class DijkstraRouteAlgorithm(RouteImpl):
@@ -42,7 +42,7 @@ class DijkstraRouteAlgorithm(RouteImpl):
         self.name = name
         self.route_table = {}
         if metric_func is None:
-            self.metric_func = lambda _: 1
+            self.metric_func = hop_metric
         else:
             self.metric_func = metric_func
 
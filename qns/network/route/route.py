@@ -25,6 +25,14 @@ class NetworkRouteError(Exception):
     pass
 
 
+def hop_metric(channel: Union[QuantumChannel, ClassicChannel]) -> float:
+    """
+    The default const metric m(l)=1, so that the routes minimize the number of hops.
+    It is a module-level function (not a lambda) so that the route algorithms can be pickled.
+    """
+    return 1
+
+
 class RouteImpl():
     """
     This is the route protocol interface
@@ -15,10 +15,17 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from qns.simulator.ts import Time, set_default_accuracy
-from qns.simulator.event import Event, func_to_event
+from qns.simulator.ts import Time, set_default_accuracy, use_accuracy
+from qns.simulator.event import Event, RecurringEvent, CallbackEvent, func_to_event
 from qns.simulator.simulator import Simulator
+from qns.simulator.checkpoint import Checkpoint
+from qns.simulator.profile import EventProfiler
+from qns.simulator.trace import TraceRecorder, read_trace, replay
 from qns.simulator.pool import DefaultEventPool
 from qns.simulator.hashbucketpool import HashedBucketEventPool
+from qns.simulator.calendarpool import CalendarEventPool
+from qns.simulator.radixpool import RadixHeapEventPool
 
-__all__ = ["Time", "set_default_accuracy", "Event", "func_to_event", "Simulator", "DefaultEventPool", "HashedBucketEventPool"]
+__all__ = ["Time", "set_default_accuracy", "use_accuracy", "Event", "RecurringEvent", "CallbackEvent", "func_to_event",
+           "Simulator", "Checkpoint", "EventProfiler", "TraceRecorder", "read_trace", "replay", "DefaultEventPool",
+           "HashedBucketEventPool", "CalendarEventPool", "RadixHeapEventPool"]
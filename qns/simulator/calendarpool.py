@@ -0,0 +1,190 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import heapq
+from typing import Iterable, List, Optional, Tuple
+
+from qns.simulator.ts import Time
+from qns.simulator.event import Event
+from qns.simulator.pool import DefaultEventPool
+
+
+class CalendarEventPool(DefaultEventPool):
+    """
+    An event pool implemented as a calendar queue (R. Brown, 1988).
+
+    Time slots are hashed into ``nbuckets`` buckets ("days") of ``width`` slots.
+    The number of buckets follows the number of pending events and the bucket width
+    is re-estimated from the gaps between the earliest events whenever the calendar is resized,
+    so both inserting and popping an event take O(1) amortized time for near-uniform event horizons.
+    Events with the same time slot are popped in insertion order.
+    """
+
+    def __init__(self, ts: Time, te: Time, nbuckets: int = 2, width: int = 1):
+        """
+        Args:
+            ts: the start time
+            te: the end time
+            nbuckets (int): the initial number of buckets
+            width (int): the initial bucket width in time slots
+        """
+        super().__init__(ts, te)
+        self.min_nbuckets = max(2, nbuckets)
+        self.size = 0
+        self._build(self.min_nbuckets, max(1, width))
+
+    def _build(self, nbuckets: int, width: int):
+        self.nbuckets = nbuckets
+        self.width = width
+        self.buckets: List[List[Tuple[int, int, Event]]] = [[] for _ in range(nbuckets)]
+        day = self.tc_slot // width
+        self.last_bucket = day % nbuckets
+        self.bucket_top = (day + 1) * width
+
+    def _sample_width(self, entries: List[Tuple[int, int, Event]]) -> int:
+        sample = heapq.nsmallest(25, entries)
+        if len(sample) < 2:
+            return self.width
+        gaps = [sample[i + 1][0] - sample[i][0] for i in range(len(sample) - 1)]
+        average = sum(gaps) / len(gaps)
+        # ignore the outliers which are far larger than the average separation
+        gaps = [gap for gap in gaps if gap <= 2 * average]
+        average = sum(gaps) / len(gaps) if len(gaps) > 0 else average
+        return max(1, int(3 * average))
+
+    def _resize(self, nbuckets: int):
+        entries = [entry for bucket in self.buckets for entry in bucket]
+        self._build(nbuckets, self._sample_width(entries))
+        for entry in entries:
+            self.buckets[(entry[0] // self.width) % nbuckets].append(entry)
+        for bucket in self.buckets:
+            heapq.heapify(bucket)
+
+    def add_event(self, event: Event) -> bool:
+        """
+        Insert an event into the pool
+
+        Args:
+            event (Event): The inserting event
+        Returns:
+            if the event is inserted successfully
+        """
+        slot = event.time_slot
+        if slot < self.tc_slot or slot > self.te_slot or event._is_canceled:
+            return False
+
+        heapq.heappush(self.buckets[(slot // self.width) % self.nbuckets], (slot, self.seq, event))
+        self.seq += 1
+        self.size += 1
+        self._register(event)
+        if self.size > 2 * self.nbuckets:
+            self._resize(2 * self.nbuckets)
+        return True
+
+    def add_events(self, events: Iterable[Event]) -> int:
+        """
+        Insert a batch of events into the pool. The calendar is resized at most once.
+
+        Args:
+            events (Iterable[Event]): the inserting events
+        Returns:
+            the number of inserted events
+        """
+        entries = self._make_entries(*self._check_events(events))
+        for entry in entries:
+            self.buckets[(entry[0] // self.width) % self.nbuckets].append(entry)
+        for bucket in self.buckets:
+            heapq.heapify(bucket)
+        self.size += len(entries)
+
+        nbuckets = self.nbuckets
+        while self.size > 2 * nbuckets:
+            nbuckets *= 2
+        if nbuckets != self.nbuckets:
+            self._resize(nbuckets)
+        return len(entries)
+
+    def next_event(self) -> Event:
+        """
+        Get the next event to be executed
+
+        Returns:
+            The next event to be executed
+        """
+        while self.size > 0:
+            self.tc_slot, event = self._pop()
+            if self._release(event):
+                return event
+        self.tc_slot = self.te_slot
+        return None
+
+    def peek_time_slot(self) -> Optional[int]:
+        """
+        Get the time slot of the next event without popping it. Canceled events on the top are dropped.
+
+        Returns:
+            the time slot of the next event, or ``None`` if the pool is empty
+        """
+        while self.size > 0:
+            idx, _ = self._locate()
+            slot, _, event = self.buckets[idx][0]
+            if not event._is_canceled:
+                return slot
+            self._release(self._pop()[1])
+        return None
+
+    def _locate(self) -> Tuple[int, int]:
+        """
+        Find the bucket that holds the earliest event
+
+        Returns:
+            the bucket index and the top of its current day
+        """
+        buckets = self.buckets
+        nbuckets = self.nbuckets
+        idx = self.last_bucket
+        top = self.bucket_top
+        for _ in range(nbuckets):
+            bucket = buckets[idx]
+            if len(bucket) > 0 and bucket[0][0] < top:
+                return idx, top
+            idx += 1
+            if idx == nbuckets:
+                idx = 0
+            top += self.width
+
+        # no event in the following year, directly search the earliest one
+        slot = min(bucket[0] for bucket in buckets if len(bucket) > 0)[0]
+        return (slot // self.width) % nbuckets, (slot // self.width + 1) * self.width
+
+    def _pop(self) -> Tuple[int, Event]:
+        idx, top = self._locate()
+        slot, _, event = heapq.heappop(self.buckets[idx])
+        self.last_bucket = idx
+        self.bucket_top = top
+        self.size -= 1
+        if self.nbuckets > self.min_nbuckets and self.size < self.nbuckets // 2 - 2:
+            self._resize(self.nbuckets // 2)
+        return slot, event
+
+    def compact(self) -> None:
+        for idx, bucket in enumerate(self.buckets):
+            bucket = [entry for entry in bucket if not entry[2]._is_canceled]
+            heapq.heapify(bucket)
+            self.buckets[idx] = bucket
+        self.size = self.live
+        self.dead = 0
@@ -0,0 +1,81 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pickle
+from typing import Any, Tuple
+
+import qns.utils.log as log
+from qns.utils.rnd import get_state, set_state
+
+
+class Checkpoint(object):
+    """
+    A snapshot of a simulator, the entities that belong to it and the state of the random generators.
+
+    The snapshot is kept as pickled bytes, so every ``restore`` produces an independent copy and
+    many replications can branch from one warmed-up state. It can also be saved to disk by ``save``.
+    """
+
+    def __init__(self, simulator, *entities: Any) -> None:
+        """
+        Args:
+            simulator (Simulator): the simulator
+            *entities: other objects to be captured together, e.g. the ``QuantumNetwork``.
+                The entities that are already reachable from the pending events are captured anyway,
+                but only the listed ones are returned by ``restore``.
+        """
+        installed = getattr(log.logger, "_simulator", None) is simulator
+        self.data: bytes = pickle.dumps((simulator, entities, get_state(), installed), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self) -> Tuple[Any, ...]:
+        """
+        Build a new copy of the captured objects and recover the random generators.
+        If the logger was installed to the captured simulator, it is installed to the new copy.
+
+        Returns:
+            a tuple of the restored simulator and the restored entities, in the order of capturing
+        """
+        simulator, entities, state, installed = pickle.loads(self.data)
+        set_state(state)
+        if installed:
+            log.install(simulator)
+        return (simulator, *entities)
+
+    def save(self, path: str) -> None:
+        """
+        Save the checkpoint to a file
+
+        Args:
+            path (str): the file path
+        """
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+    @staticmethod
+    def load(path: str) -> "Checkpoint":
+        """
+        Load a checkpoint from a file produced by ``save``
+
+        Args:
+            path (str): the file path
+        Returns:
+            the loaded checkpoint
+        """
+        checkpoint = Checkpoint.__new__(Checkpoint)
+        with open(path, "rb") as f:
+            checkpoint.data = f.read()
+        return checkpoint
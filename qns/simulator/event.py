@@ -15,7 +15,7 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Union
 
 from qns.simulator.ts import Time
 
@@ -23,19 +23,53 @@ from qns.simulator.ts import Time
 class Event(object):
     """
     Basic event class in simulator
+
+    Events use ``__slots__`` to save memory, as millions of them may be pending in the event pool.
+    Subclasses may declare their own fields in ``__slots__``. A subclass without ``__slots__``
+    still accepts arbitrary attributes.
+    """
+    __slots__ = ("time_slot", "accuracy", "name", "by", "_is_canceled", "_pool")
+
+    recyclable: bool = False
+    """
+    whether the invoked events of this class can be reused by ``Simulator.make_event``
     """
 
-    def __init__(self, t: Optional[Time] = None, name: Optional[str] = None, by: Optional[Any] = None):
+    def __init__(self, t: Optional[Union[Time, int]] = None, name: Optional[str] = None, by: Optional[Any] = None):
         """
         Args:
-            t (Time): the time slot of this event
+            t (Union[Time, int]): the time of this event, a ``Time`` object or an integer time slot
             by: the entity or application that causes this event
             name (str): the name of this event
         """
-        self.t: Optional[Time] = t
+        self.t = t
         self.name: Optional[str] = name
         self.by = by
         self._is_canceled: bool = False
+        self._pool = None  # the event pool that holds this event
+
+    @property
+    def t(self) -> Optional[Time]:
+        """
+        The time of this event. The ``Time`` object is built on demand from ``time_slot`` and ``accuracy``,
+        which is the accuracy of the simulator (or event pool) that holds this event.
+        """
+        if self.time_slot is None:
+            return None
+        accuracy = self.accuracy
+        if accuracy is None and self._pool is not None:
+            accuracy = self._pool.ts.accuracy
+        return Time(time_slot=self.time_slot, accuracy=accuracy)
+
+    @t.setter
+    def t(self, t: Optional[Union[Time, int]]) -> None:
+        if isinstance(t, Time):
+            self.time_slot = t.time_slot
+            self.accuracy = t.accuracy
+        else:
+            # an integer time slot is counted in the accuracy of the simulator that holds this event
+            self.time_slot = t
+            self.accuracy = None
 
     def invoke(self) -> None:
         """
@@ -45,9 +79,14 @@ class Event(object):
 
     def cancel(self) -> None:
         """
-        Cancel this event
+        Cancel this event. If the event is waiting in an event pool, the pool is notified
+        so that it can drop the canceled events lazily.
         """
+        if self._is_canceled:
+            return
         self._is_canceled = True
+        if self._pool is not None:
+            self._pool.cancel_event(self)
 
     @property
     def is_canceled(self) -> bool:
@@ -58,10 +97,10 @@ class Event(object):
         return self._is_canceled
 
     def __eq__(self, other: object) -> bool:
-        return self.t == other.t
+        return self.time_slot == other.time_slot
 
     def __lt__(self, other: object) -> bool:
-        return self.t < other.t
+        return self.time_slot < other.time_slot
 
     def __le__(self, other: Time) -> bool:
         return self < other or self == other
@@ -81,7 +120,84 @@ class Event(object):
         return "Event()"
 
 
-def func_to_event(t: Time, fn, name: Optional[str] = None, by: Optional[Any] = None, *args, **kwargs):
+class RecurringEvent(Event):
+    """
+    An event that reschedules itself after it is invoked, so that a periodic source
+    only keeps one pending event in the event pool. Cancel this event to stop the recurrence.
+    """
+    __slots__ = ("period", "end", "simulator")
+
+    def __init__(self, t: Optional[Union[Time, int]] = None, period: Optional[int] = None, end: Optional[int] = None,
+                 simulator=None, name: Optional[str] = None, by: Optional[Any] = None):
+        """
+        Args:
+            t (Union[Time, int]): the time of the first invocation, a ``Time`` object or an integer time slot
+            period (int): the period in time slots. ``None`` means that this event is invoked only once
+            end (int): the time slot of the last possible invocation. ``None`` means the end of the simulation
+            simulator (Simulator): the simulator that reschedules this event
+            by: the entity or application that causes this event
+            name (str): the name of this event
+        """
+        super().__init__(t=t, name=name, by=by)
+        self.period = period
+        self.end = end
+        self.simulator = simulator
+
+    def invoke(self) -> None:
+        self.trigger()
+        if self._is_canceled:
+            return
+        slot = self.next_time_slot()
+        if slot is None or (self.end is not None and slot > self.end):
+            return
+        self.time_slot = slot
+        self.simulator.add_event(self)
+
+    def trigger(self) -> None:
+        """
+        The action of every invocation, should be implemented
+        """
+        raise NotImplementedError
+
+    def next_time_slot(self) -> Optional[int]:
+        """
+        Returns:
+            the time slot of the next invocation, or ``None`` to stop the recurrence
+        """
+        if self.period is None:
+            return None
+        return self.time_slot + self.period
+
+
+class CallbackEvent(Event):
+    """
+    An event that calls ``fn(*args, **kwargs)`` when it is invoked.
+    Unlike a locally defined event class, it can be pickled as long as ``fn`` and its parameters can be pickled.
+    It is the event type behind ``Simulator.call_at`` and ``Simulator.call_later``.
+    """
+    __slots__ = ("fn", "args", "kwargs")
+
+    def __init__(self, t: Optional[Union[Time, int]], fn: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+                 name: Optional[str] = None, by: Optional[Any] = None):
+        """
+        Args:
+            t (Time): the function will be called at `t`
+            fn (Callable): the function
+            args (tuple): the function's positional parameters
+            kwargs (dict): the function's keyword parameters
+            name (str): the name of this event
+            by: the entity or application that will causes this event
+        """
+        super().__init__(t=t, name=name, by=by)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+
+    def invoke(self) -> None:
+        self.fn(*self.args, **self.kwargs)
+
+
+def func_to_event(t: Union[Time, int], fn, name: Optional[str] = None, by: Optional[Any] = None, *args, **kwargs):
     """
     Convert a function to an event, the function `fn` will be called at `t`.
     It is a simple method to wrap a function to an event.
@@ -93,12 +209,4 @@ def func_to_event(t: Time, fn, name: Optional[str] = None, by: Optional[Any] = N
         *args: the function's parameters
         **kwargs: the function's parameters
     """
-
-    class WrapperEvent(Event):
-        def __init__(self, t: Optional[Time] = t, name_event=name):
-            super().__init__(t=t, name=name_event, by=by)
-
-        def invoke(self) -> None:
-            fn(*args, **kwargs)
-
-    return WrapperEvent(t)
+    return CallbackEvent(t, fn, args, kwargs, name=name, by=by)
@@ -1,6 +1,6 @@
 import heapq
 from collections import deque
-from typing import Dict
+from typing import Dict, Iterable, Optional
 
 from qns.simulator.ts import Time
 from qns.simulator.event import Event
@@ -17,10 +17,10 @@ class HashedBucketEventPool(DefaultEventPool):
         self.active_slots = []
 
     def add_event(self, event: Event) -> bool:
-        if event.t < self.tc or event.t > self.te:
+        slot = event.time_slot
+        if slot < self.tc_slot or slot > self.te_slot or event._is_canceled:
             return False
 
-        slot = event.t.time_slot
         bucket = self.slot_buckets.get(slot)
         if bucket is None:
             bucket = deque()
@@ -28,8 +28,25 @@ class HashedBucketEventPool(DefaultEventPool):
             heapq.heappush(self.active_slots, slot)
 
         bucket.append(event)
+        self._register(event)
         return True
 
+    def add_events(self, events: Iterable[Event]) -> int:
+        count = 0
+        new_slots = []
+        for slot, event in zip(*self._check_events(events)):
+            bucket = self.slot_buckets.get(slot)
+            if bucket is None:
+                bucket = deque()
+                self.slot_buckets[slot] = bucket
+                new_slots.append(slot)
+            bucket.append(event)
+            self._register(event)
+            count += 1
+        self.active_slots.extend(new_slots)
+        heapq.heapify(self.active_slots)
+        return count
+
     def next_event(self) -> Event:
         while self.active_slots:
             slot = self.active_slots[0]
@@ -45,8 +62,32 @@ class HashedBucketEventPool(DefaultEventPool):
                 heapq.heappop(self.active_slots)
                 del self.slot_buckets[slot]
 
-            self.tc = event.t
-            return event
+            self.tc_slot = slot
+            if self._release(event):
+                return event
 
-        self.tc = self.te
+        self.tc_slot = self.te_slot
         return None
+
+    def peek_time_slot(self) -> Optional[int]:
+        while self.active_slots:
+            slot = self.active_slots[0]
+            bucket = self.slot_buckets.get(slot)
+            while bucket and bucket[0]._is_canceled:
+                self._release(bucket.popleft())
+            if bucket:
+                return slot
+            heapq.heappop(self.active_slots)
+            self.slot_buckets.pop(slot, None)
+        return None
+
+    def compact(self) -> None:
+        for slot in list(self.slot_buckets.keys()):
+            bucket = deque(event for event in self.slot_buckets[slot] if not event._is_canceled)
+            if bucket:
+                self.slot_buckets[slot] = bucket
+            else:
+                del self.slot_buckets[slot]
+        self.active_slots = list(self.slot_buckets.keys())
+        heapq.heapify(self.active_slots)
+        self.dead = 0
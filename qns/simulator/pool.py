@@ -16,6 +16,8 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import heapq
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
 from qns.simulator.ts import Time
 from qns.simulator.event import Event
 
@@ -23,8 +25,17 @@ from qns.simulator.event import Event
 class DefaultEventPool(object):
     """
     The default implement of the event pool
+
+    Events are kept in a heap of ``(time_slot, seq, event)`` records, so that the ordering
+    only compares integers and events with the same time slot are popped in insertion order.
+
+    Canceled events are not removed from the heap immediately. The pool counts the ``live`` and ``dead``
+    (canceled) events, and compacts itself once the dead events exceed ``compact_threshold`` of all events.
     """
 
+    compact_threshold: float = 0.5
+    compact_min_dead: int = 1024
+
     def __init__(self, ts: Time, te: Time):
         '''
         Args:
@@ -33,15 +44,27 @@ class DefaultEventPool(object):
         '''
         self.ts = ts
         self.te = te
-        self.tc = ts
+        self.ts_slot: int = ts.time_slot
+        self.te_slot: int = te.time_slot
+        self.tc_slot: int = self.ts_slot
         self.event_list = []
+        self.seq = 0
+        self.live = 0
+        self.dead = 0
+
+    @property
+    def tc(self) -> Time:
+        '''
+        The alias of `current_time`
+        '''
+        return self.current_time
 
     @property
     def current_time(self) -> Time:
         '''
         Get the current time
         '''
-        return self.tc
+        return Time(time_slot=self.tc_slot, accuracy=self.ts.accuracy)
 
     def add_event(self, event: Event) -> bool:
         '''
@@ -52,23 +75,124 @@ class DefaultEventPool(object):
         Returns:
             if the event is inserted successfully
         '''
-        if event.t < self.tc or event.t > self.te:
+        slot = event.time_slot
+        if slot < self.tc_slot or slot > self.te_slot or event._is_canceled:
             return False
 
-        heapq.heappush(self.event_list, event)
+        heapq.heappush(self.event_list, (slot, self.seq, event))
+        self.seq += 1
+        self._register(event)
         return True
 
+    def add_events(self, events: Iterable[Event]) -> int:
+        '''
+        Insert a batch of events into the pool
+
+        Args:
+            events (Iterable[Event]): the inserting events
+        Returns:
+            the number of inserted events
+        '''
+        entries = self._make_entries(*self._check_events(events))
+        if len(entries) * 8 > len(self.event_list):
+            self.event_list.extend(entries)
+            heapq.heapify(self.event_list)
+        else:
+            for entry in entries:
+                heapq.heappush(self.event_list, entry)
+        return len(entries)
+
     def next_event(self) -> Event:
         '''
-        Get the next event to be executed
+        Get the next event to be executed. Canceled events are dropped silently.
 
         Returns:
             The next event to be executed
         '''
-        try:
-            event: Event = heapq.heappop(self.event_list)
-            self.tc = event.t
-        except IndexError:
-            event = None
-            self.tc = self.te
-        return event
+        while len(self.event_list) > 0:
+            slot, _, event = heapq.heappop(self.event_list)
+            self.tc_slot = slot
+            if self._release(event):
+                return event
+        self.tc_slot = self.te_slot
+        return None
+
+    def peek_time_slot(self) -> Optional[int]:
+        '''
+        Get the time slot of the next event without popping it. Canceled events on the top are dropped.
+
+        Returns:
+            the time slot of the next event, or ``None`` if the pool is empty
+        '''
+        event_list = self.event_list
+        while len(event_list) > 0:
+            slot, _, event = event_list[0]
+            if not event._is_canceled:
+                return slot
+            heapq.heappop(event_list)
+            self._release(event)
+        return None
+
+    def cancel_event(self, event: Event) -> None:
+        '''
+        Called by ``Event.cancel`` when a pending event in this pool is canceled
+
+        Args:
+            event (Event): the canceled event
+        '''
+        self.live -= 1
+        self.dead += 1
+        if self.dead >= self.compact_min_dead and self.dead > self.compact_threshold * (self.live + self.dead):
+            self.compact()
+
+    def compact(self) -> None:
+        '''
+        Remove all canceled events from the pool
+        '''
+        self.event_list = [entry for entry in self.event_list if not entry[2]._is_canceled]
+        heapq.heapify(self.event_list)
+        self.dead = 0
+
+    def _check_events(self, events: Iterable[Event]) -> Tuple[List[int], List[Event]]:
+        '''
+        Check the time bounds of a batch of events
+
+        Returns:
+            the time slots and the events that can be inserted, in the input order
+        '''
+        events = [event for event in events if not event._is_canceled]
+        slots = np.fromiter((event.time_slot for event in events), dtype=np.int64, count=len(events))
+        valid = (slots >= self.tc_slot) & (slots <= self.te_slot)
+        if not valid.all():
+            events = [event for event, v in zip(events, valid.tolist()) if v]
+            slots = slots[valid]
+        return slots.tolist(), events
+
+    def _make_entries(self, slots: List[int], events: List[Event]) -> List[Tuple[int, int, Event]]:
+        '''
+        Register a batch of checked events and build their ``(slot, seq, event)`` records
+        '''
+        for event in events:
+            event._pool = self
+        entries = list(zip(slots, range(self.seq, self.seq + len(events)), events))
+        self.seq += len(entries)
+        self.live += len(entries)
+        return entries
+
+    def _register(self, event: Event) -> None:
+        event._pool = self
+        self.live += 1
+
+    def _release(self, event: Event) -> bool:
+        '''
+        Detach a popped event from this pool
+
+        Returns:
+            whether the event is still alive
+        '''
+        event._pool = None
+        if event._is_canceled:
+            self.dead -= 1
+            return False
+        self.live -= 1
+        return True
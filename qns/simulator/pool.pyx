@@ -15,106 +15,225 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import heapq
+# cython: language_level=3
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
+from libc.stdint cimport int64_t
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
 from qns.simulator.ts import Time
 from qns.simulator.event import Event
-import numpy as np
+
 
 cdef class HeapPool(object):
-    cdef int size
-    cdef int capacity
-    cdef list heap
+    """
+    A binary min-heap of ``(slot, seq, event)`` entries.
 
-    def __cinit__(self, length=102400):
+    Slots and sequence numbers are kept in C arrays so that sifting only compares ``int64`` values,
+    the events themselves are kept in a parallel Python list.
+    """
+    cdef Py_ssize_t size
+    cdef Py_ssize_t capacity
+    cdef int64_t *slots
+    cdef int64_t *seqs
+    cdef list events
+    cdef int64_t next_seq
+    cdef readonly int64_t last_slot
+
+    def __cinit__(self, Py_ssize_t length=102400):
         self.size = 0
-        self.capacity = length
-        self.heap = [None]*length
-
-    cdef _get_parent_idx(self, int child_idx):
-        cdef int parent_idx
-        if child_idx == 0:
-            return 0
-        if child_idx % 2 == 0:
-            parent_idx = int(child_idx / 2 - 1)
-        else:
-            parent_idx = int(np.floor(child_idx / 2))
-        return parent_idx
-
-    cdef get_parent(self, int child_idx):
-        parent_idx = self._get_parent_idx(child_idx)
-        return self.heap[parent_idx]
-
-    cpdef heappush(self, key):
-        cdef int new_size = self.size + 1
-        cdef int idx = self.size
-        if new_size >= self.capacity:
-            self.heap.extend([None]*self.capacity)
-            self.capacity *= 2
-
-        self.heap[idx] = key
-        cdef int parent_idx = self._get_parent_idx(idx)
-        while self.heap[idx] < self.heap[parent_idx]:
-            self.heap[parent_idx], self.heap[idx] = self.heap[idx], self.heap[parent_idx]
-            idx = parent_idx
-            parent_idx = self._get_parent_idx(idx)
-        self.size = new_size
+        self.capacity = length if length > 0 else 1
+        self.next_seq = 0
+        self.last_slot = 0
+        self.slots = <int64_t *> PyMem_Malloc(self.capacity * sizeof(int64_t))
+        self.seqs = <int64_t *> PyMem_Malloc(self.capacity * sizeof(int64_t))
+        if self.slots == NULL or self.seqs == NULL:
+            raise MemoryError()
+        self.events = [None] * self.capacity
 
-    cdef _get_left_child_idx(self, int parent_idx):
-        return 2 * parent_idx + 1
+    def __dealloc__(self):
+        PyMem_Free(self.slots)
+        PyMem_Free(self.seqs)
 
-    cdef _get_right_child_idx(self, int parent_idx):
-        return 2 * parent_idx + 2
+    def __len__(self) -> int:
+        return self.size
 
-    cdef _get_left_child(self, int parent_idx):
-        left_child = self.heap[self._get_left_child_idx(parent_idx)]
-        return left_child
+    def __reduce__(self):
+        cdef Py_ssize_t i
+        return (_rebuild_heap_pool, ([self.slots[i] for i in range(self.size)], [self.seqs[i] for i in range(self.size)],
+                                     self.events[:self.size], self.next_seq, self.last_slot))
 
-    cdef _get_right_child(self, int parent_idx):
-        right_child = self.heap[self.get_right_child_idx(parent_idx)]
-        return right_child
+    cdef inline bint _less(self, Py_ssize_t a, Py_ssize_t b):
+        return self.slots[a] < self.slots[b] or (self.slots[a] == self.slots[b] and self.seqs[a] < self.seqs[b])
 
-    cdef _get_children_idx(self, int parent_idx):
-        return 2 * parent_idx + 1, 2 * parent_idx + 2
+    cdef inline void _swap(self, Py_ssize_t a, Py_ssize_t b):
+        cdef int64_t tmp = self.slots[a]
+        self.slots[a] = self.slots[b]
+        self.slots[b] = tmp
+        tmp = self.seqs[a]
+        self.seqs[a] = self.seqs[b]
+        self.seqs[b] = tmp
+        self.events[a], self.events[b] = self.events[b], self.events[a]
 
-    cdef _get_children(self, int parent_idx):
-        child_1_idx, child_2_idx = self._get_children_idx(parent_idx)
-        return self.heap[child_1_idx], self.heap[child_2_idx]
+    cdef _grow(self):
+        cdef Py_ssize_t capacity = self.capacity * 2
+        cdef int64_t *slots = <int64_t *> PyMem_Realloc(self.slots, capacity * sizeof(int64_t))
+        if slots == NULL:
+            raise MemoryError()
+        self.slots = slots
+        cdef int64_t *seqs = <int64_t *> PyMem_Realloc(self.seqs, capacity * sizeof(int64_t))
+        if seqs == NULL:
+            raise MemoryError()
+        self.seqs = seqs
+        self.events.extend([None] * self.capacity)
+        self.capacity = capacity
 
-    cpdef heappop(self):
-        root = self.heap[0]
-        self.size -= 1
-        self.heap[0] = self.heap[self.size]
-        self.heap[self.size] = None
-
-        cdef int key_idx = 0
-        cdef int c1_idx = self._get_left_child_idx(key_idx)
-        cdef int c2_idx = self._get_right_child_idx(key_idx)
-
-        if c1_idx >= self.size or c2_idx >= self.size:
-            return root
-        # Bubble down root until heap property restored
-        while self.heap[key_idx] > self.heap[c1_idx] or self.heap[key_idx] > self.heap[c2_idx]:
-            if self.heap[c1_idx] >= self.heap[c2_idx]:
-                smaller_child_idx = c2_idx
-            else:
-                smaller_child_idx = c1_idx
-
-            self.heap[key_idx], self.heap[smaller_child_idx] = self.heap[smaller_child_idx], self.heap[key_idx]
-
-            key_idx = smaller_child_idx
-            c1_idx = self._get_left_child_idx(key_idx)
-            c2_idx = self._get_right_child_idx(key_idx)
-            if c1_idx >= self.size or c2_idx >= self.size:
+    cpdef heappush(self, int64_t slot, event):
+        """
+        Push an ``event`` happening at ``slot``, events with the same slot keep their insertion order
+        """
+        if self.size >= self.capacity:
+            self._grow()
+
+        cdef Py_ssize_t idx = self.size
+        self.slots[idx] = slot
+        self.seqs[idx] = self.next_seq
+        self.events[idx] = event
+        self.next_seq += 1
+        self.size += 1
+        self._sift_up(idx)
+
+    cpdef extend(self, list slots, list events):
+        """
+        Push a batch of ``events`` happening at ``slots``, events with the same slot keep their insertion order.
+        A large batch is appended and the heap is rebuilt bottom-up in O(n), a small batch is sifted up one by one.
+        """
+        cdef Py_ssize_t count = len(events)
+        cdef Py_ssize_t start = self.size
+        cdef Py_ssize_t i
+        if len(slots) != count:
+            raise ValueError("slots and events should have the same length")
+        while self.size + count > self.capacity:
+            self._grow()
+        for i in range(count):
+            self.slots[start + i] = slots[i]
+            self.seqs[start + i] = self.next_seq + i
+            self.events[start + i] = events[i]
+        self.next_seq += count
+        self.size += count
+        if count * 8 > start:
+            for i in range(self.size // 2 - 1, -1, -1):
+                self._sift_down(i)
+        else:
+            for i in range(start, self.size):
+                self._sift_up(i)
+
+    cdef void _sift_up(self, Py_ssize_t idx):
+        cdef Py_ssize_t parent_idx
+        while idx > 0:
+            parent_idx = (idx - 1) >> 1
+            if not self._less(idx, parent_idx):
+                break
+            self._swap(idx, parent_idx)
+            idx = parent_idx
+
+    cpdef compact(self):
+        """
+        Drop the entries whose events are canceled and rebuild the heap
+        """
+        cdef Py_ssize_t i
+        cdef Py_ssize_t n = 0
+        for i in range(self.size):
+            event = self.events[i]
+            if event._is_canceled:
+                self.events[i] = None
+                continue
+            self.slots[n] = self.slots[i]
+            self.seqs[n] = self.seqs[i]
+            self.events[n] = event
+            if n != i:
+                self.events[i] = None
+            n += 1
+        self.size = n
+        for i in range(n // 2 - 1, -1, -1):
+            self._sift_down(i)
+
+    cdef void _sift_down(self, Py_ssize_t idx):
+        cdef Py_ssize_t child_idx
+        while True:
+            child_idx = 2 * idx + 1
+            if child_idx >= self.size:
+                break
+            if child_idx + 1 < self.size and self._less(child_idx + 1, child_idx):
+                child_idx += 1
+            if not self._less(child_idx, idx):
                 break
+            self._swap(idx, child_idx)
+            idx = child_idx
+
+    cpdef heappop(self):
+        """
+        Pop the earliest event and record its slot in ``last_slot``
+
+        Raises:
+            IndexError: the heap is empty
+        """
+        if self.size == 0:
+            raise IndexError("pop from an empty heap")
 
+        root = self.events[0]
+        self.last_slot = self.slots[0]
+        self.size -= 1
+        if self.size > 0:
+            self.slots[0] = self.slots[self.size]
+            self.seqs[0] = self.seqs[self.size]
+            self.events[0] = self.events[self.size]
+        self.events[self.size] = None
+        self._sift_down(0)
         return root
 
+    cpdef peek(self):
+        """
+        Get the earliest ``(time_slot, event)`` record without popping it
+
+        Raises:
+            IndexError: the heap is empty
+        """
+        if self.size == 0:
+            raise IndexError("peek from an empty heap")
+        return self.slots[0], self.events[0]
+
+
+def _rebuild_heap_pool(list slots, list seqs, list events, int64_t next_seq, int64_t last_slot):
+    """
+    Rebuild a pickled ``HeapPool``
+    """
+    cdef Py_ssize_t i
+    cdef HeapPool pool = HeapPool(max(102400, len(events)))
+    for i in range(len(events)):
+        pool.slots[i] = slots[i]
+        pool.seqs[i] = seqs[i]
+        pool.events[i] = events[i]
+    pool.size = len(events)
+    pool.next_seq = next_seq
+    pool.last_slot = last_slot
+    return pool
+
 
 class DefaultEventPool(object):
     """
     The default implement of the event pool
+
+    Events are kept in a heap of ``(time_slot, seq, event)`` records, so that the ordering
+    only compares integers and events with the same time slot are popped in insertion order.
+
+    Canceled events are not removed from the heap immediately. The pool counts the ``live`` and ``dead``
+    (canceled) events, and compacts itself once the dead events exceed ``compact_threshold`` of all events.
     """
 
+    compact_threshold: float = 0.5
+    compact_min_dead: int = 1024
+
     def __init__(self, ts: Time, te: Time):
         '''
         Args:
@@ -123,15 +242,27 @@ class DefaultEventPool(object):
         '''
         self.ts = ts
         self.te = te
-        self.tc = ts
+        self.ts_slot: int = ts.time_slot
+        self.te_slot: int = te.time_slot
+        self.tc_slot: int = self.ts_slot
         self.event_list = HeapPool()
+        self.seq = 0
+        self.live = 0
+        self.dead = 0
+
+    @property
+    def tc(self) -> Time:
+        '''
+        The alias of `current_time`
+        '''
+        return self.current_time
 
     @property
     def current_time(self) -> Time:
         '''
         Get the current time
         '''
-        return self.tc
+        return Time(time_slot=self.tc_slot, accuracy=self.ts.accuracy)
 
     def add_event(self, event: Event) -> bool:
         '''
@@ -142,26 +273,120 @@ class DefaultEventPool(object):
         Returns:
             if the event is inserted successfully
         '''
-        if event.t < self.tc or event.t > self.te:
+        slot = event.time_slot
+        if slot < self.tc_slot or slot > self.te_slot or event._is_canceled:
             return False
 
-        self.event_list.heappush(event)
+        self.event_list.heappush(slot, event)
+        self._register(event)
         return True
 
+    def add_events(self, events: Iterable[Event]) -> int:
+        '''
+        Insert a batch of events into the pool
+
+        Args:
+            events (Iterable[Event]): the inserting events
+        Returns:
+            the number of inserted events
+        '''
+        slots, events = self._check_events(events)
+        self.event_list.extend(slots, events)
+        for event in events:
+            event._pool = self
+        self.live += len(events)
+        return len(events)
+
     def next_event(self) -> Event:
         '''
-        Get the next event to be executed
+        Get the next event to be executed. Canceled events are dropped silently.
 
         Returns:
             The next event to be executed
         '''
-        try:
-            event: Event = self.event_list.heappop()
-            if event is None:
-                self.tc = self.te
-            else:
-                self.tc = event.t
-        except IndexError:
-            event = None
-            self.tc = self.te
-        return event
+        while len(self.event_list) > 0:
+            event = self.event_list.heappop()
+            self.tc_slot = self.event_list.last_slot
+            if self._release(event):
+                return event
+        self.tc_slot = self.te_slot
+        return None
+
+    def peek_time_slot(self) -> Optional[int]:
+        '''
+        Get the time slot of the next event without popping it. Canceled events on the top are dropped.
+
+        Returns:
+            the time slot of the next event, or ``None`` if the pool is empty
+        '''
+        event_list = self.event_list
+        while len(event_list) > 0:
+            slot, event = event_list.peek()
+            if not event._is_canceled:
+                return slot
+            event_list.heappop()
+            self._release(event)
+        return None
+
+    def cancel_event(self, event: Event) -> None:
+        '''
+        Called by ``Event.cancel`` when a pending event in this pool is canceled
+
+        Args:
+            event (Event): the canceled event
+        '''
+        self.live -= 1
+        self.dead += 1
+        if self.dead >= self.compact_min_dead and self.dead > self.compact_threshold * (self.live + self.dead):
+            self.compact()
+
+    def compact(self) -> None:
+        '''
+        Remove all canceled events from the pool
+        '''
+        self.event_list.compact()
+        self.dead = 0
+
+    def _check_events(self, events: Iterable[Event]) -> Tuple[List[int], List[Event]]:
+        '''
+        Check the time bounds of a batch of events
+
+        Returns:
+            the time slots and the events that can be inserted, in the input order
+        '''
+        events = [event for event in events if not event._is_canceled]
+        slots = np.fromiter((event.time_slot for event in events), dtype=np.int64, count=len(events))
+        valid = (slots >= self.tc_slot) & (slots <= self.te_slot)
+        if not valid.all():
+            events = [event for event, v in zip(events, valid.tolist()) if v]
+            slots = slots[valid]
+        return slots.tolist(), events
+
+    def _make_entries(self, slots: List[int], events: List[Event]) -> List[Tuple[int, int, Event]]:
+        '''
+        Register a batch of checked events and build their ``(slot, seq, event)`` records
+        '''
+        for event in events:
+            event._pool = self
+        entries = list(zip(slots, range(self.seq, self.seq + len(events)), events))
+        self.seq += len(entries)
+        self.live += len(entries)
+        return entries
+
+    def _register(self, event: Event) -> None:
+        event._pool = self
+        self.live += 1
+
+    def _release(self, event: Event) -> bool:
+        '''
+        Detach a popped event from this pool
+
+        Returns:
+            whether the event is still alive
+        '''
+        event._pool = None
+        if event._is_canceled:
+            self.dead -= 1
+            return False
+        self.live -= 1
+        return True
@@ -0,0 +1,108 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, Dict, List, Tuple
+import pandas as pd
+
+from qns.simulator.event import Event
+
+
+class EventProfiler(object):
+    """
+    The profiler records the invocation count, the cumulative wall time and the maximum wall time
+    of ``event.invoke()`` for every event class and every ``by`` entity or application.
+    It is enabled by ``Simulator(profile=True)`` or ``Simulator.enable_profiling``.
+    """
+
+    def __init__(self) -> None:
+        # (event class, id(by)) -> [count, total time, max time, by]
+        self.stats: Dict[Tuple[type, int], List[Any]] = {}
+
+    def record(self, event: Event, elapsed: float) -> None:
+        """
+        Record an invocation
+
+        Args:
+            event (Event): the invoked event
+            elapsed (float): the wall time of the invocation in seconds
+        """
+        by = event.by
+        key = (event.__class__, id(by))
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [1, elapsed, elapsed, by]
+            return
+        stat[0] += 1
+        stat[1] += elapsed
+        if elapsed > stat[2]:
+            stat[2] = elapsed
+
+    def clear(self) -> None:
+        """
+        Drop all records
+        """
+        self.stats.clear()
+
+    @staticmethod
+    def label(by: Any) -> str:
+        """
+        Get a readable label of the ``by`` entity or application
+
+        Args:
+            by: the entity or application that causes an event
+        Returns:
+            the label
+        """
+        if by is None:
+            return "None"
+        node = getattr(by, "_node", None)
+        if node is not None:
+            # an application is labeled with the node that it is installed on
+            return f"{by.__class__.__name__}@{node.name}"
+        name = getattr(by, "name", None)
+        if name is not None:
+            return f"{by.__class__.__name__}({name})"
+        return by.__class__.__name__
+
+    def report(self) -> pd.DataFrame:
+        """
+        Summarize the records
+
+        Returns:
+            a DataFrame with the columns ``event``, ``by``, ``count``, ``total_time``, ``mean_time`` and ``max_time``,
+            sorted by ``total_time`` in descending order. The times are in seconds.
+        """
+        rows = []
+        for (cls, _), (count, total, maximum, by) in self.stats.items():
+            rows.append({"event": cls.__name__, "by": self.label(by), "count": count,
+                         "total_time": total, "mean_time": total / count, "max_time": maximum})
+        data = pd.DataFrame(rows, columns=["event", "by", "count", "total_time", "mean_time", "max_time"])
+        return data.sort_values(by="total_time", ascending=False, ignore_index=True)
+
+    def dump_collapsed_stack(self, path: str) -> None:
+        """
+        Dump the records into a collapsed-stack file for flame graph tools, e.g., ``flamegraph.pl``.
+        Every line is ``simulator;<by>;<event class> <total time in microseconds>``.
+
+        Args:
+            path (str): the file path
+        """
+        with open(path, "w") as f:
+            for (cls, _), (_, total, _, by) in self.stats.items():
+                frames = ["simulator", self.label(by), cls.__name__]
+                frames = [frame.replace(";", ":").replace(" ", "_") for frame in frames]
+                f.write(f"{';'.join(frames)} {int(round(total * 1e6))}\n")
@@ -0,0 +1,153 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from qns.simulator.ts import Time
+from qns.simulator.event import Event
+from qns.simulator.pool import DefaultEventPool
+
+
+class RadixHeapEventPool(DefaultEventPool):
+    """
+    An event pool implemented as a radix heap on integer time slots.
+
+    The simulator never schedules an event before the current time slot, so the keys are monotone.
+    An event is kept in the bucket indexed by the highest bit that differs between its time slot
+    and the last popped time slot, and only the lowest non-empty bucket is redistributed when popping.
+    Events with the same time slot are popped in insertion order, like ``StableEventPool``.
+    """
+
+    def __init__(self, ts: Time, te: Time):
+        """
+        Args:
+            ts: the start time
+            te: the end time
+        """
+        super().__init__(ts, te)
+        self.buckets: List[Deque[Tuple[int, Event]]] = [deque() for _ in range(te.time_slot.bit_length() + 1)]
+        self.mask = 0  # the bit i is set if the i-th bucket is not empty
+        self.last_slot = self.tc_slot  # the reference slot of the buckets, no larger than any pending slot
+
+    def add_event(self, event: Event) -> bool:
+        """
+        Insert an event into the pool
+
+        Args:
+            event (Event): The inserting event
+        Returns:
+            if the event is inserted successfully
+        """
+        slot = event.time_slot
+        if slot < self.tc_slot or slot > self.te_slot or event._is_canceled:
+            return False
+
+        self._push(slot, event)
+        self._register(event)
+        return True
+
+    def add_events(self, events: Iterable[Event]) -> int:
+        """
+        Insert a batch of events into the pool
+
+        Args:
+            events (Iterable[Event]): the inserting events
+        Returns:
+            the number of inserted events
+        """
+        count = 0
+        for slot, event in zip(*self._check_events(events)):
+            self._push(slot, event)
+            self._register(event)
+            count += 1
+        return count
+
+    def next_event(self) -> Event:
+        """
+        Get the next event to be executed
+
+        Returns:
+            The next event to be executed
+        """
+        while self.mask != 0:
+            self._settle()
+            bucket = self.buckets[0]
+            _, event = bucket.popleft()
+            if len(bucket) == 0:
+                self.mask ^= 1
+            self.tc_slot = self.last_slot
+            if self._release(event):
+                return event
+        self.tc_slot = self.te_slot
+        return None
+
+    def peek_time_slot(self) -> Optional[int]:
+        """
+        Get the time slot of the next event without popping it. Canceled events on the top are dropped.
+
+        Returns:
+            the time slot of the next event, or ``None`` if the pool is empty
+        """
+        while self.mask != 0:
+            self._settle()
+            bucket = self.buckets[0]
+            if not bucket[0][1]._is_canceled:
+                return self.last_slot
+            self._release(bucket.popleft()[1])
+            if len(bucket) == 0:
+                self.mask ^= 1
+        return None
+
+    def _push(self, slot: int, event: Event):
+        if slot < self.last_slot:
+            # the pool was peeked beyond this slot, so rebase all buckets on it
+            entries = [entry for bucket in self.buckets for entry in bucket]
+            for bucket in self.buckets:
+                bucket.clear()
+            self.mask = 0
+            self._redistribute(slot, entries)
+        idx = (slot ^ self.last_slot).bit_length()
+        self.buckets[idx].append((slot, event))
+        self.mask |= 1 << idx
+
+    def _settle(self):
+        """
+        Make sure that the bucket 0 holds the earliest events
+        """
+        if not self.mask & 1:
+            idx = (self.mask & -self.mask).bit_length() - 1
+            bucket = self.buckets[idx]
+            self.buckets[idx] = deque()
+            self.mask ^= 1 << idx
+            self._redistribute(min(entry[0] for entry in bucket), bucket)
+
+    def _redistribute(self, last: int, entries: Iterable[Tuple[int, Event]]):
+        buckets = self.buckets
+        self.last_slot = last
+        for entry in entries:
+            i = (entry[0] ^ last).bit_length()
+            buckets[i].append(entry)
+            self.mask |= 1 << i
+
+    def compact(self) -> None:
+        self.mask = 0
+        for idx, bucket in enumerate(self.buckets):
+            self.buckets[idx] = bucket = deque(entry for entry in bucket if not entry[1]._is_canceled)
+            if len(bucket) > 0:
+                self.mask |= 1 << idx
+        self.dead = 0
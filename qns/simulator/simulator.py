@@ -15,13 +15,18 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import gc
+import sys
 import time
-from typing import Optional, Type, Dict, Any
-from qns.simulator.ts import Time, default_accuracy
-from qns.simulator.event import Event
+import pandas as pd
+from typing import Callable, Iterable, List, Optional, Tuple, Type, Dict, Any, Union
+from qns.simulator.ts import Time, default_accuracy, use_accuracy
+from qns.simulator.event import CallbackEvent, Event
 from qns.simulator.pool import DefaultEventPool
+from qns.simulator.checkpoint import Checkpoint
+from qns.simulator.profile import EventProfiler
+from qns.simulator.trace import TraceRecorder
 import qns.utils.log as log
-from . import ts
 
 default_start_second = 0.0
 default_end_second = 60.0
@@ -36,7 +41,9 @@ class Simulator(object):
                  end_second: float = default_end_second,
                  accuracy: int = default_accuracy,
                  pool_cls: Type[DefaultEventPool] = DefaultEventPool,
-                 pool_kwargs: Optional[Dict[str, Any]] = None) -> None:
+                 pool_kwargs: Optional[Dict[str, Any]] = None,
+                 profile: bool = False,
+                 recycle_events: bool = False) -> None:
         """
         Args:
             start_second (float): the start second of the simulation
@@ -44,9 +51,11 @@ class Simulator(object):
             accuracy (int): the number of time slots per second
             pool_cls (Type[DefaultEventPool]): the event pool class
             pool_kwargs (Optional[Dict[str, Any]]): the keyword arguments for event pool
+            profile (bool): record the wall time of every event class and ``by`` in ``profiler``
+            recycle_events (bool): reuse the invoked events of recyclable classes, see ``enable_event_recycling``
         """
+        # every run binds this accuracy with ``use_accuracy``, so that other simulators and threads are not affected
         self.accuracy = accuracy
-        ts.default_accuracy = accuracy
 
         self.ts: Time = self.time(sec=start_second)
         self.te: Time = self.time(sec=end_second)
@@ -56,7 +65,23 @@ class Simulator(object):
         self.status = {}
         self.total_events = 0
 
-        self.watch_event = {}
+        self.watch_event: Dict[type, List[Any]] = {}
+        # concrete event class -> the monitors that watch it or its base classes
+        self._watch_cache: Dict[type, Tuple[Any, ...]] = {}
+        self._paused = False
+        self.profiler: Optional[EventProfiler] = EventProfiler() if profile else None
+        self._profiling = profile
+
+        self.tracer: Optional[TraceRecorder] = None
+
+        self._free_events: Optional[Dict[type, List[Event]]] = None
+        self._recycle_safe = False
+        self._recycle_refs = 0
+        self.max_free_events = 4096
+        self.recycled_events = 0
+        self.held_events = 0
+        if recycle_events:
+            self.enable_event_recycling()
 
     @property
     def current_time(self) -> Time:
@@ -75,6 +100,13 @@ class Simulator(object):
         """
         return self.current_time
 
+    @property
+    def tc_slot(self) -> int:
+        """
+        The current time slot of the simulation. It avoids building a ``Time`` object on hot paths.
+        """
+        return self.event_pool.tc_slot
+
     def time(self, time_slot: Optional[int] = None, sec: Optional[float] = None) -> Time:
         """
         Produce a ``Time`` using ``time_slot`` or ``sec``
@@ -89,37 +121,376 @@ class Simulator(object):
             return Time(time_slot=time_slot, accuracy=self.accuracy)
         return Time(sec=sec, accuracy=self.accuracy)
 
-    def add_event(self, event: Event) -> None:
+    def time_slot(self, sec: float) -> int:
+        """
+        Convert ``sec`` into an integer time slot
+
+        Args:
+            sec (float): the second
+        Returns:
+            the time slot
+        """
+        return int(sec * self.accuracy)
+
+    def add_event(self, event: Event) -> Optional[Event]:
         '''
         Add an ``event`` into simulator event pool.
         :param event: the inserting event
+        :returns: the handle of the inserted event, or ``None`` if the event is not inserted.
+            Calling ``cancel()`` on the handle removes the event from the pool.
         '''
+        if event.accuracy != self.accuracy:
+            self._convert_accuracy(event)
         if self.event_pool.add_event(event):
             self.total_events += 1
+            return event
+        return None
+
+    def add_events(self, events: Iterable[Event]) -> int:
+        '''
+        Add a batch of events into simulator event pool.
+        It is much faster than calling ``add_event`` for every event.
+        :param events: the inserting events
+        :returns: the number of inserted events
+        '''
+        # a batch allocates many acyclic records at once, pausing the cyclic GC
+        # avoids scanning the growing event pool over and over again
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            count = self.event_pool.add_events(self._convert_accuracies(events))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.total_events += count
+        return count
+
+    def _convert_accuracy(self, event: Event) -> None:
+        '''
+        Convert the time slot of an ``event`` built with another accuracy (e.g., a ``Time`` built outside a run
+        or in another simulator) into the accuracy of this simulator
+        '''
+        if event.accuracy is not None and event.time_slot is not None:
+            event.time_slot = int(event.time_slot * self.accuracy // event.accuracy)
+        event.accuracy = self.accuracy
+
+    def _convert_accuracies(self, events: Iterable[Event]) -> Iterable[Event]:
+        accuracy = self.accuracy
+        for event in events:
+            if event.accuracy != accuracy:
+                self._convert_accuracy(event)
+            yield event
 
     def run(self) -> None:
         '''
-        Run the simulate
+        Run the simulate until the event pool is empty or ``pause`` is called.
+        A paused simulation continues from where it stopped when ``run`` is called again.
         '''
         log.debug("simulation started.")
+        trs = time.time()
+        self._run()
+        tre = time.time()
+        log.debug("simulation finished.")
+        sim_time = self.te.sec - self.ts.sec
+        log.debug(lambda: f"runtime {tre - trs}, {self.total_events} events, sim_time {sim_time}, "
+                          f"x{sim_time / (tre - trs) if tre > trs else 'INF'}")
+
+    def run_until(self, t: Union[Time, float]) -> int:
+        '''
+        Run the events no later than ``t``, then move the current time to ``t``.
+        The simulation can be continued by ``run``, ``run_until`` or ``step`` afterwards.
+
+        Args:
+            t (Union[Time, float]): the stop time, a ``Time`` object or the second
+        Returns:
+            the number of executed events
+        '''
+        until_slot = t.time_slot if isinstance(t, Time) else self.time_slot(t)
+        until_slot = min(until_slot, self.event_pool.te_slot)
+        count = self._run(until_slot=until_slot)
+        if not self._paused and self.event_pool.tc_slot < until_slot:
+            self.event_pool.tc_slot = until_slot
+        return count
+
+    def step(self, n: int = 1) -> int:
+        '''
+        Execute at most ``n`` events
+
+        Args:
+            n (int): the number of events to execute
+        Returns:
+            the number of executed events, less than ``n`` if the event pool is drained or ``pause`` is called
+        '''
+        return self._run(max_events=n)
+
+    def pause(self) -> None:
+        '''
+        Stop the running simulation after the current event. It is usually called inside an event or a monitor.
+        '''
+        self._paused = True
+
+    def call_at(self, t: Union[Time, int], fn: Callable, *args: Any,
+                name: Optional[str] = None, by: Optional[Any] = None) -> Optional[Event]:
+        '''
+        Call ``fn(*args)`` at time ``t``
+
+        Args:
+            t (Union[Time, int]): the calling time, a ``Time`` object or an integer time slot
+            fn (Callable): the function
+            *args: the function's parameters
+            name (str): the name of the event
+            by: the entity or application that causes this call
+        Returns:
+            the handle of the inserted event, or ``None`` if ``t`` is out of the simulation.
+            Calling ``cancel()`` on the handle cancels the call.
+        '''
+        return self.add_event(CallbackEvent(t, fn, args, name=name, by=by))
+
+    def call_later(self, delay: float, fn: Callable, *args: Any,
+                   name: Optional[str] = None, by: Optional[Any] = None) -> Optional[Event]:
+        '''
+        Call ``fn(*args)`` after ``delay`` seconds from the current time
+
+        Args:
+            delay (float): the delay in second
+            fn (Callable): the function
+            *args: the function's parameters
+            name (str): the name of the event
+            by: the entity or application that causes this call
+        Returns:
+            the handle of the inserted event, or ``None`` if the calling time is out of the simulation
+        '''
+        return self.add_event(CallbackEvent(self.tc_slot + self.time_slot(delay), fn, args, name=name, by=by))
+
+    def watch(self, event_type: type, monitor: Any) -> None:
+        '''
+        Let ``monitor.handle(event)`` be called after every ``event_type`` event (including its subclasses) is invoked
+
+        Args:
+            event_type (type): the watching event class
+            monitor: the monitor, it should have a ``handle`` method
+        '''
+        self.watch_event.setdefault(event_type, []).append(monitor)
+        self._watch_cache.clear()
+
+    def _watchers(self, event_type: type) -> Tuple[Any, ...]:
+        '''
+        Find the monitors for an event class via its MRO, and cache the result
+        '''
+        monitors = []
+        for cls in event_type.__mro__:
+            monitors.extend(m for m in self.watch_event.get(cls, []) if m not in monitors)
+        self._watch_cache[event_type] = tuple(monitors)
+        return self._watch_cache[event_type]
+
+    def enable_event_recycling(self, enable: bool = True, safe: bool = False) -> None:
+        '''
+        Keep the invoked events of recyclable classes (``recyclable = True``, e.g. ``RecvClassicPacket``
+        and ``RecvQubitPacket``) in per-class free lists, and let ``make_event`` reuse them.
+        A recycled event is modified when it is reused, so user code should not keep references to invoked
+        events. In the ``safe`` mode, the reference count of every invoked event is checked, and the events
+        that are still referenced are counted in ``held_events`` and not recycled.
+
+        Args:
+            enable (bool): whether to enable the recycling
+            safe (bool): whether to check the references before recycling
+        '''
+        self._free_events = {} if enable else None
+        self._recycle_safe = safe
+        probe = Event()  # a local variable, like the event in the loop
+        self._recycle_refs = self._count_refs(probe)
+
+    def make_event(self, event_cls: Type[Event], *args: Any, **kwargs: Any) -> Event:
+        '''
+        Build an event of ``event_cls``, reusing a recycled one if possible
+
+        Args:
+            event_cls (Type[Event]): the event class
+            *args: the positional parameters of ``event_cls``
+            **kwargs: the keyword parameters of ``event_cls``
+        Returns:
+            the event
+        '''
+        if self._free_events is not None:
+            free = self._free_events.get(event_cls)
+            if free:
+                event = free.pop()
+                event.__init__(*args, **kwargs)
+                self.recycled_events += 1
+                return event
+        return event_cls(*args, **kwargs)
+
+    def _count_refs(self, event: Event) -> int:
+        # it has the same frame layout as ``_recycle``, so that it measures the baseline reference count
+        return sys.getrefcount(event)
+
+    def _recycle(self, event: Event) -> None:
+        if event._pool is not None:
+            # the event has been inserted into the pool again
+            return
+        if self._recycle_safe and sys.getrefcount(event) > self._recycle_refs:
+            if self.held_events == 0:
+                log.warn("event %s is still referenced after invoked, it is not recycled", event)
+            self.held_events += 1
+            return
+        free = self._free_events.setdefault(event.__class__, [])
+        if len(free) < self.max_free_events:
+            free.append(event)
+
+    def enable_profiling(self, enable: bool = True) -> None:
+        '''
+        Enable or disable the profiling. The records in ``profiler`` are kept when it is enabled again.
+
+        Args:
+            enable (bool): whether to enable the profiling
+        '''
+        if enable and self.profiler is None:
+            self.profiler = EventProfiler()
+        self._profiling = enable
+
+    def profile_report(self) -> pd.DataFrame:
+        '''
+        Summarize the profiling records, see ``EventProfiler.report``
+
+        Returns:
+            a DataFrame with the invocation count, the cumulative and the maximum wall time
+            for every event class and ``by``
+        '''
+        return (self.profiler or EventProfiler()).report()
+
+    def enable_tracing(self, path: Optional[str] = None, capacity: int = 1 << 20, ring: bool = False,
+                       summarize: Optional[Callable[[Event], int]] = None) -> Optional[TraceRecorder]:
+        '''
+        Record every invoked event to a binary trace in the directory ``path``, see ``TraceRecorder``.
+        The trace is flushed at the end of every run and can be loaded by ``qns.simulator.trace.read_trace``.
+
+        Args:
+            path (str): the directory of the trace. ``None`` disables the tracing and closes the current trace
+            capacity (int): the number of records in a segment file
+            ring (bool): whether to overwrite the oldest records instead of starting new segments
+            summarize (Callable[[Event], int]): summarizes the payload of an event as an integer
+        Returns:
+            the recorder
+        '''
+        if self.tracer is not None:
+            self.tracer.close()
+            self.tracer = None
+        if path is not None:
+            self.tracer = TraceRecorder(path, capacity=capacity, ring=ring, summarize=summarize)
+        return self.tracer
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["tracer"] = None  # the trace files are not part of a checkpoint
+        return state
+
+    def checkpoint(self, *entities: Any) -> Checkpoint:
+        '''
+        Take a snapshot of the simulator, including the event pool, the current time, the entities
+        and the state of the random generators. It should be called between two runs, not inside an event.
+
+        Args:
+            *entities: other objects to be captured together, e.g. the ``QuantumNetwork``
+        Returns:
+            the checkpoint
+        '''
+        return Checkpoint(self, *entities)
+
+    @staticmethod
+    def restore(checkpoint: Checkpoint) -> Tuple[Any, ...]:
+        '''
+        Restore a new simulator from a checkpoint. The original simulator is not affected.
+
+        Args:
+            checkpoint (Checkpoint): the checkpoint from ``Simulator.checkpoint``
+        Returns:
+            a tuple of the restored simulator and the restored entities
+        '''
+        return checkpoint.restore()
+
+    def _run(self, until_slot: Optional[int] = None, max_events: Optional[int] = None) -> int:
+        '''
+        The main loop of the simulator
 
+        Args:
+            until_slot (Optional[int]): do not execute the events after this time slot
+            max_events (Optional[int]): the maximum number of events to execute
+        Returns:
+            the number of executed events
+        '''
+        self._paused = False
         trs = time.time()
-        event = self.event_pool.next_event()
-        while event is not None:
-            if not event.is_canceled:
+        with use_accuracy(self.accuracy):
+            if self._profiling:
+                count = self._profiled_loop(until_slot, max_events)
+            else:
+                count = self._loop(until_slot, max_events)
+        self.time_spend += time.time() - trs
+        if self.tracer is not None:
+            self.tracer.flush()
+        return count
+
+    def _loop(self, until_slot: Optional[int], max_events: Optional[int]) -> int:
+        next_event = self.event_pool.next_event
+        peek_time_slot = self.event_pool.peek_time_slot
+        watch_cache = self._watch_cache
+        free_events = self._free_events
+        trace = self.tracer.record if self.tracer is not None else None
+        count = 0
+        while not self._paused and (max_events is None or count < max_events):
+            if until_slot is not None:
+                slot = peek_time_slot()
+                if slot is None or slot > until_slot:
+                    break
+            event = next_event()
+            if event is None:
+                break
+            if not event._is_canceled:
+                if trace is not None:
+                    trace(event)
                 event.invoke()
-                monitor_list = self.watch_event.get(event.__class__, [])
-                for m in monitor_list:
+                monitors = watch_cache.get(event.__class__)
+                if monitors is None:
+                    monitors = self._watchers(event.__class__)
+                for m in monitors:
                     m.handle(event)
-            event = self.event_pool.next_event()
+                if free_events is not None and event.__class__.recyclable:
+                    self._recycle(event)
+            count += 1
+        return count
 
-        tre = time.time()
-        self.time_spend = tre - trs
-        log.debug("simulation finished.")
-
-        if tre - trs == 0:
-            log.debug(f"runtime {tre - trs}, {self.total_events} events,\
-                sim_time {self.te.sec - self.ts.sec}, xINF")
-        else:
-            log.debug(f"runtime {tre - trs}, {self.total_events} events,\
-                sim_time {self.te.sec - self.ts.sec}, x{(self.te.sec - self.ts.sec)/(tre-trs)}")
+    def _profiled_loop(self, until_slot: Optional[int], max_events: Optional[int]) -> int:
+        '''
+        The same as ``_loop`` but records the wall time of every invocation, so that ``_loop`` has no overhead
+        '''
+        next_event = self.event_pool.next_event
+        peek_time_slot = self.event_pool.peek_time_slot
+        watch_cache = self._watch_cache
+        free_events = self._free_events
+        trace = self.tracer.record if self.tracer is not None else None
+        record = self.profiler.record
+        perf_counter = time.perf_counter
+        count = 0
+        while not self._paused and (max_events is None or count < max_events):
+            if until_slot is not None:
+                slot = peek_time_slot()
+                if slot is None or slot > until_slot:
+                    break
+            event = next_event()
+            if event is None:
+                break
+            if not event._is_canceled:
+                if trace is not None:
+                    trace(event)
+                tis = perf_counter()
+                event.invoke()
+                record(event, perf_counter() - tis)
+                monitors = watch_cache.get(event.__class__)
+                if monitors is None:
+                    monitors = self._watchers(event.__class__)
+                for m in monitors:
+                    m.handle(event)
+                if free_events is not None and event.__class__.recyclable:
+                    self._recycle(event)
+            count += 1
+        return count
@@ -15,39 +15,16 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import heapq
 from qns.simulator.ts import Time
-from qns.simulator.event import Event
+from qns.simulator.pool import DefaultEventPool
 
 
-class StableEventPool(object):
-    class StableEvent:
-        def __init__(self, event: Event, seq: int) -> None:
-            self.event = event
-            self.seq = seq
-
-        def __eq__(self, other) -> bool:
-            return self.event == other.event and self.seq == other.seq
-
-        def __lt__(self, other) -> bool:
-            return self.event < other.event or (
-                self.event == other.event and self.seq < other.seq
-            )
-
-        def __le__(self, other) -> bool:
-            return self < other or self == other
-
-        def __gt__(self, other) -> bool:
-            return not (self < other or self == other)
-
-        def __ge__(self, other) -> bool:
-            return not (self < other)
-
-        def __ne__(self, other) -> bool:
-            return not self == other
-
+class StableEventPool(DefaultEventPool):
     """
-    The default implement of the event pool
+    The event pool that keeps the insertion order of events with the same time slot.
+
+    Heap records already carry an insertion sequence number as the tie-breaker,
+    so this pool behaves the same as ``DefaultEventPool``.
     """
 
     def __init__(self, ts: Time, te: Time):
@@ -56,48 +33,4 @@ class StableEventPool(object):
             ts: the start time
             te: the end time
         """
-        self.ts = ts
-        self.te = te
-        self.tc = ts
-        self.event_list = []
-        self.seq = 0
-
-    @property
-    def current_time(self) -> Time:
-        """
-        Get the current time
-        """
-        return self.tc
-
-    def add_event(self, event: Event) -> bool:
-        """
-        Insert an event into the pool
-
-        Args:
-            event (Event): The inserting event
-        Returns:
-            if the event is inserted successfully
-        """
-        if event.t < self.tc or event.t > self.te:
-            return False
-
-        sevent = self.StableEvent(event, self.seq)
-        self.seq += 1
-        heapq.heappush(self.event_list, sevent)
-        return True
-
-    def next_event(self) -> Event:
-        """
-        Get the next event to be executed
-
-        Returns:
-            The next event to be executed
-        """
-        try:
-            sevent = heapq.heappop(self.event_list)
-            event = sevent.event
-            self.tc = event.t
-        except IndexError:
-            event = None
-            self.tc = self.te
-        return event
+        super().__init__(ts, te)
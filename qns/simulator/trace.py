@@ -0,0 +1,315 @@
+#    SimQN: a discrete-event simulator for the quantum networks
+#    Copyright (C) 2021-2022 Lutong Chen, Jian Li, Kaiping Xue
+#    University of Science and Technology of China, USTC.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from qns.simulator.event import Event
+from qns.simulator.profile import EventProfiler
+
+TRACE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("slot", "<i8"),
+    ("event", "<i4"),
+    ("by", "<i4"),
+    ("target", "<i4"),
+    ("payload", "<i8"),
+)
+"""
+The columns of a trace and their fixed-width little-endian types
+"""
+
+_ARRAY_CODES = {"<i8": "q", "<i4": "i"}
+
+
+class TraceRecorder(object):
+    """
+    The recorder appends a fixed-width record ``(slot, event, by, target, payload)`` for every invoked event
+    to memory-mapped segment files in a directory. The event classes and the ``by`` and target objects
+    are stored as integer ids, and their labels are kept in ``meta.json``. ``-1`` means no object.
+
+    Every segment holds ``capacity`` records in a columnar layout. If ``ring`` is ``True``, only one segment
+    is used and the oldest records are overwritten. Otherwise, a new segment is started when the last one
+    is full. The records are buffered in memory and written to the segments in chunks.
+    It is enabled by ``Simulator.enable_tracing``.
+    """
+
+    def __init__(self, path: str, capacity: int = 1 << 20, ring: bool = False, chunk: int = 4096,
+                 summarize: Optional[Callable[[Event], int]] = None):
+        """
+        Args:
+            path (str): the directory of the trace
+            capacity (int): the number of records in a segment
+            ring (bool): whether to overwrite the oldest records instead of starting new segments
+            chunk (int): the number of records buffered in memory before writing to the segment
+            summarize (Callable[[Event], int]): the function that summarizes the payload of an event
+                as an integer, the default is ``default_summarize``
+        """
+        self.path = path
+        self.capacity = capacity
+        self.ring = ring
+        self.chunk = min(chunk, capacity)
+        self.summarize = summarize if summarize is not None else default_summarize
+        os.makedirs(path, exist_ok=True)
+
+        self.classes: Dict[type, int] = {}
+        self.objects: Dict[int, int] = {}  # id(object) -> object id
+        self.labels: List[str] = []
+        self._refs: List[Any] = []  # keep the objects alive, so that their ``id`` are not reused
+
+        self.count = 0  # the number of records
+        self.segments = 0
+        self._segment: Optional[Dict[str, np.memmap]] = None
+        self._pos = 0  # the next position in the current segment
+        self._buffer = {name: array(_ARRAY_CODES[dtype]) for name, dtype in TRACE_COLUMNS}
+        self._appends = [self._buffer[name].append for name, _ in TRACE_COLUMNS]
+        self._size = 0  # the number of buffered records
+
+    def record(self, event: Event) -> None:
+        """
+        Record an event
+
+        Args:
+            event (Event): the invoked event
+        """
+        append_slot, append_event, append_by, append_target, append_payload = self._appends
+        objects = self.objects
+        append_slot(event.time_slot)
+        cls = event.__class__
+        cid = self.classes.get(cls)
+        if cid is None:
+            cid = self.classes[cls] = len(self.classes)
+        append_event(cid)
+        by = event.by
+        oid = objects.get(id(by))
+        append_by(oid if oid is not None else self._object_id(by))
+        target = target_of(event)
+        oid = objects.get(id(target))
+        append_target(oid if oid is not None else self._object_id(target))
+        append_payload(self.summarize(event))
+        self._size += 1
+        if self._size >= self.chunk:
+            self._write()
+
+    def _object_id(self, obj: Any) -> int:
+        if obj is None:
+            oid = -1
+        else:
+            oid = len(self.labels)
+            self.labels.append(EventProfiler.label(obj))
+            self._refs.append(obj)
+        self.objects[id(obj)] = oid
+        return oid
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self.path, f"segment-{self.segments:05d}.bin")
+        size = self.capacity * sum(np.dtype(dtype).itemsize for _, dtype in TRACE_COLUMNS)
+        with open(path, "wb") as f:
+            f.truncate(size)
+        offset = 0
+        self._segment = {}
+        for name, dtype in TRACE_COLUMNS:
+            self._segment[name] = np.memmap(path, dtype=dtype, mode="r+", offset=offset, shape=(self.capacity,))
+            offset += self.capacity * np.dtype(dtype).itemsize
+        self._pos = 0
+        self.segments += 1
+
+    def _write(self) -> None:
+        size = self._size
+        done = 0
+        while done < size:
+            if self._segment is None:
+                self._open_segment()
+            elif self._pos == self.capacity:
+                if self.ring:
+                    self._pos = 0
+                else:
+                    self._flush_segment()
+                    self._open_segment()
+            n = min(size - done, self.capacity - self._pos)
+            for name, dtype in TRACE_COLUMNS:
+                column = np.frombuffer(self._buffer[name], dtype=dtype)
+                self._segment[name][self._pos:self._pos + n] = column[done:done + n]
+            self._pos += n
+            done += n
+        self.count += size
+        for column in self._buffer.values():
+            del column[:]
+        self._size = 0
+
+    def _flush_segment(self) -> None:
+        for column in self._segment.values():
+            column.flush()
+
+    def _event_names(self) -> List[str]:
+        # qualified names are unique except for classes defined in a function, which get a ``#n`` suffix
+        names: List[str] = []
+        seen: Dict[str, int] = {}
+        for cls in sorted(self.classes, key=self.classes.get):
+            name = f"{cls.__module__}.{cls.__qualname__}"
+            seen[name] = seen.get(name, 0) + 1
+            names.append(name if seen[name] == 1 else f"{name}#{seen[name] - 1}")
+        return names
+
+    def flush(self) -> None:
+        """
+        Write the buffered records and the metadata to the disk
+        """
+        if self._size > 0:
+            self._write()
+        if self._segment is not None:
+            self._flush_segment()
+        meta = {
+            "columns": [list(column) for column in TRACE_COLUMNS],
+            "capacity": self.capacity,
+            "ring": self.ring,
+            "segments": self.segments,
+            "count": self.count,
+            "head": self._pos,
+            "events": self._event_names(),
+            "objects": self.labels,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def close(self) -> None:
+        """
+        Flush and release the segment files
+        """
+        self.flush()
+        self._segment = None
+
+
+def target_of(event: Event) -> Any:
+    """
+    Get the target of an event, i.e., the ``dest`` of a packet or the ``node`` of a response event
+
+    Args:
+        event (Event): the event
+    Returns:
+        the target object, or ``None``
+    """
+    target = getattr(event, "dest", None)
+    if target is None:
+        target = getattr(event, "node", None)
+    return target
+
+
+def default_summarize(event: Event) -> int:
+    """
+    The default payload summary: the length of a classic packet, or 0 for other events
+
+    Args:
+        event (Event): the event
+    Returns:
+        the payload summary
+    """
+    packet = getattr(event, "packet", None)
+    if packet is None:
+        return 0
+    return len(packet)
+
+
+def load_trace(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Load a trace into NumPy arrays
+
+    Args:
+        path (str): the directory of the trace
+    Returns:
+        a dict of the columns in the recording order, and the metadata
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    capacity = meta["capacity"]
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name, _ in meta["columns"]}
+    for seg in range(meta["segments"]):
+        file = os.path.join(path, f"segment-{seg:05d}.bin")
+        if meta["ring"]:
+            size = min(meta["count"], capacity)
+        elif seg == meta["segments"] - 1:
+            size = meta["count"] - capacity * seg
+        else:
+            size = capacity
+        offset = 0
+        for name, dtype in meta["columns"]:
+            column = np.fromfile(file, dtype=dtype, count=capacity, offset=offset)[:size]
+            if meta["ring"] and meta["count"] > capacity:
+                # the oldest record is at the head of the ring
+                column = np.roll(column, -meta["head"])
+            columns[name].append(column)
+            offset += capacity * np.dtype(dtype).itemsize
+    data = {}
+    for name, dtype in meta["columns"]:
+        data[name] = np.concatenate(columns[name]) if columns[name] else np.zeros(0, dtype=dtype)
+    return data, meta
+
+
+def read_trace(path: str, accuracy: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load a trace into a pandas DataFrame
+
+    Args:
+        path (str): the directory of the trace
+        accuracy (int): the accuracy of the simulator, to add a ``time`` column in seconds
+    Returns:
+        a DataFrame with the columns ``slot``, ``event``, ``by``, ``target`` and ``payload``.
+        ``event``, ``by`` and ``target`` are the labels of the classes and objects. The event classes are
+        labeled by their qualified names, e.g., ``qns.entity.cchannel.cchannel.RecvClassicPacket``,
+        and distinct classes with the same qualified name get a ``#n`` suffix.
+    """
+    data, meta = load_trace(path)
+    df = pd.DataFrame({"slot": data["slot"]})
+    if accuracy is not None:
+        df["time"] = data["slot"] / accuracy
+    df["event"] = pd.Categorical.from_codes(data["event"], categories=meta["events"])
+    labels = np.array([*meta["objects"], None], dtype=object)  # -1 is the last one
+    df["by"] = labels[data["by"]]
+    df["target"] = labels[data["target"]]
+    df["payload"] = data["payload"]
+    return df
+
+
+def replay(simulator, trace: pd.DataFrame, make_event: Callable[[Any], Optional[Event]],
+           event: Optional[str] = None) -> int:
+    """
+    Re-inject a recorded arrival stream into a simulator, e.g., to reproduce a performance regression
+    with the same packet arrivals
+
+    Args:
+        simulator (Simulator): the simulator
+        trace (pd.DataFrame): the trace from ``read_trace``
+        make_event (Callable): builds the event from a row of the trace, which has the attributes ``slot``,
+            ``event``, ``by``, ``target`` and ``payload``. Rows that return ``None`` are skipped.
+        event (str): only replay the records of this event class, by its qualified name or its class name
+    Returns:
+        the number of injected events
+    """
+    if event is not None:
+        names = trace["event"].astype(str)
+        short = names.str.split("#").str[0].str.rsplit(".", n=1).str[-1]
+        trace = trace[(names == event) | (short == event)]
+    events = []
+    for row in trace.itertuples(index=False):
+        e = make_event(row)
+        if e is not None:
+            events.append(e)
+    return simulator.add_events(events)
@@ -15,11 +15,15 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Union
+from contextvars import ContextVar
+from typing import Optional, Union
 
 
 default_accuracy = 1000000  # {default_accuracy} time slots per second
 
+# the accuracy of the simulator that runs in the current thread or context, see ``use_accuracy``
+_context_accuracy: ContextVar[Optional[int]] = ContextVar("qns_accuracy", default=None)
+
 
 def set_default_accuracy(time_slots: int):
     """
@@ -32,17 +36,52 @@ def set_default_accuracy(time_slots: int):
     default_accuracy = time_slots
 
 
+def get_default_accuracy() -> int:
+    """
+    Get the accuracy for the ``Time`` objects built without an explicit accuracy. It is the accuracy of
+    the simulator in the current context (see ``use_accuracy``), or ``default_accuracy`` outside a simulator.
+
+    Returns:
+        the time slots per second
+    """
+    accuracy = _context_accuracy.get()
+    return default_accuracy if accuracy is None else accuracy
+
+
+class use_accuracy(object):
+    """
+    A context manager that binds an accuracy to the current thread or context, e.g., the simulator binds
+    its accuracy while it runs. Other threads and contexts are not affected.
+    """
+
+    def __init__(self, accuracy: Optional[int]):
+        """
+        Args:
+            accuracy (int): the time slots per second, ``None`` means ``default_accuracy``
+        """
+        self.accuracy = accuracy
+        self._token = None
+
+    def __enter__(self) -> "use_accuracy":
+        self._token = _context_accuracy.set(self.accuracy)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _context_accuracy.reset(self._token)
+
+
 class Time(object):
-    def __init__(self, time_slot: int = 0, sec: float = 0.0, accuracy: int = default_accuracy):
+    def __init__(self, time_slot: int = 0, sec: float = 0.0, accuracy: Optional[int] = None):
         '''
         Time: the time slot used in the simulator
 
         Args:
             time_slot (int): the time slot
             sec (float): the timestamp in second
-            accuracy: time slots per second
+            accuracy: time slots per second, ``None`` means the accuracy of the running simulator
+                (see ``get_default_accuracy``)
         '''
-        self.accuracy = default_accuracy
+        self.accuracy = accuracy if accuracy is not None else get_default_accuracy()
         if time_slot != 0:
             self.time_slot = time_slot
         else:
@@ -61,38 +100,32 @@ class Time(object):
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot == other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot == other_time.time_slot
+        return NotImplemented
 
     def __lt__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot < other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot < other_time.time_slot
+        return NotImplemented
 
     def __le__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot <= other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot <= other_time.time_slot
+        return NotImplemented
 
     def __gt__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot > other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot > other_time.time_slot
+        return NotImplemented
 
     def __ge__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot >= other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot >= other_time.time_slot
+        return NotImplemented
 
     def __ne__(self, other: object) -> bool:
         if isinstance(other, Time):
             return self.time_slot != other.time_slot
-        other_time = Time(src=other)
-        return self.time_slot != other_time.time_slot
+        return NotImplemented
 
     def __add__(self, ts: Union["Time", float]) -> "Time":
         """
@@ -15,33 +15,92 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Union
+# cython: language_level=3
+
+from contextvars import ContextVar
+from typing import Optional, Union
+from libc.stdint cimport int64_t
 
 
 default_accuracy = 1000000  # {default_accuracy} time slots per second
 
+# the accuracy of the simulator that runs in the current thread or context, see ``use_accuracy``
+_context_accuracy: ContextVar[Optional[int]] = ContextVar("qns_accuracy", default=None)
+
+
+def set_default_accuracy(time_slots: int):
+    """
+    set the default simulation accuracy
+
+    Args:
+        time_slots (int): the time slots per second.
+    """
+    global default_accuracy
+    default_accuracy = time_slots
+
+
+def get_default_accuracy() -> int:
+    """
+    Get the accuracy for the ``Time`` objects built without an explicit accuracy. It is the accuracy of
+    the simulator in the current context (see ``use_accuracy``), or ``default_accuracy`` outside a simulator.
+
+    Returns:
+        the time slots per second
+    """
+    accuracy = _context_accuracy.get()
+    return default_accuracy if accuracy is None else accuracy
+
+
+class use_accuracy(object):
+    """
+    A context manager that binds an accuracy to the current thread or context, e.g., the simulator binds
+    its accuracy while it runs. Other threads and contexts are not affected.
+    """
+
+    def __init__(self, accuracy: Optional[int]):
+        """
+        Args:
+            accuracy (int): the time slots per second, ``None`` means ``default_accuracy``
+        """
+        self.accuracy = accuracy
+        self._token = None
+
+    def __enter__(self) -> "use_accuracy":
+        self._token = _context_accuracy.set(self.accuracy)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _context_accuracy.reset(self._token)
+
 
 cdef class Time(object):
-    cdef public int accuracy
-    cdef public int time_slot
+    cdef public int64_t accuracy
+    cdef public int64_t time_slot
 
-    def __cinit__(self, int time_slot = 0, double sec = 0.0, int accuracy = default_accuracy):
+    def __cinit__(self, int64_t time_slot = 0, sec = 0.0, accuracy = None):
         '''
         Time: the time slot used in the simulator
 
         Args:
             time_slot (int): the time slot
             sec (float): the timestamp in second
-            accuracy: time slots per second
+            accuracy: time slots per second, ``None`` means the accuracy of the running simulator
+                (see ``get_default_accuracy``)
         '''
-        self.accuracy = default_accuracy
+        self.accuracy = accuracy if accuracy is not None else get_default_accuracy()
         if time_slot != 0:
             self.time_slot = time_slot
-        elif sec != 0:
-            self.time_slot = int(sec * self.accuracy)
+        elif sec is not None and sec != 0:
+            self.time_slot = <int64_t> (<double> sec * self.accuracy)
         else:
             self.time_slot = 0
 
+    def __reduce__(self):
+        return (Time, (self.time_slot,), self.accuracy)
+
+    def __setstate__(self, int64_t accuracy):
+        self.accuracy = accuracy
+
     @property
     def sec(self) -> float:
         '''
@@ -50,23 +109,35 @@ cdef class Time(object):
         '''
         return <double> self.time_slot / self.accuracy
 
-    def __eq__(self, other: object) -> bool:
-        return self.time_slot == other.time_slot
+    def __eq__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot == (<Time> other).time_slot
 
-    def __lt__(self, other: object) -> bool:
-        return self.time_slot < other.time_slot
+    def __lt__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot < (<Time> other).time_slot
 
-    def __le__(self, other: object) -> bool:
-        return self < other or self == other
+    def __le__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot <= (<Time> other).time_slot
 
-    def __gt__(self, other: object) -> bool:
-        return not (self < other or self == other)
+    def __gt__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot > (<Time> other).time_slot
 
-    def __ge__(self, other: object) -> bool:
-        return not (self < other)
+    def __ge__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot >= (<Time> other).time_slot
 
-    def __ne__(self, other: object) -> bool:
-        return not self == other
+    def __ne__(self, object other) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.time_slot != (<Time> other).time_slot
 
     def __add__(self, ts: Union["Time", float]) -> "Time":
         """
@@ -75,11 +146,27 @@ cdef class Time(object):
         Args:
             ts (Union["Time", float]): a Time object or a float indicating time in second
         """
-        tn = Time(time_slot=self.time_slot, accuracy=self.accuracy)
+        cdef Time tn = Time(time_slot=self.time_slot, accuracy=self.accuracy)
+        if isinstance(ts, float):
+            ts = Time(sec=ts, accuracy=self.accuracy)
+        tn.time_slot += (<Time?> ts).time_slot
+        return tn
+
+    def __sub__(self, ts: Union["Time", float]) -> "Time":
+        """
+        Minus an offset to the Time object
+
+        Args:
+            ts (Union["Time", float]): a Time object or a float indicating time in second
+        """
+        cdef Time tn = Time(time_slot=self.time_slot, accuracy=self.accuracy)
         if isinstance(ts, float):
             ts = Time(sec=ts, accuracy=self.accuracy)
-        tn.time_slot += ts.time_slot
+        tn.time_slot -= (<Time?> ts).time_slot
         return tn
 
     def __repr__(self) -> str:
         return str(self.sec)
+
+    def __hash__(self) -> int:
+        return hash(self.time_slot)
@@ -27,6 +27,9 @@ logger.setLevel(logging.INFO)
 handle = logging.StreamHandler(sys.stdout)
 logger.addHandler(handle)
 
+# ``isEnabledFor`` is backed by the logger's level cache, which is cleared by ``setLevel``
+_is_enabled_for = logger.isEnabledFor
+
 
 def install(s):
     """
@@ -38,42 +41,63 @@ def install(s):
     logger._simulator = s
 
 
-def debug(msg, *args):
+def _log(level: int, msg, args) -> None:
+    if callable(msg):
+        msg = msg()
     if hasattr(logger, "_simulator"):
-        logger.debug(f"[{logger._simulator.tc}] " + msg, *args)
-    else:
-        logger.debug(msg, *args)
+        msg = f"[{logger._simulator.tc}] " + msg
+    logger.log(level, msg, *args)
+
+
+def debug(msg, *args):
+    """
+    Log a message at the DEBUG level. The message is only formatted if the level is enabled,
+    so the parameters should be passed as ``%``-style ``args`` or ``msg`` should be a callable
+    that returns the message, e.g., ``debug("%s: recv %s", node, packet)``.
+
+    Args:
+        msg (Union[str, Callable[[], str]]): the message or a callable that returns the message
+        *args: the ``%``-style parameters of the message
+    """
+    if _is_enabled_for(logging.DEBUG):
+        _log(logging.DEBUG, msg, args)
 
 
 def info(msg, *args):
-    if hasattr(logger, "_simulator"):
-        logger.info(f"[{logger._simulator.tc}] " + msg, *args)
-    else:
-        logger.info(msg, *args)
+    """
+    Log a message at the INFO level, see ``debug``
+    """
+    if _is_enabled_for(logging.INFO):
+        _log(logging.INFO, msg, args)
 
 
 def error(msg, *args):
-    if hasattr(logger, "_simulator"):
-        logger.error(f"[{logger._simulator.tc}] " + msg, *args)
-    else:
-        logger.error(msg, *args)
+    """
+    Log a message at the ERROR level, see ``debug``
+    """
+    if _is_enabled_for(logging.ERROR):
+        _log(logging.ERROR, msg, args)
 
 
 def warn(msg, *args):
-    if hasattr(logger, "_simulator"):
-        logger.warn(f"[{logger._simulator.tc}] " + msg, *args)
-    else:
-        logger.warn(msg, *args)
+    """
+    Log a message at the WARNING level, see ``debug``
+    """
+    if _is_enabled_for(logging.WARNING):
+        _log(logging.WARNING, msg, args)
 
 
 def critical(msg, *args):
-    if hasattr(logger, "_simulator"):
-        logger.critical(f"[{logger._simulator.tc}] " + msg, *args)
-    else:
-        logger.critical(msg, *args)
+    """
+    Log a message at the CRITICAL level, see ``debug``
+    """
+    if _is_enabled_for(logging.CRITICAL):
+        _log(logging.CRITICAL, msg, args)
 
 
 def monitor(*args, sep: str = ",", with_time: bool = False):
+    if not _is_enabled_for(logging.INFO):
+        return
     attrs = list(args)
     if with_time:
         attrs.insert(0, logger._simulator.tc)
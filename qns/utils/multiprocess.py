@@ -19,10 +19,14 @@ import itertools
 import multiprocessing
 from typing import Optional, Dict
 import pandas as pd
+from qns.simulator.checkpoint import Checkpoint
 from qns.utils.log import logger as log
 
 import signal
 
+# the warm-up checkpoints of the running ``MPSimulations``, inherited by the forked workers
+_forked_checkpoints: Dict[int, Checkpoint] = {}
+
 
 class MPSimulations():
     """
@@ -50,6 +54,8 @@ class MPSimulations():
         self.data = pd.DataFrame()
         self.aggregated_data = pd.DataFrame()
 
+        self.checkpoint: Optional[Checkpoint] = None
+
         self._setting_list = []
         self._current_simulation_count = 0
         self._total_simulation_count = 0
@@ -68,13 +74,40 @@ class MPSimulations():
         raise NotImplementedError
         return {}
 
-    def _single_run(self, setting: Dict = {}):
+    def warmup(self, setting: Dict = {}) -> Optional[Checkpoint]:
+        """
+        This function can be overwited by users to build the warm-up state shared by the repeated experiments
+        of a setting, e.g. building the topology and the routes and filling the memories.
+        It runs once for each setting in the main process, and the returned checkpoint is available
+        as ``self.checkpoint`` in ``run``, where ``self.checkpoint.restore()`` produces a private copy.
+        Call ``set_seed`` after restoring to let the repeated experiments diverge.
+
+        Args:
+            setting (Dict): the simulation setting without the ``_repeat`` and ``_id`` keys
+        Returns:
+            the checkpoint from ``Simulator.checkpoint``, or ``None`` to skip the warm-up
+        """
+        return None
+
+    def _warmup_all(self) -> Dict[int, Checkpoint]:
+        checkpoints: Dict[int, Optional[Checkpoint]] = {}
+        for setting in self._setting_list:
+            group = setting["_group"]
+            if group in checkpoints:
+                continue
+            shared_setting = {k: v for k, v in setting.items() if k not in ["_repeat", "_id"]}
+            checkpoints[group] = self.warmup(setting=shared_setting)
+        # the groups without a warm-up run from the beginning
+        return {group: cp for group, cp in checkpoints.items() if cp is not None}
+
+    def _single_run(self, setting: Dict = {}, checkpoint: Optional[Checkpoint] = None):
+        self.checkpoint = checkpoint if checkpoint is not None else _forked_checkpoints.get(setting["_group"])
         raw = {}
-        log.info(f"start simulation [{setting['_id']+1}/{self._total_simulation_count}] {setting}")
+        log.info("start simulation [%s/%s] %s", setting['_id']+1, self._total_simulation_count, setting)
         result = self.run(setting=setting)
         raw.update(setting)
         raw.update(result)
-        log.info(f"finish simulation [{setting['_id']+1}/{self._total_simulation_count}] {result}")
+        log.info("finish simulation [%s/%s] %s", setting['_id']+1, self._total_simulation_count, result)
         return raw
 
     def _init_worker(self):
@@ -85,17 +118,26 @@ class MPSimulations():
         Start the multiple process simulation
         """
         self.prepare_setting()
+        checkpoints = self._warmup_all()
+
+        # forked workers inherit the checkpoints in memory, otherwise they are sent along with every task
+        forked = multiprocessing.get_start_method() == "fork"
+        _forked_checkpoints.clear()
+        if forked:
+            _forked_checkpoints.update(checkpoints)
         pool = multiprocessing.Pool(processes=self.cores, initializer=self._init_worker)
         try:
             result = []
             for setting in self._setting_list:
-                result.append(pool.apply_async(self._single_run, (setting,)))
+                checkpoint = None if forked else checkpoints.get(setting["_group"])
+                result.append(pool.apply_async(self._single_run, (setting, checkpoint)))
             pool.close()
             pool.join()
         except KeyboardInterrupt:
             print("terminating simulation")
             pool.terminate()
             pool.join()
+        _forked_checkpoints.clear()
 
         for r in result:
             try:
@@ -16,10 +16,155 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import random
-from typing import Optional
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Union
 import numpy as np
 
 
+class BufferedGenerator(object):
+    """
+    A random generator that draws blocks of numbers from a ``numpy.random.Generator`` and hands them
+    out one by one. Drawing a block is much cheaper than calling the scalar ``np.random`` functions
+    for every packet, delay or measurement. The uniform and the standard normal numbers are kept in
+    separate buffers. With the same seed and the same sequence of calls, the output is identical.
+    """
+
+    def __init__(self, seed: Union[int, np.random.SeedSequence, None] = None, block_size: int = 4096):
+        """
+        Args:
+            seed (Union[int, SeedSequence]): the seed, ``None`` means a random seed from the OS
+            block_size (int): the number of random numbers in a block
+        """
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed: Union[int, np.random.SeedSequence, None] = None):
+        """
+        Reset the generator with a seed and drop the buffered numbers
+
+        Args:
+            seed (Union[int, SeedSequence]): the seed
+        """
+        self.generator = np.random.default_rng(seed)
+        self._uniform: Iterator[float] = iter(())
+        self._normal: Iterator[float] = iter(())
+
+    def random(self) -> float:
+        """
+        Returns:
+            a random number from [0, 1)
+        """
+        for x in self._uniform:
+            return x
+        self._uniform = iter(self.generator.random(self.block_size).tolist())
+        return next(self._uniform)
+
+    def standard_normal(self) -> float:
+        """
+        Returns:
+            a random number from the standard normal distribution
+        """
+        for x in self._normal:
+            return x
+        self._normal = iter(self.generator.standard_normal(self.block_size).tolist())
+        return next(self._normal)
+
+    def get_state(self):
+        """
+        Returns:
+            the state of the generator and the unused buffered numbers
+        """
+        uniform, normal = list(self._uniform), list(self._normal)
+        self._uniform, self._normal = iter(uniform), iter(normal)
+        return self.generator.bit_generator.state, uniform, normal
+
+    def set_state(self, state):
+        """
+        Recover the generator to a state from ``get_state``
+
+        Args:
+            state: the state of the generator
+        """
+        self.generator.bit_generator.state = state[0]
+        self._uniform, self._normal = iter(list(state[1])), iter(list(state[2]))
+
+
+_default_generator = BufferedGenerator()
+# the generator behind the helper functions in the current thread or context, see ``use_generator``
+_context_generator: ContextVar[BufferedGenerator] = ContextVar("qns_generator", default=_default_generator)
+_root_seed: Optional[int] = None
+_epoch = 0  # increased by every ``set_seed``, so that the entities renew their generators
+_key_counts: Dict[str, int] = {}  # the number of keys from ``unique_key`` for every prefix since the last ``set_seed``
+
+
+class use_generator(object):
+    """
+    A context manager that lets ``get_rand``, ``get_randint``, ``get_choice`` and ``get_normal``
+    draw from another generator in the current thread or context, e.g., for a whole run::
+
+        with use_generator(BufferedGenerator(seed)):
+            s.run()
+
+    Other threads and contexts are not affected. It should wrap a run rather than every event, the entities
+    and applications draw their own random numbers from ``rng`` directly.
+    """
+
+    def __init__(self, generator: BufferedGenerator):
+        """
+        Args:
+            generator (BufferedGenerator): the generator to use in the context
+        """
+        self.generator = generator
+        self._token = None
+
+    def __enter__(self) -> BufferedGenerator:
+        self._token = _context_generator.set(self.generator)
+        return self.generator
+
+    def __exit__(self, *exc) -> None:
+        _context_generator.reset(self._token)
+
+
+def derive_generator(name: str) -> BufferedGenerator:
+    """
+    Derive an independent generator from the root seed of ``set_seed`` and a name.
+    The same root seed and name always give the same stream, no matter in which order
+    the events happen or in which process the entity runs.
+
+    Args:
+        name (str): the unique name of the entity, e.g., the name of a channel
+    Returns:
+        the generator
+    """
+    seq = np.random.SeedSequence(_root_seed, spawn_key=tuple(name.encode()))
+    return BufferedGenerator(seq, block_size=256)
+
+
+def unique_key(prefix: str) -> str:
+    """
+    Build a unique key for ``derive_generator``, e.g., for an unnamed entity. It is the prefix and the number
+    of keys with the same prefix built since the last ``set_seed``, so that the same construction order after
+    ``set_seed`` gives the same keys.
+
+    Args:
+        prefix (str): the prefix, e.g., the class name
+    Returns:
+        the key
+    """
+    count = _key_counts.get(prefix, 0)
+    _key_counts[prefix] = count + 1
+    return f"{prefix}#{count}"
+
+
+def generator_epoch() -> int:
+    """
+    Returns:
+        the number of ``set_seed`` calls, the generators from ``derive_generator`` should be renewed
+        when it changes
+    """
+    return _epoch
+
+
 def set_seed(seed: Optional[int] = None):
     """
     Set a seed for random generator
@@ -27,59 +172,120 @@ def set_seed(seed: Optional[int] = None):
     Args:
         seed (int): the seed
     """
+    global _root_seed, _epoch
     if seed is None:
         return
     random.seed(seed)
     np.random.seed(seed)
+    _default_generator.seed(seed)
+    _root_seed = seed
+    _epoch += 1
+    _key_counts.clear()
+
 
+def get_generator() -> np.random.Generator:
+    """
+    Get the ``numpy.random.Generator`` behind ``get_rand``, ``get_randint`` and ``get_normal``
+    in the current thread or context, i.e., the generator from ``use_generator``, or the default one
+    seeded by ``set_seed``. It can be used to draw large arrays at once.
 
-def get_rand(low: float = 0, high: float = 1) -> float:
+    Returns:
+        the generator
+    """
+    return _context_generator.get().generator
+
+
+def get_state():
+    """
+    Get the state of the random generators, so that it can be recovered by ``set_state``
+
+    Returns:
+        the state of the random generators
+    """
+    return random.getstate(), np.random.get_state(), _default_generator.get_state(), _root_seed, _epoch
+
+
+def set_state(state):
+    """
+    Recover the random generators to a state from ``get_state``
+
+    Args:
+        state: the state of the random generators
+    """
+    global _root_seed, _epoch
+    random.setstate(state[0])
+    np.random.set_state(state[1])
+    _default_generator.set_state(state[2])
+    _root_seed, _epoch = state[3], state[4]
+
+
+def get_rand(low: float = 0, high: float = 1, rng: Optional[BufferedGenerator] = None) -> float:
     """
     Get a random number from [low, high)
 
     Args:
         low (int): the low bound
         high (int): the high bound
+        rng (BufferedGenerator): the generator to draw from, e.g., ``entity.rng``. ``None`` means the current
+            generator (see ``use_generator``)
     """
-    return low + np.random.random() * (high - low)
+    if rng is None:
+        rng = _context_generator.get()
+    return low + rng.random() * (high - low)
 
 
-def get_randint(low: int, high: int) -> float:
+def get_randint(low: int, high: int, rng: Optional[BufferedGenerator] = None) -> int:
     """
     Get a random integer from [low, high]
 
     Args:
         low (int): the low bound
         high (int): the high bound
+        rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
     """
     if low != int(low):
         raise ValueError("input low")
     if low > high:
         raise ValueError("low should smaller than high")
-    return np.random.randint(low, high+1)
+    if rng is None:
+        rng = _context_generator.get()
+    return int(low) + int(rng.random() * (high - low + 1))
 
 
-def get_choice(a):
+def get_choice(a, rng: Optional[BufferedGenerator] = None):
     """
     return an random element from a list
 
     Args:
         a: a iterable object
+        rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
     """
-    return a[get_randint(0, len(a)-1)]
+    return a[get_randint(0, len(a)-1, rng=rng)]
 
 
 def get_weighted_choice(a, weights, k=1):
     """
-    return k random element from a list with weights
+    return k random element from a list with weights (with replacement)
 
     Args:
         a: a iterable object
         weights: a list of weights
         k: the number of random sample elements
     """
-    return random.choices(a, weights=weights, k=k)
+    p = np.asarray(weights, dtype=float)
+    idxs = _context_generator.get().generator.choice(len(a), size=k, p=p / p.sum())
+    return [a[i] for i in idxs.tolist()]
 
 
-def get_normal(mean: float = 0, std: float = 1):
-    return np.random.normal(loc=mean, scale=std)
+def get_normal(mean: float = 0, std: float = 1, rng: Optional[BufferedGenerator] = None):
+    """
+    Get a random number from the normal distribution N(mean, std^2)
+
+    Args:
+        mean (float): the mean
+        std (float): the standard deviation
+        rng (BufferedGenerator): the generator to draw from, ``None`` means the current generator
+    """
+    if rng is None:
+        rng = _context_generator.get()
+    return mean + std * rng.standard_normal()
@@ -0,0 +1,63 @@
+from qns.entity.node.app import Application
+from qns.entity.node.node import QNode
+from qns.simulator.event import Event
+from qns.simulator.simulator import Simulator
+
+
+class BaseEvent(Event):
+    def __init__(self, t, node, by=None):
+        super().__init__(t=t, by=by)
+        self.node = node
+
+    def invoke(self) -> None:
+        self.node.handle(self)
+
+
+class SubEvent(BaseEvent):
+    pass
+
+
+class OtherEvent(BaseEvent):
+    pass
+
+
+class DispatchApp(Application):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def install(self, node, simulator: Simulator):
+        super().install(node, simulator)
+        for i, cls in enumerate([BaseEvent, SubEvent, OtherEvent, SubEvent]):
+            simulator.add_event(cls(t=i, node=node, by=self if i < 3 else None))
+
+
+def test_app_dispatch():
+    n1 = QNode("n1")
+    app = DispatchApp()
+    app.add_handler(lambda node, e: app.records.append(("base", e.__class__.__name__)), [BaseEvent])
+    app.add_handler(lambda node, e: app.records.append(("sub", e.__class__.__name__)), [SubEvent], [app])
+    app.add_handler(lambda node, e: app.records.append(("all", e.__class__.__name__)) or True)
+    app.add_handler(lambda node, e: app.records.append(("never", e.__class__.__name__)))
+    n1.add_apps(app)
+
+    s = Simulator(0, 10, 1000)
+    n1.install(s)
+    s.run()
+    assert app.records == [("base", "BaseEvent"), ("all", "BaseEvent"),
+                           ("base", "SubEvent"), ("sub", "SubEvent"), ("all", "SubEvent"),
+                           ("base", "OtherEvent"), ("all", "OtherEvent"),
+                           ("base", "SubEvent"), ("all", "SubEvent")]
+
+
+def test_app_dispatch_cache():
+    n1 = QNode("n1")
+    app = Application()
+    records = []
+    app.add_handler(lambda node, e: records.append("base"), [BaseEvent])
+    app.handle(n1, SubEvent(t=0, node=n1))
+    # adding a handler invalidates the cached dispatch table
+    app.add_handler(lambda node, e: records.append("sub"), [SubEvent])
+    app.handle(n1, SubEvent(t=0, node=n1))
+    app.handle(n1, OtherEvent(t=0, node=n1))
+    assert records == ["base", "base", "sub", "base"]
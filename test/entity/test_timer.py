@@ -11,3 +11,40 @@ def test_timer():
     t1 = Timer("t1", 0, 10, 0.5, trigger_func)
     t1.install(s)
     s.run()
+
+
+def test_timer_recurring():
+    s = Simulator(0, 10, 1000)
+    trigger_times = []
+    pending = []
+
+    def trigger_func():
+        trigger_times.append(s.tc.sec)
+        pending.append(s.event_pool.live)
+
+    t1 = Timer("t1", 0, 10, 0.5, trigger_func)
+    t1.install(s)
+    t2 = Timer("t2", 3, trigger_func=lambda: trigger_times.append(-s.tc.sec))
+    t2.install(s)
+    s.run()
+    assert trigger_times == [0.5 * i for i in range(6)] + [-3.0] + [0.5 * i for i in range(6, 21)]
+    # only one pending event for each timer
+    assert max(pending) <= 1
+
+
+def test_timer_start_before_simulator():
+    s = Simulator(5, 10, 1000)
+    trigger_times = []
+    t1 = Timer("t1", 0, 10, 0.5, lambda: trigger_times.append(s.tc.sec))
+    t1.install(s)
+    s.run()
+    assert trigger_times == [5.0 + 0.5 * i for i in range(11)]
+
+    # a timer installed on a resumed simulator
+    s = Simulator(0, 10, 1000)
+    s.run_until(4)
+    trigger_times = []
+    t2 = Timer("t2", 1, 10, 2, lambda: trigger_times.append(s.tc.sec))
+    t2.install(s)
+    s.run()
+    assert trigger_times == [5.0, 7.0, 9.0]
@@ -18,3 +18,20 @@ def test_werner_state():
         print("distillation failed")
         return
     print(e7.fidelity)
+
+
+def test_werner_state_slots():
+    from qns.network.protocol.entanglement_distribution import DistributedEntanglement
+    e = WernerStateEntanglement(fidelity=0.9, name="e")
+    assert not hasattr(e, "__dict__")
+    try:
+        e.src = "n1"
+        assert False
+    except AttributeError:
+        pass
+
+    # protocol-specific fields are declared in a subclass
+    d = DistributedEntanglement(fidelity=0.9, name="d", transmit_id="t1")
+    assert not hasattr(d, "__dict__")
+    assert d.transmit_id == "t1" and d.src is None
+    assert abs(d.swapping(e).fidelity - WernerStateEntanglement(0.9).swapping(WernerStateEntanglement(0.9)).fidelity) < 1e-9
@@ -1,4 +1,5 @@
-from qns.models.qubit.qubit import Qubit
+from qns.models.qubit.qubit import Qubit, QState
+from qns.models.qubit.utils import joint
 from qns.models.qubit.gate import H, CNOT, RX, RY, U, CZ, CR, Swap, Toffoli
 from qns.models.qubit.const import QUBIT_STATE_0, QUBIT_STATE_1, OPERATOR_RX, OPERATOR_RY
 import numpy as np
@@ -86,3 +87,152 @@ def test_state():
     from qns.models.qubit.const import QUBIT_STATE_N
     q0 = Qubit(state=QUBIT_STATE_N, name='q0')
     q0.state.state()
+
+
+def test_gate_contraction():
+    from qns.models.qubit.gate import CY, S, X
+    from qns.models.qubit.utils import kron, joint
+    from qns.models.qubit.const import OPERATOR_HADAMARD, OPERATOR_PAULI_I, OPERATOR_PAULI_Y, OPERATOR_S
+
+    rng = np.random.default_rng(1)
+    qubits = [Qubit(name=f"q{i}") for i in range(4)]
+    for q in qubits:
+        U(q, np.linalg.qr(rng.normal(size=(2, 2)) + 1j * rng.normal(size=(2, 2)))[0])
+    for a, b in zip(qubits, qubits[1:]):
+        joint(a, b)
+    state = qubits[0].state
+    rho = state.rho
+
+    def expand(ops):
+        full = np.array([[1]])
+        for op in ops:
+            full = kron(full, op)
+        return full
+
+    def project(bit):
+        return np.diag([1 - bit, bit])
+
+    # H on q2, S on q0, then CY controlled by q3 on q1, and Toffoli on (q2, q0, q1)
+    H(qubits[2])
+    S(qubits[0])
+    CY(qubits[3], qubits[1])
+    Toffoli(qubits[2], qubits[0], qubits[1])
+
+    I2 = OPERATOR_PAULI_I
+    ops = [expand([I2, I2, OPERATOR_HADAMARD, I2]), expand([OPERATOR_S, I2, I2, I2]),
+           expand([I2, I2, I2, project(0)]) + expand([I2, OPERATOR_PAULI_Y, I2, project(1)])]
+    toffoli = sum(expand([project(a), X._operator if a and c else I2, project(c), I2]) for a in [0, 1] for c in [0, 1])
+    for op in [*ops, toffoli]:
+        rho = op @ rho @ op.T.conjugate()
+    assert np.allclose(state.rho, rho)
+
+
+def test_statevector_mode():
+    from qns.models.qubit.gate import S, X, Y, Z, I
+    from qns.models.qubit.const import QUBIT_STATE_0
+
+    def circuit(pure):
+        if pure:
+            qubits = [Qubit(state=QUBIT_STATE_0, name=f"q{i}") for i in range(4)]
+        else:
+            qubits = [Qubit(rho=np.dot(QUBIT_STATE_0, QUBIT_STATE_0.T), name=f"q{i}") for i in range(4)]
+        H(qubits[0])
+        for a, b in zip(qubits, qubits[1:]):
+            CNOT(a, b)
+        S(qubits[2])
+        RY(qubits[1], theta=0.3)
+        Toffoli(qubits[3], qubits[0], qubits[2])
+        return qubits
+
+    pure, mixed = circuit(True), circuit(False)
+    assert pure[0].state.vector is not None and mixed[0].state.vector is None
+    assert pure[0].state.is_pure_state()
+    assert np.allclose(pure[0].state.rho, mixed[0].state.rho)
+
+    # measurements keep the statevector mode and collapse the same way as the density matrix mode
+    from qns.utils.rnd import set_seed
+    set_seed(5)
+    results_pure = [q.measureX() if i % 2 else q.measure() for i, q in enumerate(pure[:2])]
+    set_seed(5)
+    results_mixed = [q.measureX() if i % 2 else q.measure() for i, q in enumerate(mixed[:2])]
+    assert results_pure == results_mixed
+    assert pure[2].state.vector is not None and pure[2].state.num == mixed[2].state.num
+    assert np.allclose(pure[2].state.rho, mixed[2].state.rho)
+
+    # a stochastic operation promotes the state to the density matrix mode
+    pure[2].stochastic_operate([I, X, Y, Z], [0.7, 0.1, 0.1, 0.1])
+    mixed[2].stochastic_operate([I, X, Y, Z], [0.7, 0.1, 0.1, 0.1])
+    assert pure[2].state.vector is None and not pure[2].state.is_pure_state()
+    assert np.allclose(pure[2].state.rho, mixed[2].state.rho)
+
+    # a 12-qubit GHZ state only needs a vector of 4096 entries
+    qubits = [Qubit(state=QUBIT_STATE_0, name=f"g{i}") for i in range(12)]
+    H(qubits[0])
+    for a, b in zip(qubits, qubits[1:]):
+        CNOT(a, b)
+    assert qubits[0].state.vector.shape == (4096, 1)
+    c = [q.measure() for q in qubits]
+    assert len(set(c)) == 1
+
+
+def test_factorize():
+    from qns.models.qubit import StabilizerState
+    from qns.models.qubit.const import QUBIT_STATE_0
+
+    for state_cls in [QState, StabilizerState]:
+        # entanglement swapping: the measured qubits and the swapped pair are split
+        q = [Qubit(state=QUBIT_STATE_0, name=f"q{i}", state_cls=state_cls) for i in range(4)]
+        H(q[0])
+        CNOT(q[0], q[1])
+        H(q[2])
+        CNOT(q[2], q[3])
+        CNOT(q[1], q[2])
+        H(q[1])
+        q[1].measure()
+        q[2].measure()
+        assert q[0].state is q[3].state and q[0].state.qubits == [q[0], q[3]]
+
+        # the old qubit is split after Swap
+        a, b, c = [Qubit(state=QUBIT_STATE_0, name=name, state_cls=state_cls) for name in "abc"]
+        H(a)
+        CNOT(a, b)
+        Swap(b, c)
+        assert a.state.qubits == [a, c] and b.state.qubits == [b]
+
+    # an explicit factorization of a density matrix
+    a, b, c = [Qubit(rho=np.dot(QUBIT_STATE_0, QUBIT_STATE_0.T), name=name) for name in "abc"]
+    H(a)
+    CNOT(a, c)
+    joint(a, b)
+    rho = a.state.rho
+    factors = a.state.factorize()
+    assert [f.qubits for f in factors] == [[a, c], [b]]
+    assert b.state is factors[1] and a.state is c.state is factors[0]
+    assert np.allclose(np.kron(factors[0].rho, factors[1].rho), rho)
+
+    # the automatic factorization only checks single qubits, in O(2^n) for every qubit
+    qubits = [Qubit(state=QUBIT_STATE_0, name=f"g{i}") for i in range(18)]
+    H(qubits[0])
+    for a, b in zip(qubits, qubits[1:]):
+        CNOT(a, b)
+    qubits[0].measure()
+    assert all(q.state.qubits == [q] for q in qubits)
+
+    # the density matrix mode is split by the purity of the single qubits
+    qubits = [Qubit(rho=np.dot(QUBIT_STATE_0, QUBIT_STATE_0.T), name=f"d{i}") for i in range(5)]
+    H(qubits[0])
+    for a, b in zip(qubits, qubits[1:]):
+        CNOT(a, b)
+    assert qubits[0].state.vector is None
+    qubits[0].measure()
+    assert all(q.state.qubits == [q] for q in qubits)
+    assert len({q.measure() for q in qubits[1:]}) == 1
+
+    a, b, c = [Qubit(rho=np.dot(QUBIT_STATE_0, QUBIT_STATE_0.T), name=name) for name in "abc"]
+    H(a)
+    CNOT(a, b)
+    rho = a.state.rho
+    Swap(b, c)
+    assert a.state.qubits == [a, c] and b.state.qubits == [b]
+    assert a.state.vector is None and np.allclose(a.state.rho, rho)
+    assert np.allclose(b.state.rho, np.dot(QUBIT_STATE_0, QUBIT_STATE_0.T))
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from qns.models.epr import BellStateEntanglement
+from qns.models.qubit import Qubit, QubitFactory, StabilizerState, H, S, X, Y, Z, T, U, CNOT, CY, CZ, Swap
+from qns.models.qubit.const import OPERATOR_PAULI_I, QUBIT_STATE_R
+from qns.models.qubit.decoherence import DepolarStorageErrorModel
+from qns.models.qubit.errors import OperatorNotCliffordError
+from qns.utils.rnd import set_seed
+
+
+def test_stabilizer_gates():
+    set_seed(1)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        n = rng.integers(2, 6)
+        qs = [Qubit(name=str(i), state_cls=StabilizerState) for i in range(n)]
+        qd = [Qubit(name=str(i)) for i in range(n)]
+        for i in range(1, n):
+            CNOT(qs[0], qs[i])
+            CNOT(qs[0], qs[i])
+            CNOT(qd[0], qd[i])
+            CNOT(qd[0], qd[i])
+        for _ in range(20):
+            if rng.random() < 0.4:
+                a, b = rng.choice(n, 2, replace=False)
+                gate = [CNOT, CY, CZ, Swap][rng.integers(4)]
+                gate(qs[a], qs[b])
+                gate(qd[a], qd[b])
+            else:
+                a = rng.integers(n)
+                gate = [H, S, X, Y, Z][rng.integers(5)]
+                gate(qs[a])
+                gate(qd[a])
+        assert [q.name for q in qs[0].state.qubits] == [q.name for q in qd[0].state.qubits]
+        assert np.allclose(qs[0].state.rho, qd[0].state.rho)
+
+
+def test_stabilizer_measure():
+    set_seed(1)
+    n = 300
+    qs = [Qubit(state_cls=StabilizerState) for _ in range(n)]
+    H(qs[0])
+    for q in qs[1:]:
+        CNOT(qs[0], q)
+    assert qs[0].state.num == n
+    assert len({q.measure() for q in qs}) == 1
+    assert all(q.state.num == 1 for q in qs)
+
+    q0, q1 = Qubit(state_cls=StabilizerState), Qubit(state_cls=StabilizerState)
+    H(q0)
+    CNOT(q0, q1)
+    assert q0.measureX() == q1.measureX()
+
+
+def test_stabilizer_teleportation():
+    set_seed(1)
+    for _ in range(10):
+        q = Qubit(state_cls=StabilizerState)
+        H(q)
+        S(q)
+        q2 = BellStateEntanglement().teleportion(q)
+        assert isinstance(q2.state, StabilizerState) and q2.state.num == 1
+        assert np.allclose(q2.state.rho, np.dot(QUBIT_STATE_R, QUBIT_STATE_R.T.conjugate()))
+
+
+def test_stabilizer_error_and_fallback():
+    set_seed(1)
+    factory = QubitFactory(store_error_model=DepolarStorageErrorModel, state_cls=StabilizerState)
+    flips = 0
+    for _ in range(1000):
+        q = factory()
+        q.store_error_model(t=1, decoherence_rate=np.log(4 / 3))  # p = 1/4, X or Y flips with 1/2
+        assert isinstance(q.state, StabilizerState)
+        flips += q.measure()
+    assert 400 < flips < 600
+
+    q = Qubit(state_cls=StabilizerState)
+    U(q, 1j * OPERATOR_PAULI_I)
+    with pytest.raises(OperatorNotCliffordError):
+        T(q)
+
+    class FallbackStabilizerState(StabilizerState):
+        fallback = True
+
+    q = Qubit(state_cls=FallbackStabilizerState)
+    H(q)
+    T(q)
+    assert not isinstance(q.state, StabilizerState)
+    assert np.allclose(np.abs(q.state.vector.ravel()), [np.sqrt(0.5)] * 2)
@@ -20,3 +20,40 @@ def test_stochastic_operate2():
 
     q0 = Qubit(state=QUBIT_STATE_0, name="q0")
     q0.stochastic_operate([I, X, Y, Z], [0.7, 0.1, 0.1, 0.1])
+
+
+def test_pauli_channel():
+    import numpy as np
+    from qns.models.qubit import RY
+    from qns.models.qubit.decoherence import DephaseError, DepolarError, PauliError, DepolarStorageErrorModel
+
+    def circuit():
+        qubits = [Qubit(state=QUBIT_STATE_0, name=f"q{i}") for i in range(4)]
+        H(qubits[0])
+        for i, q in enumerate(qubits[1:]):
+            CNOT(qubits[0], q)
+            RY(q, theta=0.3 * i)
+        return qubits
+
+    # the cached channels are the same as the stochastic operations
+    a, b = circuit(), circuit()
+    DephaseError(a[1], 0.2)
+    DepolarError(a[2], 0.4)
+    b[1].stochastic_operate([I, Z], [0.8, 0.2])
+    b[2].stochastic_operate([X, Y, Z], [1 / 3, 1 / 3, 1 / 3])
+    assert np.allclose(a[0].state.rho, b[0].state.rho)
+
+    # many qubits of one state in one contraction
+    a, b = circuit(), circuit()
+    PauliError(a[1:], "depolar", 0.05)
+    for q in b[1:]:
+        DepolarError(q, 0.05)
+    assert np.allclose(a[0].state.rho, b[0].state.rho)
+
+    # the generated error models build the same channels for any time
+    a, b = circuit(), circuit()
+    for q in a:
+        DepolarStorageErrorModel(q, t=1.7, decoherence_rate=0.1)
+    for q in b:
+        DepolarError(q, 1 - np.exp(-0.17))
+    assert np.allclose(a[0].state.rho, b[0].state.rho)
@@ -0,0 +1,116 @@
+from qns.entity.cchannel.cchannel import ClassicPacket, RecvClassicPacket
+from qns.entity.node.app import Application
+from qns.entity.node.node import QNode
+from qns.models.delay.normaldelay import NormalDelayModel
+from qns.network.network import QuantumNetwork
+from qns.network.parallel import ParallelSimulation, bfs_partition
+from qns.network.protocol.classicforward import ClassicPacketForwardApp
+from qns.network.route.dijkstra import DijkstraRouteAlgorithm
+from qns.network.topology.linetopo import LineTopology
+from qns.network.topology.topo import ClassicTopology
+from qns.simulator.event import func_to_event
+from qns.simulator.simulator import Simulator
+from qns.utils.rnd import set_seed
+
+
+class PingApp(Application):
+    def __init__(self, dest: str, send_rate: int = 4):
+        super().__init__()
+        self.dest = dest
+        self.send_rate = send_rate
+        self.count = 0
+        self.recv = []
+        self.add_handler(self.handle_packet, [RecvClassicPacket], [])
+
+    def install(self, node: QNode, simulator: Simulator):
+        super().install(node, simulator)
+        if self.dest is not None:
+            simulator.add_event(func_to_event(simulator.ts, self.send, by=self))
+
+    def send(self):
+        dest = self.get_node().network.get_node(self.dest)
+        self.send_packet(ClassicPacket(msg={"seq": self.count, "from": self.get_node().name}, src=self.get_node(), dest=dest))
+        self.count += 1
+        t = self._simulator.tc_slot + self._simulator.time_slot(1 / self.send_rate)
+        self._simulator.add_event(func_to_event(t, self.send, by=self))
+
+    def send_packet(self, packet: ClassicPacket):
+        route = self.get_node().network.route
+        next_hop = route.query(self.get_node(), packet.dest)[0][1]
+        self.get_node().get_cchannel(next_hop).send(packet, next_hop=next_hop)
+
+    def handle_packet(self, node: QNode, event: RecvClassicPacket):
+        msg = event.packet.get()
+        self.recv.append((self._simulator.tc_slot, msg["from"], msg["seq"]))
+        if msg["from"] != node.name and event.packet.dest == node and "echo" not in msg:
+            # echo back to the sender
+            echo = {"seq": msg["seq"], "from": node.name, "echo": True}
+            self.send_packet(ClassicPacket(msg=echo, src=node, dest=event.packet.src))
+
+
+def build(s: Simulator, cchannel_delay=0.05) -> QuantumNetwork:
+    topo = LineTopology(nodes_number=6, qchannel_args={"delay": 0.1}, cchannel_args={"delay": cchannel_delay})
+    net = QuantumNetwork(topo=topo, classic_topo=ClassicTopology.Follow, route=DijkstraRouteAlgorithm())
+    net.build_route()
+    for n in net.nodes:
+        n.add_apps(ClassicPacketForwardApp(net.route))
+        n.add_apps(PingApp(dest={"n1": "n6", "n6": "n2"}.get(n.name)))
+    return net
+
+
+def collect(s: Simulator, net: QuantumNetwork, nodes):
+    return {n.name: n.apps[1].recv for n in nodes}
+
+
+def test_bfs_partition():
+    net = build(Simulator(0, 1, 1000))
+    assert bfs_partition(net, 3) == [0, 0, 1, 1, 2, 2]
+
+
+def test_parallel_simulation():
+    s = Simulator(0, 5, 1000000)
+    net = build(s)
+    net.install(s)
+    s.run()
+    expected = collect(s, net, net.nodes)
+    assert len(expected["n6"]) > 0 and len(expected["n2"]) > 0
+
+    for workers in [1, 2, 3]:
+        ps = ParallelSimulation(build, workers=workers, start_second=0, end_second=5, accuracy=1000000,
+                                collect=collect, seed=1)
+        results = ps.run()
+        merged = {}
+        for r in results:
+            merged.update(r)
+        assert merged == expected
+        if workers > 1:
+            assert ps.lookahead == 50000
+            assert ps.messages > 0
+
+
+def build_normal(s: Simulator) -> QuantumNetwork:
+    return build(s, cchannel_delay=NormalDelayModel(mean_delay=0.05, std=0.01))
+
+
+def test_parallel_simulation_normal_delay():
+    assert abs(NormalDelayModel(mean_delay=0.05, std=0.01).min_delay() - 0.02) < 1e-12
+    assert NormalDelayModel(mean_delay=0.01, std=0.01).min_delay() == 0
+
+    set_seed(1)
+    s = Simulator(0, 5, 1000000)
+    net = build_normal(s)
+    net.install(s)
+    s.run()
+    expected = collect(s, net, net.nodes)
+    assert len(expected["n6"]) > 0 and len(expected["n2"]) > 0
+
+    ps = ParallelSimulation(build_normal, workers=2, start_second=0, end_second=5, accuracy=1000000,
+                            collect=collect, seed=1)
+    merged = {}
+    for r in ps.run():
+        merged.update(r)
+    assert ps.lookahead == 20000 and ps.messages > 0
+    # the copies of a channel across partitions draw their delays in their own workers, so only the
+    # delivered packets are compared
+    assert {name: sorted((m, seq) for _, m, seq in recv) for name, recv in merged.items()} == \
+        {name: sorted((m, seq) for _, m, seq in recv) for name, recv in expected.items()}
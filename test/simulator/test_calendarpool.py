@@ -0,0 +1,43 @@
+import random
+
+from qns.simulator import Simulator, CalendarEventPool
+from qns.simulator.event import Event, func_to_event
+
+
+class RecordEvent(Event):
+    def __init__(self, t=None, record=None):
+        super().__init__(t=t)
+        self.record = record
+
+    def invoke(self) -> None:
+        self.record.append(self.time_slot)
+
+
+def test_calendar_pool_order():
+    random.seed(1)
+    s = Simulator(0, 10, 1000, pool_cls=CalendarEventPool)
+    result = []
+
+    def schedule():
+        result.append(s.tc_slot)
+        if s.tc_slot < 9000:
+            s.add_event(func_to_event(s.tc_slot + random.randint(0, 20), schedule))
+
+    for i in range(200):
+        s.add_event(func_to_event(random.randint(0, 5000), schedule))
+    s.run()
+    assert len(result) > 200
+    assert result == sorted(result)
+
+
+def test_calendar_pool_bounds():
+    s = Simulator(1, 10, 1000, pool_cls=CalendarEventPool, pool_kwargs={"nbuckets": 8, "width": 10})
+    result = []
+    s.add_event(RecordEvent(t=s.time(sec=0.5), record=result))
+    s.add_event(RecordEvent(t=s.time(sec=11), record=result))
+    for t in [5, 2, 2, 8, 10]:
+        s.add_event(RecordEvent(t=s.time(sec=t), record=result))
+    assert s.total_events == 5
+    s.run()
+    assert result == [2000, 2000, 5000, 8000, 10000]
+    assert s.tc == s.te
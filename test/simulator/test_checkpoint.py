@@ -0,0 +1,106 @@
+import os
+from qns.network.route.dijkstra import DijkstraRouteAlgorithm
+from qns.network.topology.topo import ClassicTopology
+from qns.simulator.simulator import Simulator
+from qns.simulator.checkpoint import Checkpoint
+from qns.network import QuantumNetwork
+from qns.network.topology import LineTopology
+from qns.network.protocol.entanglement_distribution import EntanglementDistributionApp
+from qns.utils.multiprocess import MPSimulations
+from qns.utils.rnd import get_state, set_seed, set_state
+
+
+def build_network(s: Simulator, nodes_number: int = 5) -> QuantumNetwork:
+    topo = LineTopology(nodes_number=nodes_number,
+                        qchannel_args={"delay": 0.05, "drop_rate": 0.3},
+                        cchannel_args={"delay": 0.05},
+                        memory_args={
+                            "capacity": 10,
+                            "store_error_model_args": {"a": 0.2}},
+                        nodes_apps=[EntanglementDistributionApp(init_fidelity=0.99)])
+    net = QuantumNetwork(topo=topo, classic_topo=ClassicTopology.All, route=DijkstraRouteAlgorithm())
+    net.build_route()
+    net.add_request(src=net.get_node("n1"), dest=net.get_node(f"n{nodes_number}"), attr={"send_rate": 20})
+    net.install(s)
+    return net
+
+
+def test_checkpoint_restore(tmp_path):
+    set_seed(1)
+    s = Simulator(0, 10, accuracy=10000000)
+    net = build_network(s)
+    s.run_until(2)
+
+    checkpoint = s.checkpoint(net)
+    state = get_state()
+    path = os.path.join(tmp_path, "warmup.ckpt")
+    checkpoint.save(path)
+
+    results = []
+    for cp in [checkpoint, checkpoint, Checkpoint.load(path)]:
+        s2, net2 = Simulator.restore(cp)
+        assert s2 is not s and s2.tc_slot == s.tc_slot
+        s2.run()
+        results.append(net2.get_node("n1").apps[0].success_count)
+
+    # the original simulator is not affected by the restored copies
+    assert net.get_node("n1").apps[0].success_count < results[0]
+    set_state(state)
+    s.run()
+    assert results == [net.get_node("n1").apps[0].success_count] * 3
+
+
+class WarmupSimulation(MPSimulations):
+    def warmup(self, setting):
+        set_seed(setting["seed"])
+        s = Simulator(0, 10, accuracy=10000000)
+        net = build_network(s, setting["nodes_number"])
+        s.run_until(2)
+        return s.checkpoint(net)
+
+    def run(self, setting):
+        s, net = self.checkpoint.restore()
+        assert s.tc_slot == s.time_slot(2)
+        s.run()
+        return {"count": net.get_node("n1").apps[0].success_count}
+
+
+def test_checkpoint_multiple_process():
+    ss = WarmupSimulation(settings={"nodes_number": [3, 5], "seed": [1]}, aggregate=False, iter_count=2, cores=2)
+    ss.start()
+    data = ss.get_data()
+    assert len(data) == 4
+    for _, group in data.groupby("_group"):
+        assert group["count"].nunique() == 1
+
+
+class PartialWarmupSimulation(WarmupSimulation):
+    def warmup(self, setting):
+        if setting["nodes_number"] == 3:
+            return None
+        return super().warmup(setting)
+
+    def run(self, setting):
+        if self.checkpoint is not None:
+            return super().run(setting)
+        set_seed(setting["seed"])
+        s = Simulator(0, 10, accuracy=10000000)
+        net = build_network(s, setting["nodes_number"])
+        s.run()
+        return {"count": net.get_node("n1").apps[0].success_count}
+
+
+def test_checkpoint_partial_warmup():
+    # a group without a warm-up does not drop the checkpoints of the other groups
+    ss = PartialWarmupSimulation(settings={"nodes_number": [3, 5], "seed": [1]}, aggregate=False, iter_count=2, cores=2)
+    ss.prepare_setting()
+    checkpoints = ss._warmup_all()
+    groups = {setting["_group"]: setting["nodes_number"] for setting in ss._setting_list}
+    assert [groups[group] for group in checkpoints] == [5]
+
+    ss = PartialWarmupSimulation(settings={"nodes_number": [3, 5], "seed": [1]}, aggregate=False, iter_count=2, cores=2)
+    ss.start()
+    data = ss.get_data()
+    assert len(data) == 4
+    for _, group in data.groupby("_group"):
+        assert group["count"].nunique() == 1
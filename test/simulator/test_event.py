@@ -26,3 +26,51 @@ def test_event_simple():
     print(te)
 
     te.invoke()
+
+
+def test_event_time_slot():
+    te = PrintEvent(t=1500000, name="test event")
+    assert te.time_slot == 1500000
+    assert te.t == Time(sec=1.5)
+
+    te.t = Time(sec=2)
+    assert te.time_slot == 2000000
+    assert te > PrintEvent(t=Time(sec=1))
+
+
+def test_recurring_event():
+    from qns.simulator.event import RecurringEvent
+    from qns.simulator.simulator import Simulator
+
+    class CountEvent(RecurringEvent):
+        def trigger(self) -> None:
+            result.append(self.time_slot)
+            if len(result) == 5:
+                self.cancel()
+
+    result = []
+    s = Simulator(0, 10, 1000)
+    s.add_event(CountEvent(t=100, period=300, end=1000, simulator=s))
+    s.run()
+    assert result == [100, 400, 700, 1000]
+
+    result = []
+    s = Simulator(0, 10, 1000)
+    s.add_event(CountEvent(t=0, period=1000, simulator=s))
+    s.run()
+    assert result == [0, 1000, 2000, 3000, 4000]
+    assert s.total_events == 5
+
+
+def test_event_slots():
+    import pickle
+    from qns.entity.cchannel.cchannel import ClassicPacket, RecvClassicPacket
+    from qns.entity.memory.event import MemoryReadRequestEvent
+    from qns.entity.qchannel.qchannel import RecvQubitPacket
+
+    for e in [RecvClassicPacket(t=10, packet=ClassicPacket(msg="hello")), RecvQubitPacket(t=10),
+              MemoryReadRequestEvent(memory=None, key="k", t=10)]:
+        assert not hasattr(e, "__dict__")
+        e2 = pickle.loads(pickle.dumps(e))
+        assert e2.time_slot == 10 and e2.__class__ is e.__class__
+    assert not hasattr(ClassicPacket(msg="hello"), "__dict__")
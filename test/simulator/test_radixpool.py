@@ -0,0 +1,33 @@
+import random
+
+from qns.simulator import Simulator, RadixHeapEventPool
+from qns.simulator.event import func_to_event
+
+
+def test_radix_pool_order():
+    random.seed(1)
+    s = Simulator(0, 10, 1000, pool_cls=RadixHeapEventPool)
+    result = []
+
+    def schedule(i):
+        result.append((s.tc_slot, i))
+        if s.tc_slot < 9000:
+            s.add_event(func_to_event(s.tc_slot + random.randint(0, 20), schedule, None, None, i + 1000))
+
+    for i in range(200):
+        s.add_event(func_to_event(random.randint(0, 50) * 100, schedule, None, None, i))
+    s.run()
+    assert len(result) > 200
+    assert [t for t, _ in result] == sorted(t for t, _ in result)
+
+
+def test_radix_pool_stable():
+    s = Simulator(0, 10, 1000, pool_cls=RadixHeapEventPool)
+    result = []
+    for i in range(100):
+        s.add_event(func_to_event(s.time(sec=(i * 7) % 5), lambda x=i: result.append(x)))
+    s.add_event(func_to_event(s.time(sec=11), lambda: result.append(-1)))
+    assert s.total_events == 100
+    s.run()
+    assert result == sorted(range(100), key=lambda x: ((x * 7) % 5, x))
+    assert s.tc == s.te
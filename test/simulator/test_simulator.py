@@ -1,6 +1,6 @@
 import logging
 from qns.simulator.simulator import Simulator
-from qns.simulator.event import Event
+from qns.simulator.event import Event, func_to_event
 import qns.utils.log as log
 
 log.logger.setLevel(logging.DEBUG)
@@ -29,3 +29,210 @@ def test_simulator_with_log():
         t += 1
     log.install(s)
     s.run()
+
+
+def test_simulator_same_slot_order():
+    s = Simulator(0, 10, 1000)
+    result = []
+    for i in range(100):
+        s.add_event(func_to_event(s.time(sec=i % 3), lambda x=i: result.append(x)))
+    s.run()
+    assert result == sorted(result, key=lambda x: (x % 3, x))
+
+
+def test_simulator_cancel_event():
+    from qns.simulator import CalendarEventPool, HashedBucketEventPool, RadixHeapEventPool
+    from qns.simulator.pool import DefaultEventPool
+    for pool_cls in [DefaultEventPool, HashedBucketEventPool, CalendarEventPool, RadixHeapEventPool]:
+        s = Simulator(0, 10, 1000, pool_cls=pool_cls)
+        s.event_pool.compact_min_dead = 10
+        result = []
+        handles = []
+        for i in range(100):
+            handles.append(s.add_event(func_to_event(s.time(sec=i / 10), lambda x=i: result.append(x))))
+        assert s.add_event(func_to_event(s.time(sec=11), lambda: result.append(-1))) is None
+
+        for h in handles[:40]:
+            h.cancel()
+        assert s.event_pool.live == 60
+        assert s.event_pool.dead == 40
+        for h in handles[40:60]:
+            h.cancel()
+        # the pool is compacted once the dead events exceed half of all events
+        assert s.event_pool.live == 40
+        assert s.event_pool.dead < 20
+        s.run()
+        assert result == list(range(60, 100))
+        assert s.event_pool.live == 0 and s.event_pool.dead == 0
+
+
+def test_simulator_add_events():
+    from qns.simulator import CalendarEventPool, HashedBucketEventPool, RadixHeapEventPool
+    from qns.simulator.pool import DefaultEventPool
+    for pool_cls in [DefaultEventPool, HashedBucketEventPool, CalendarEventPool, RadixHeapEventPool]:
+        s = Simulator(0, 10, 1000, pool_cls=pool_cls)
+        result = []
+        s.add_event(func_to_event(s.time(sec=5), lambda: result.append(-1)))
+        count = s.add_events(func_to_event(s.time_slot(i / 10), lambda x=i: result.append(x)) for i in range(200))
+        assert count == 101
+        assert s.total_events == 102
+        s.run()
+        assert result == list(range(50)) + [-1] + list(range(50, 101))
+
+        # small and large batches on a non-empty pool keep the order of the same time slot
+        s = Simulator(0, 10, 1000, pool_cls=pool_cls)
+        result = []
+        for batch, size in enumerate([3, 500, 2, 5000]):
+            s.add_events(func_to_event((i * 7919 + batch) % 10000, lambda x=(batch, i): result.append(x))
+                         for i in range(size))
+        s.run()
+        assert len(result) == 5505
+        assert result == sorted(result, key=lambda x: ((x[1] * 7919 + x[0]) % 10000, x[0], x[1]))
+
+
+def test_simulator_run_until_and_step():
+    from qns.simulator import CalendarEventPool, HashedBucketEventPool, RadixHeapEventPool
+    from qns.simulator.pool import DefaultEventPool
+    for pool_cls in [DefaultEventPool, HashedBucketEventPool, CalendarEventPool, RadixHeapEventPool]:
+        s = Simulator(0, 10, 1000, pool_cls=pool_cls)
+        result = []
+        for i in range(100):
+            s.add_event(func_to_event(s.time(sec=i / 10), lambda x=i: result.append(x)))
+
+        assert s.run_until(2.05) == 21
+        assert result == list(range(21))
+        assert s.tc_slot == 2050
+
+        # an event inserted between the current time and the next peeked event
+        s.add_event(func_to_event(s.time(sec=2.06), lambda: result.append(-1)))
+        assert s.step(3) == 3
+        assert result == list(range(21)) + [-1, 21, 22]
+
+        def stop():
+            result.append(-2)
+            s.pause()
+        s.add_event(func_to_event(s.time(sec=5.05), stop))
+        s.run()
+        assert result[-1] == -2 and s.tc_slot == 5050
+        assert s.run_until(s.time(sec=5)) == 0 and s.tc_slot == 5050
+
+        s.run()
+        assert result == list(range(21)) + [-1, 21, 22] + list(range(23, 51)) + [-2] + list(range(51, 100))
+        assert s.step() == 0
+        assert s.total_events == 102
+
+
+def test_simulator_profile(tmp_path):
+    s = Simulator(0, 10, 1000)
+    for i in range(10):
+        s.add_event(TimerEvent(t=s.time(sec=i), name="t1", by="timer"))
+        s.add_event(func_to_event(s.time(sec=i + 0.5), lambda: None))
+    s.run()
+    assert s.profiler is None and len(s.profile_report()) == 0
+
+    s = Simulator(0, 10, 1000, profile=True)
+    for i in range(10):
+        s.add_event(TimerEvent(t=s.time(sec=i), name="t1", by="timer"))
+        s.add_event(func_to_event(s.time(sec=i + 0.5), lambda: None))
+    s.run_until(4.9)
+    s.enable_profiling(False)
+    s.run()
+
+    report = s.profile_report()
+    assert set(report["event"]) == {"TimerEvent", "CallbackEvent"}
+    assert list(report[report["event"] == "TimerEvent"]["count"]) == [5]
+    assert list(report[report["event"] == "CallbackEvent"]["by"]) == ["None"]
+    assert (report["max_time"] <= report["total_time"]).all()
+
+    path = tmp_path / "events.folded"
+    s.profiler.dump_collapsed_stack(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert any(line.startswith("simulator;str;TimerEvent ") for line in lines)
+
+
+def test_simulator_watch_subclass():
+    class SubTimerEvent(TimerEvent):
+        pass
+
+    class Recorder():
+        def __init__(self):
+            self.records = []
+
+        def handle(self, event):
+            self.records.append(event.name)
+
+    s = Simulator(0, 10, 1000)
+    base, sub = Recorder(), Recorder()
+    s.watch(TimerEvent, base)
+    s.watch(SubTimerEvent, sub)
+    s.watch(TimerEvent, sub)
+    s.add_event(TimerEvent(t=s.time(sec=1), name="base"))
+    s.add_event(SubTimerEvent(t=s.time(sec=2), name="sub"))
+    s.add_event(func_to_event(s.time(sec=3), lambda: None, name="other"))
+    s.run()
+    assert base.records == ["base", "sub"]
+    assert sub.records == ["base", "sub"]
+
+
+def test_simulator_call_at_and_later():
+    s = Simulator(0, 10, 1000)
+    result = []
+
+    def record(x, y):
+        result.append((s.tc_slot, x, y))
+        if x == "at":
+            s.call_later(0.5, record, "later", y + 1, by="me")
+
+    s.call_at(s.time(sec=1), record, "at", 1)
+    s.call_at(2000, record, "at", 2)
+    handle = s.call_at(3000, record, "at", 3)
+    handle.cancel()
+    assert s.call_at(s.time(sec=11), record, "at", 4) is None
+    s.run()
+    assert result == [(1000, "at", 1), (1500, "later", 2), (2000, "at", 2), (2500, "later", 3)]
+
+
+def test_simulator_event_recycling():
+    from qns.entity.cchannel.cchannel import ClassicChannel, ClassicPacket, RecvClassicPacket
+    from qns.entity.node.app import Application
+    from qns.entity.node.node import QNode
+
+    class Receiver(Application):
+        def __init__(self, held):
+            super().__init__()
+            self.held = held
+            self.msgs = []
+            self.add_handler(self.recv, [RecvClassicPacket])
+
+        def recv(self, node, event):
+            self.msgs.append(event.packet.get())
+            if self.held is not None:
+                self.held.append(event)
+
+    def build(held, safe):
+        s = Simulator(0, 10, 1000, recycle_events=True)
+        s.enable_event_recycling(safe=safe)
+        n1, n2 = QNode("n1"), QNode("n2")
+        n2.add_apps(Receiver(held))
+        c = ClassicChannel("c", delay=0.1)
+        n1.add_cchannel(c)
+        n2.add_cchannel(c)
+        n1.install(s)
+        n2.install(s)
+        c.install(s)
+        for i in range(5):
+            s.call_at(1000 * i, c.send, ClassicPacket(i, src=n1, dest=n2), n2)
+        s.run()
+        return s, n2.apps[0].msgs
+
+    s, msgs = build(None, True)
+    assert msgs == [0, 1, 2, 3, 4]
+    assert s.recycled_events == 4 and s.held_events == 0
+    assert len(s._free_events[RecvClassicPacket]) == 1
+
+    held = []
+    s, msgs = build(held, True)
+    assert msgs == [0, 1, 2, 3, 4]
+    assert s.recycled_events == 0 and s.held_events == 5
+    assert [e.packet.get() for e in held] == [0, 1, 2, 3, 4]
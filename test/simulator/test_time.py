@@ -17,6 +17,16 @@ def test_time():
     assert (t3 < t1)
 
 
+def test_time_compare_other_types():
+    import pytest
+    t = Time(sec=1)
+    assert not (t == None) and t != None  # noqa: E711
+    assert not (t == 5) and t != 5
+    assert t not in [None, 1, "1"]
+    with pytest.raises(TypeError):
+        t < 5
+
+
 def print_msg(msg):
     print(msg)
 
@@ -30,7 +40,97 @@ def test_simulator_time():
     from qns.simulator.simulator import Simulator
     from qns.simulator.event import func_to_event
     s = Simulator(1, 10, 1000)
+    print_event = func_to_event(Time(sec=1), print_msg, msg="hello world")
+    s.add_event(print_event)
     s.run()
-    print_event = func_to_event(Time(sec=1), print_msg, "hello world")
     print(print_event.t.accuracy)
     assert (print_event.t.accuracy == 1000)
+    assert (print_event.t.sec == 1)
+
+
+def test_time_64bit_slot():
+    from qns.simulator.ts import set_default_accuracy
+    from qns.simulator.simulator import Simulator
+    s = Simulator(0, 400, accuracy=10000000)
+    t = s.time(sec=300)
+    assert (t.time_slot == 3000000000)
+    assert (t.sec == 300)
+    assert (t + 0.5 > t)
+    set_default_accuracy(1000000)
+
+
+def test_simulator_scoped_accuracy():
+    import threading
+    from qns.simulator.simulator import Simulator
+    from qns.simulator.event import Event
+
+    class Tick(Event):
+        def __init__(self, s, seen, t=None):
+            super().__init__(t=t)
+            self.s = s
+            self.seen = seen
+
+        def invoke(self):
+            # the ``Time`` objects without an explicit accuracy follow the running simulator
+            self.seen.append((self.t.sec, self.s.tc.sec))
+            nt = self.t + Time(sec=0.5)
+            if nt.sec < 3:
+                self.s.add_event(Tick(self.s, self.seen, t=nt))
+
+    def build(accuracy):
+        s = Simulator(0, 10, accuracy)
+        seen = []
+        s.add_event(Tick(s, seen, t=s.time(sec=0)))
+        return s, seen
+
+    expected = [(0.5 * i, 0.5 * i) for i in range(6)]
+
+    # interleaved in one thread
+    s1, seen1 = build(1000)
+    s2, seen2 = build(1000000)
+    for sec in [1, 2, 10]:
+        s1.run_until(sec)
+        s2.run_until(sec)
+    assert seen1 == expected and seen2 == expected
+    assert s1.tc.accuracy == 1000 and s2.tc.accuracy == 1000000
+
+    # in separate threads
+    results = {}
+
+    def run(accuracy):
+        s, seen = build(accuracy)
+        s.run()
+        results[accuracy] = seen
+
+    threads = [threading.Thread(target=run, args=(accuracy,)) for accuracy in [1000, 10000, 1000000]]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert all(seen == expected for seen in results.values())
+
+
+def test_two_simulators_accuracy():
+    from qns.simulator.simulator import Simulator
+    from qns.simulator.event import func_to_event
+    from qns.simulator.ts import get_default_accuracy, default_accuracy
+
+    s1 = Simulator(0, 10, accuracy=1000)
+    s2 = Simulator(0, 10, accuracy=1000000)
+    # building a simulator does not change the accuracy of the ``Time`` objects outside a run
+    assert get_default_accuracy() == default_accuracy
+
+    fired = []
+    e1 = s1.add_event(func_to_event(Time(sec=1), lambda: fired.append((1, s1.tc.sec))))
+    e2 = s2.add_event(func_to_event(Time(sec=2), lambda: fired.append((2, s2.tc.sec))))
+    assert e1 is not None and e1.t.accuracy == 1000 and e1.t.sec == 1
+    assert e2 is not None and e2.t.accuracy == 1000000 and e2.t.sec == 2
+
+    # an event built in the run of another simulator
+    def forward():
+        s1.add_event(func_to_event(Time(sec=3), lambda: fired.append((3, s1.tc.sec))))
+    s2.add_event(func_to_event(s2.time(sec=0.5), forward))
+
+    s2.run()
+    s1.run()
+    assert fired == [(2, 2.0), (1, 1.0), (3, 3.0)]
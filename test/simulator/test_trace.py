@@ -0,0 +1,92 @@
+from qns.entity.cchannel.cchannel import ClassicChannel, ClassicPacket, RecvClassicPacket
+from qns.entity.node.app import Application
+from qns.entity.node.node import QNode
+from qns.simulator.event import Event
+from qns.simulator.simulator import Simulator
+from qns.simulator.ts import Time
+from qns.simulator.trace import load_trace, read_trace, replay
+
+
+class Receiver(Application):
+    def __init__(self):
+        super().__init__()
+        self.arrivals = []
+        self.add_handler(self.recv, [RecvClassicPacket])
+
+    def recv(self, node, event):
+        self.arrivals.append((event.time_slot, len(event.packet)))
+
+
+def build():
+    s = Simulator(0, 10, 1000)
+    n1, n2 = QNode("n1"), QNode("n2")
+    n2.add_apps(Receiver())
+    c = ClassicChannel("c", delay=0.1)
+    for e in [n1, n2]:
+        e.add_cchannel(c)
+        e.install(s)
+    c.install(s)
+    return s, n1, n2, c
+
+
+def test_trace_record_and_replay(tmp_path):
+    s, n1, n2, c = build()
+    for i in range(20):
+        s.call_at(200 * i, c.send, ClassicPacket("x" * i, src=n1, dest=n2), n2)
+    s.enable_tracing(str(tmp_path / "full"), capacity=16)
+    s.run_until(2)
+    s.run()
+    assert s.tracer.segments == 3
+
+    df = read_trace(str(tmp_path / "full"), accuracy=1000)
+    assert len(df) == 40 and list(df["slot"]) == sorted(df["slot"])
+    recv = df[df["event"] == "qns.entity.cchannel.cchannel.RecvClassicPacket"]
+    assert list(recv["by"].unique()) == ["ClassicChannel(c)"] and list(recv["target"].unique()) == ["QNode(n2)"]
+    assert list(zip(recv["slot"], recv["payload"])) == n2.apps[0].arrivals
+    assert recv["time"].iloc[0] == 0.1
+
+    # replay the arrivals to the receiver without the sender and the channel
+    s2, _, n2b, c2 = build()
+
+    def make_event(row):
+        return RecvClassicPacket(int(row.slot), cchannel=c2, dest=n2b, packet=ClassicPacket("x" * row.payload))
+
+    count = replay(s2, df, make_event, event="RecvClassicPacket")
+    assert count == 20
+    s2.run()
+    assert n2b.apps[0].arrivals == n2.apps[0].arrivals
+
+
+def test_trace_ring(tmp_path):
+    s, n1, n2, c = build()
+    for i in range(20):
+        s.call_at(200 * i, c.send, ClassicPacket("x", src=n1, dest=n2), n2)
+    s.enable_tracing(str(tmp_path / "ring"), capacity=16, ring=True)
+    s.run()
+    data, meta = load_trace(str(tmp_path / "ring"))
+    assert meta["count"] == 40 and meta["segments"] == 1
+    assert len(data["slot"]) == 16 and list(data["slot"]) == sorted(data["slot"])
+    assert data["slot"][-1] == 3900
+
+
+def test_trace_same_class_names(tmp_path):
+    def make_class():
+        class RecvEvent(Event):
+            def invoke(self):
+                pass
+        return RecvEvent
+
+    first, second = make_class(), make_class()
+    s = Simulator(0, 1, 1000)
+    s.enable_tracing(str(tmp_path / "names"))
+    s.add_event(first(Time(sec=0.1)))
+    s.add_event(second(Time(sec=0.2)))
+    s.run()
+
+    df = read_trace(str(tmp_path / "names"))
+    assert len(df) == 2 and len(df["event"].cat.categories) == 2
+    name = "test_trace.test_trace_same_class_names.<locals>.make_class.<locals>.RecvEvent"
+    assert df["event"].iloc[0].endswith(name) and df["event"].iloc[1].endswith(name + "#1")
+
+    s2 = Simulator(0, 1, 1000)
+    assert replay(s2, df, lambda row: second(Time(sec=0.3)), event="RecvEvent") == 2
@@ -0,0 +1,25 @@
+import logging
+import qns.utils.log as log
+
+
+def test_log_lazy(caplog):
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "lazy message"
+
+    level = log.logger.level
+    try:
+        log.logger.setLevel(logging.INFO)
+        log.debug(message)
+        log.debug("%s %s", "not", "formatted")
+        assert calls == [] and "formatted" not in caplog.text
+
+        log.logger.setLevel(logging.DEBUG)
+        log.debug(message)
+        log.info("%s: %d packets", "n1", 3)
+        assert calls == [1]
+        assert "lazy message" in caplog.text and "n1: 3 packets" in caplog.text
+    finally:
+        log.logger.setLevel(level)
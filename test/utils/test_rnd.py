@@ -0,0 +1,168 @@
+from qns.utils.rnd import get_normal, get_rand, get_randint, get_state, get_weighted_choice, set_seed, set_state
+
+
+def draw():
+    return [(get_rand(), get_rand(2, 3), get_randint(0, 5), get_normal(1, 0.5)) for _ in range(5000)]
+
+
+def test_rnd_reproducible():
+    set_seed(42)
+    a = draw()
+    set_seed(42)
+    assert draw() == a
+    set_seed(43)
+    assert draw() != a
+
+    for r, r2, i, _ in a:
+        assert 0 <= r < 1 and 2 <= r2 < 3
+        assert 0 <= i <= 5 and isinstance(i, int)
+    assert {i for _, _, i, _ in a} == set(range(6))
+
+
+def test_rnd_weighted_choice():
+    import random
+    a = ["a", "b", "c", "d"]
+    set_seed(42)
+    c = get_weighted_choice(a, [1, 2, 0, 5], k=1000)
+    set_seed(42)
+    random.seed(0)  # the weighted choice does not depend on the ``random`` module
+    assert get_weighted_choice(a, [1, 2, 0, 5], k=1000) == c
+    assert set(c) == {"a", "b", "d"} and c.count("d") > c.count("b") > c.count("a")
+    set_seed(43)
+    assert get_weighted_choice(a, [1, 2, 0, 5], k=1000) != c
+
+
+def test_rnd_get_generator():
+    from qns.utils.rnd import BufferedGenerator, get_generator, use_generator
+    set_seed(42)
+    default = get_generator()
+    g = BufferedGenerator(seed=1)
+    with use_generator(g):
+        assert get_generator() is g.generator
+        a = get_generator().random(5)
+    assert get_generator() is default
+    assert (BufferedGenerator(seed=1).generator.random(5) == a).all()
+
+
+def test_rnd_state():
+    set_seed(42)
+    draw()
+    state = get_state()
+    a = draw()
+    set_state(state)
+    assert draw() == a
+
+
+def test_rnd_entity_streams():
+    from qns.entity.cchannel.cchannel import ClassicChannel, ClassicPacket
+    from qns.entity.node.node import QNode
+    from qns.simulator.simulator import Simulator
+
+    def run(order):
+        set_seed(7)
+        s = Simulator(0, 10, 1000)
+        n1, n2 = QNode("n1"), QNode("n2")
+        channels = {name: ClassicChannel(name, delay=0.1, drop_rate=0.5) for name in ["c1", "c2"]}
+        for c in channels.values():
+            n1.add_cchannel(c)
+            n2.add_cchannel(c)
+            c.install(s)
+        for node in [n1, n2]:
+            node.install(s)
+        get_rand()  # the global stream does not affect the channels
+        sent = {}
+        for name in order:
+            before = len(s.event_pool.event_list)
+            for i in range(20):
+                channels[name].send(ClassicPacket(i, src=n1, dest=n2), n2)
+            sent[name] = len(s.event_pool.event_list) - before
+        return sent, channels["c1"].rng.random()
+
+    sent, r = run(["c1", "c2"])
+    assert 0 < sent["c1"] < 20 and sent["c1"] != sent["c2"]
+    assert run(["c2", "c1"]) == (sent, r)
+
+
+def test_rnd_use_generator_thread():
+    import threading
+    from qns.utils.rnd import BufferedGenerator, use_generator
+
+    set_seed(3)
+    expected = [get_rand() for _ in range(10)]
+    other = BufferedGenerator(seed=4).random()
+    set_seed(3)
+    entered, done = threading.Event(), threading.Event()
+    result = {}
+
+    def worker():
+        with use_generator(BufferedGenerator(seed=4)):
+            entered.set()
+            done.wait()
+            result["rand"] = get_rand()
+
+    th = threading.Thread(target=worker)
+    th.start()
+    entered.wait()
+    # the generator bound in another thread does not affect this thread
+    assert [get_rand() for _ in range(10)] == expected
+    done.set()
+    th.join()
+    assert result["rand"] == other
+
+
+def test_rnd_entity_delays_and_errors():
+    from qns.entity.qchannel.qchannel import QuantumChannel
+    from qns.entity.node.node import QNode
+    from qns.models.delay import UniformDelayModel
+    from qns.models.qubit.const import QUBIT_STATE_P
+    from qns.models.qubit.decoherence import DissipationTransferErrorModel
+    from qns.models.qubit.factory import QubitFactory
+    from qns.simulator.simulator import Simulator
+
+    Qubit = QubitFactory(transfer_error_model=DissipationTransferErrorModel)
+
+    def run(order):
+        set_seed(11)
+        s = Simulator(0, 10, 1000000)
+        n1, n2 = QNode("n1"), QNode("n2")
+        channels = {name: QuantumChannel(name, delay=UniformDelayModel(0.1, 0.2), length=1, decoherence_rate=0.7)
+                    for name in ["q1", "q2"]}
+        for c in channels.values():
+            n1.add_qchannel(c)
+            n2.add_qchannel(c)
+            c.install(s)
+        for node in [n1, n2]:
+            node.install(s)
+        result = {}
+        for name in order:
+            get_rand()  # the global stream does not affect the channels
+            qubits = []
+            for i in range(20):
+                q = Qubit(state=QUBIT_STATE_P, name=f"{name}-{i}")
+                qubits.append(q)
+                channels[name].send(q, n2)
+            result[name] = [q.measureX(rng=channels[name].rng) for q in qubits]
+        # the receiving times of the qubits
+        result["slots"] = sorted((event.qchannel.name, event.time_slot) for _, _, event in s.event_pool.event_list)
+        return result
+
+    a = run(["q1", "q2"])
+    assert a == run(["q2", "q1"])
+    assert a["q1"] != a["q2"] and len({slot % 1000000 for _, slot in a["slots"]}) > 1
+
+
+def test_rnd_unnamed_entities():
+    from qns.entity.cchannel.cchannel import ClassicChannel
+    from qns.entity.node.app import Application
+
+    def build():
+        set_seed(5)
+        channels = [ClassicChannel(), ClassicChannel()]
+        apps = [Application(), Application()]
+        return [[x.rng.random() for _ in range(5)] for x in channels + apps]
+
+    draws = build()
+    # the unnamed entities do not share a stream
+    assert draws[0] != draws[1] and draws[2] != draws[3]
+    # the same construction order after ``set_seed`` gives the same streams
+    assert build() == draws